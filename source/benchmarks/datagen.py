@@ -0,0 +1,235 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+CHUNK_SIZE = 5_000
+DEFAULT_SEED = 42
+BENCH_PASSWORD = "bench"
+BENCH_DATABASE_URL = "sqlite:///benchmarks/bench.db"
+BENCH_USERS = {
+    "admin": ("Администратор", "bench_admin"),
+    "manager": ("Менеджер", "bench_manager"),
+    "client": ("авторизованный клиент", "bench_client"),
+}
+
+NAMES = ["Ботинки", "Кроссовки", "Туфли", "Сапоги", "Кеды", "Сандалии", "Мокасины", "Полусапоги", "Лоферы", "Слипоны"]
+ADJECTIVES = ["женские", "мужские", "детские", "зимние", "летние", "демисезонные", "кожаные", "замшевые", "спортивные"]
+CATEGORIES = ["Женская обувь", "Мужская обувь", "Детская обувь", "Спортивная обувь"]
+MANUFACTURERS = ["Kari", "Marco Tozzi", "Рос", "Rieker", "Alessio Nesca", "CROSBY", "Ecco", "Salamander", "Tamaris"]
+SUPPLIERS = ["Kari", "Обувь для вас", "Спорттовары", "ОбувьОпт", "Лесной склад", "Шаг вперёд"]
+STREETS = ["Вишневая", "Подгорная", "Шоссейная", "Зеленая", "Маяковского", "Садовая", "Лесная", "Новая", "Цветочная"]
+SURNAMES = ["Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов", "Новиков"]
+FIRST_NAMES = ["Александр", "Мария", "Дмитрий", "Анна", "Сергей", "Елена", "Андрей", "Ольга", "Павел", "Ирина"]
+PATRONYMICS = ["Александрович", "Сергеевич", "Петрович", "Андреевич", "Ивановна", "Павловна", "Дмитриевна"]
+STATUSES = ["Новый", "Завершен"]
+
+
+def confirm_database(url: str, assume_yes: bool = False):
+    if url.startswith("sqlite") or assume_yes:
+        return
+    if not sys.stdin.isatty():
+        raise SystemExit(f"Отказ: {url} не SQLite. Для запуска на другой базе добавьте --yes")
+    answer = input(f"Данные в {url} будут изменены. Продолжить? Введите yes: ")
+    if answer.strip().lower() != "yes":
+        raise SystemExit("Отменено")
+
+
+def parse_scale(value: str) -> int:
+    value = value.lower()
+    if value in SCALES:
+        return SCALES[value]
+    return int(value.replace("_", ""))
+
+
+def full_name(rng: random.Random) -> str:
+    return f"{rng.choice(SURNAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(PATRONYMICS)}"
+
+
+def product_rows(rng: random.Random, count: int):
+    for i in range(count):
+        name = f"{rng.choice(NAMES)} {rng.choice(ADJECTIVES)}"
+        yield {
+            "article": f"B{i:07d}",
+            "name": name,
+            "unit": "шт.",
+            "price": round(rng.uniform(500, 15000), 2),
+            "supplier_id": rng.randrange(len(SUPPLIERS)) + 1,
+            "manufacturer_id": rng.randrange(len(MANUFACTURERS)) + 1,
+            "category_id": rng.randrange(len(CATEGORIES)) + 1,
+            "discount": rng.choice([0, 0, 0, 5, 10, 15, 20, 30]),
+            "quantity": rng.choice([0] + list(range(1, 40))),
+            "description": f"{name}, артикул B{i:07d}, размерная сетка 35-46",
+            "photo": None,
+            "version": i + 1,
+        }
+
+
+def lookup_rows(names: list[str]):
+    for i, name in enumerate(names):
+        yield {"id": i + 1, "name": name}
+
+
+def user_rows(rng: random.Random, count: int, password_hash: str):
+    for role, login in BENCH_USERS.values():
+        yield {"role": role, "full_name": full_name(rng), "login": login, "password": password_hash}
+    for i in range(count):
+        yield {
+            "role": "авторизованный клиент",
+            "full_name": full_name(rng),
+            "login": f"client_{i:07d}",
+            "password": password_hash,
+        }
+
+
+def pickup_point_rows(count: int):
+    for i in range(count):
+        yield {"address": f"{100000 + i}, г. Лесной, ул. {STREETS[i % len(STREETS)]}, {i // len(STREETS) + 1}"}
+
+
+def order_rows(rng: random.Random, count: int, pickup_points: int, first_version: int):
+    start = date(2023, 1, 1)
+    for i in range(count):
+        order_date = start + timedelta(days=rng.randrange(730))
+        yield {
+            "id": i + 1,
+            "order_number": f"{order_date.strftime('%d%m%y')}-{i + 1}",
+            "order_date": order_date,
+            "delivery_date": order_date + timedelta(days=rng.randrange(1, 14)),
+            "pickup_point_id": rng.randrange(pickup_points) + 1,
+            "client_full_name": full_name(rng),
+            "code": rng.randrange(100, 1000),
+            "status": rng.choice(STATUSES),
+            "version": first_version + i,
+        }
+
+
+def order_product_rows(rng: random.Random, orders: int, products: int, max_lines: int):
+    for order_id in range(1, orders + 1):
+        for article in rng.sample(range(products), rng.randint(1, min(max_lines, products))):
+            yield {"order_id": order_id, "product_id": f"B{article:07d}", "quantity": rng.randint(1, 5)}
+
+
+def insert_chunks(connection, table, rows) -> int:
+    from sqlalchemy import insert
+
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            connection.execute(insert(table), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        connection.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(
+    products: int,
+    orders: int | None = None,
+    users: int | None = None,
+    pickup_points: int | None = None,
+    max_lines: int = 4,
+    seed: int = DEFAULT_SEED,
+    reset: bool = False,
+) -> dict:
+    from src.db.database import engine
+    from src.db.migrate import stamp_database
+    from src.db.models.models import (
+        Base,
+        Category,
+        Manufacturer,
+        Order,
+        PickupPoint,
+        Product,
+        Supplier,
+        SyncCounter,
+        User,
+        order_product,
+    )
+    from src.db.sync import GLOBAL_COUNTER
+    from src.utils.security import get_password_hash
+
+    orders = products if orders is None else orders
+    users = max(products // 10, 1) if users is None else users
+    pickup_points = max(products // 1000, 5) if pickup_points is None else pickup_points
+    rng = random.Random(seed)
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    stamp_database()
+
+    counts = {}
+    started_at = time.perf_counter()
+    with engine.begin() as connection:
+        counts["pickup_points"] = insert_chunks(connection, PickupPoint.__table__, pickup_point_rows(pickup_points))
+        counts["users"] = insert_chunks(
+            connection, User.__table__, user_rows(rng, users, get_password_hash(BENCH_PASSWORD))
+        )
+        counts["suppliers"] = insert_chunks(connection, Supplier.__table__, lookup_rows(SUPPLIERS))
+        counts["manufacturers"] = insert_chunks(connection, Manufacturer.__table__, lookup_rows(MANUFACTURERS))
+        counts["categories"] = insert_chunks(connection, Category.__table__, lookup_rows(CATEGORIES))
+        counts["products"] = insert_chunks(connection, Product.__table__, product_rows(rng, products))
+        counts["orders"] = insert_chunks(
+            connection, Order.__table__, order_rows(rng, orders, pickup_points, first_version=products + 1)
+        )
+        counts["order_lines"] = insert_chunks(
+            connection, order_product, order_product_rows(rng, orders, products, max_lines)
+        )
+        connection.execute(SyncCounter.__table__.delete())
+        connection.execute(SyncCounter.__table__.insert().values(name=GLOBAL_COUNTER, value=products + orders))
+
+        if engine.dialect.name == "postgresql":
+            for table in ("orders", "suppliers", "manufacturers", "categories"):
+                connection.exec_driver_sql(f"SELECT setval('{table}_id_seq', (SELECT MAX(id) FROM {table}))")
+            connection.exec_driver_sql("ANALYZE")
+
+    counts["seconds"] = round(time.perf_counter() - started_at, 2)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных для нагрузочных тестов")
+    parser.add_argument("--database-url", default=BENCH_DATABASE_URL)
+    parser.add_argument("--scale", default="1k", help="Количество товаров: 1k, 10k, 100k, 1m или число")
+    parser.add_argument("--orders", type=parse_scale, help="Количество заказов (по умолчанию равно числу товаров)")
+    parser.add_argument("--users", type=parse_scale, help="Количество клиентов (по умолчанию 10%% от товаров)")
+    parser.add_argument("--pickup-points", type=int, help="Количество пунктов выдачи")
+    parser.add_argument("--max-lines", type=int, default=4, help="Максимум позиций в заказе")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--reset", action="store_true", help="Удалить существующие таблицы перед генерацией")
+    parser.add_argument("--yes", action="store_true", help="Не спрашивать подтверждение для баз кроме SQLite")
+    args = parser.parse_args()
+
+    confirm_database(args.database_url, args.yes)
+    os.environ["DATABASE_URL"] = args.database_url
+    print(f"Генерация данных в {args.database_url} (масштаб {args.scale})...")
+    counts = generate(
+        parse_scale(args.scale),
+        orders=args.orders,
+        users=args.users,
+        pickup_points=args.pickup_points,
+        max_lines=args.max_lines,
+        seed=args.seed,
+        reset=args.reset,
+    )
+    for name, value in counts.items():
+        print(f"  {name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
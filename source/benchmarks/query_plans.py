@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.datagen import BENCH_DATABASE_URL, confirm_database
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BEFORE_REVISION = "0002"
+AFTER_REVISION = "0003"
+DEFAULT_REPEAT = 20
+
+QUERIES = {
+    "orders.count_per_day": "SELECT count(*) FROM orders WHERE order_date = :order_date",
+    "orders.by_status": ("SELECT * FROM orders WHERE status = :status ORDER BY order_date DESC LIMIT 50"),
+    "orders.by_pickup_point": "SELECT count(*) FROM orders WHERE pickup_point_id = :pickup_point_id",
+    "orders.lines": "SELECT * FROM order_product WHERE order_id = :order_id",
+    "products.has_orders": "SELECT 1 FROM order_product WHERE product_id = :article LIMIT 1",
+    "products.by_supplier": ("SELECT * FROM products WHERE supplier = :supplier ORDER BY article LIMIT 50"),
+    "products.by_quantity": "SELECT * FROM products ORDER BY quantity DESC, article LIMIT 50",
+    "products.suppliers": "SELECT DISTINCT supplier FROM products ORDER BY supplier",
+}
+
+
+def explain(connection, statement: str, parameters: dict) -> list[str]:
+    from sqlalchemy import text
+
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {statement}"), parameters)
+        return [row[0] for row in rows]
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {statement}"), parameters)
+    return [row[-1] for row in rows]
+
+
+def measure(connection, statement: str, parameters: dict, repeat: int) -> dict:
+    from sqlalchemy import text
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        connection.execute(text(statement), parameters).all()
+        timings.append(time.perf_counter() - started_at)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+    }
+
+
+def sample_parameters(connection) -> dict:
+    from sqlalchemy import text
+
+    order = connection.execute(text("SELECT id, order_date, status, pickup_point_id FROM orders LIMIT 1")).first()
+    product = connection.execute(text("SELECT article, supplier FROM products ORDER BY article DESC LIMIT 1")).first()
+    if order is None or product is None:
+        raise SystemExit("База пуста: сначала запустите python -m benchmarks.datagen")
+    return {
+        "order_id": order.id,
+        "order_date": order.order_date,
+        "status": order.status,
+        "pickup_point_id": order.pickup_point_id,
+        "article": product.article,
+        "supplier": product.supplier,
+    }
+
+
+def collect(repeat: int) -> dict:
+    from src.db.database import engine
+
+    results = {}
+    with engine.connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+        parameters = sample_parameters(connection)
+        for name, statement in QUERIES.items():
+            results[name] = {
+                "plan": explain(connection, statement, parameters),
+                **measure(connection, statement, parameters, repeat),
+            }
+    return results
+
+
+def run(repeat: int) -> dict:
+    from src.db.database import engine
+    from src.db.migrate import downgrade_database, upgrade_database
+
+    upgrade_database()
+    print(f"Откат индексов до ревизии {BEFORE_REVISION}...")
+    downgrade_database(BEFORE_REVISION)
+    before = collect(repeat)
+    print(f"Применение миграций до ревизии {AFTER_REVISION}...")
+    upgrade_database(AFTER_REVISION)
+    after = collect(repeat)
+    upgrade_database()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "before_revision": BEFORE_REVISION,
+            "after_revision": AFTER_REVISION,
+            "repeat": repeat,
+        },
+        "queries": {name: {"before": before[name], "after": after[name]} for name in QUERIES},
+    }
+
+
+def report(result: dict):
+    for name, stages in result["queries"].items():
+        before, after = stages["before"], stages["after"]
+        print(f"\n{name}: {before['median_ms']} мс → {after['median_ms']} мс")
+        print("  до:    " + "\n         ".join(before["plan"]))
+        print("  после: " + "\n         ".join(after["plan"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Планы запросов до и после миграций с индексами")
+    parser.add_argument("--database-url", default=BENCH_DATABASE_URL)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Повторов каждого запроса")
+    parser.add_argument("--output", type=Path, help="Файл для результатов JSON")
+    parser.add_argument("--yes", action="store_true", help="Не спрашивать подтверждение для баз кроме SQLite")
+    args = parser.parse_args()
+
+    confirm_database(args.database_url, args.yes)
+    os.environ["DATABASE_URL"] = args.database_url
+    print(f"Сравнение планов запросов на {args.database_url}...")
+    result = run(args.repeat)
+    report(result)
+
+    output = args.output or RESULTS_DIR / f"query-plans-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    print(f"\nРезультаты сохранены в {output}")
+
+
+if __name__ == "__main__":
+    main()
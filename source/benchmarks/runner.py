@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.datagen import BENCH_DATABASE_URL, BENCH_PASSWORD, BENCH_USERS, confirm_database
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_REQUESTS = 200
+DEFAULT_CONCURRENCY = 8
+DEFAULT_WARMUP = 10
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    role: str | None = None
+    method: str = "GET"
+    params: dict = field(default_factory=dict)
+    json: dict | None = None
+    requests: int | None = None
+
+
+def build_scenarios(article: str, order_id: int, supplier: str, token: int, products: int) -> list[Scenario]:
+    return [
+        Scenario("health", "/health"),
+        Scenario(
+            "auth.login",
+            "/api/auth/login-json",
+            method="POST",
+            json={"login": BENCH_USERS["manager"][1], "password": BENCH_PASSWORD},
+            requests=20,
+        ),
+        Scenario("products.list.guest", "/api/products", requests=20),
+        Scenario("products.page.guest", "/api/products", params={"limit": 50}),
+        Scenario("products.page.deep", "/api/products", params={"limit": 50, "offset": products // 2}),
+        Scenario("products.search", "/api/products", "manager", params={"search": "кожаные ботинки", "limit": 50}),
+        Scenario("products.supplier", "/api/products", "manager", params={"supplier": supplier, "limit": 50}),
+        Scenario("products.sort", "/api/products", "manager", params={"sort_by_quantity": "desc", "limit": 50}),
+        Scenario(
+            "products.filter",
+            "/api/products",
+            "manager",
+            params={
+                "min_final_price": 1000,
+                "max_final_price": 5000,
+                "in_stock": "true",
+                "sort": "-final_price",
+                "limit": 50,
+            },
+        ),
+        Scenario("products.suppliers", "/api/products/suppliers", "admin"),
+        Scenario("products.detail", f"/api/products/{article}"),
+        Scenario("products.changes.full", "/api/products/changes", requests=10),
+        Scenario("products.changes.delta", "/api/products/changes", params={"since": max(token - 10, 1)}),
+        Scenario("products.update", f"/api/products/{article}", "admin", method="PUT", json={"quantity": 10}),
+        Scenario("orders.page", "/api/orders", "manager", params={"limit": 50}),
+        Scenario("orders.detail", f"/api/orders/{order_id}", "manager"),
+        Scenario("orders.changes.delta", "/api/orders/changes", "manager", params={"since": max(token - 10, 1)}),
+        Scenario("orders.pickup_points", "/api/orders/pickup-points", "manager"),
+        Scenario("export.products.csv", "/api/export/products", "manager", params={"format": "csv"}, requests=5),
+    ]
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: list[float], sizes: list[int], errors: int, elapsed: float) -> dict:
+    result = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "mean_bytes": round(statistics.fmean(sizes)),
+    }
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = round(percentile(latencies, p) * 1000, 3)
+    return result
+
+
+async def run_scenario(client, scenario: Scenario, headers: dict, requests: int, concurrency: int, warmup: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    sizes: list[int] = []
+    errors = 0
+
+    async def call(record: bool):
+        nonlocal errors
+        async with semaphore:
+            started_at = time.perf_counter()
+            response = await client.request(
+                scenario.method, scenario.path, params=scenario.params, json=scenario.json, headers=headers
+            )
+            body = await response.aread()
+            if not record:
+                return
+            latencies.append(time.perf_counter() - started_at)
+            sizes.append(len(body))
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(call(False) for _ in range(min(warmup, requests))))
+    started_at = time.perf_counter()
+    await asyncio.gather(*(call(True) for _ in range(requests)))
+    return summarize(latencies, sizes, errors, time.perf_counter() - started_at)
+
+
+async def login(client, login: str) -> dict:
+    response = await client.post("/api/auth/login-json", json={"login": login, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(requests: int, concurrency: int, warmup: int, only: list[str] | None) -> dict:
+    import httpx
+    from sqlalchemy import func
+
+    from src.db.database import SessionLocal, engine
+    from src.db.models.models import Order, Product, Supplier
+    from src.db.sync import current_version
+    from src.entrypoints.main import app
+
+    db = SessionLocal()
+    try:
+        article = db.query(func.min(Product.article)).scalar()
+        order_id = db.query(func.min(Order.id)).scalar() or 1
+        supplier = db.query(Supplier.name).order_by(Supplier.id).limit(1).scalar() or ""
+        token = current_version(db)
+        counts = {"products": db.query(Product).count(), "orders": db.query(Order).count()}
+    finally:
+        db.close()
+
+    if article is None:
+        raise SystemExit("База пуста: сначала запустите python -m benchmarks.datagen")
+
+    scenarios = build_scenarios(article, order_id, supplier, token, counts["products"])
+    if only:
+        scenarios = [scenario for scenario in scenarios if any(scenario.name.startswith(name) for name in only)]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            headers = {role: await login(client, user_login) for role, (_, user_login) in BENCH_USERS.items()}
+            headers[None] = {}
+
+            for scenario in scenarios:
+                total = min(scenario.requests or requests, requests)
+                print(f"  {scenario.name}: {total} запросов...", end="", flush=True)
+                results[scenario.name] = await run_scenario(
+                    client, scenario, headers[scenario.role], total, concurrency, warmup
+                )
+                print(f" p50={results[scenario.name]['p50_ms']} мс, p95={results[scenario.name]['p95_ms']} мс")
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "data": counts,
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(baseline: dict, current: dict):
+    print(f"\n{'сценарий':<26}" + "".join(f"{title:>28}" for title in ("p50, мс", "p95, мс", "rps")))
+    for name, stats in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        cells = []
+        for metric in ("p50_ms", "p95_ms", "throughput_rps"):
+            old, new = before[metric], stats[metric]
+            change = (new - old) / old * 100 if old else 0
+            cells.append(f"{old:>10.1f} → {new:<10.1f}{change:+5.0f}%")
+        print(f"{name:<26}" + "".join(f"{cell:>28}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон API в памяти процесса")
+    parser.add_argument("--database-url", default=BENCH_DATABASE_URL)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--only", nargs="*", help="Префиксы имён сценариев")
+    parser.add_argument("--output", type=Path, help="Файл для результатов JSON")
+    parser.add_argument("--compare", type=Path, help="Файл с результатами предыдущего прогона")
+    parser.add_argument("--yes", action="store_true", help="Не спрашивать подтверждение для баз кроме SQLite")
+    args = parser.parse_args()
+
+    confirm_database(args.database_url, args.yes)
+    os.environ["DATABASE_URL"] = args.database_url
+    print(f"Прогон сценариев на {args.database_url}...")
+    result = asyncio.run(run(args.requests, args.concurrency, args.warmup, args.only))
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Результаты сохранены в {output}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf-8")), result)
+
+
+if __name__ == "__main__":
+    main()
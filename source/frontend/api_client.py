@@ -0,0 +1,78 @@
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_TIMEOUT = 5
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class ApiClient:
+    def __init__(self, base_url: str, pool_size: int = 8, retries: int = 2, timeout: float = DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.access_token: str | None = None
+        self.pool_size = pool_size
+        self.retries = retries
+        self._session: "requests.Session | None" = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
+
+    def request(self, method: str, path: str, **kwargs) -> "requests.Response":
+        headers = kwargs.pop("headers", None) or {}
+        if self.access_token and "Authorization" not in headers:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, self.url(path), headers=headers, **kwargs)
+
+    def get(self, path: str, **kwargs) -> "requests.Response":
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> "requests.Response":
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> "requests.Response":
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> "requests.Response":
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
@@ -1,16 +1,36 @@
 # Don't touch this shit!!!! Just close your laptop and go home, trust me u don't want to read it...
 
 import os
+import time
 from datetime import date, timedelta
-from io import BytesIO
 from pathlib import Path
 from tkinter import filedialog, messagebox
 
 import customtkinter as ctk
-import requests
-from PIL import Image
+from api_client import ApiClient
+from query_engine import ProductIndex
+from replica import Replica, legacy_replica_path, remove_replica, replica_path
+from tasks import TaskRunner
+from virtual_list import VirtualList
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+ASSETS_DIR = Path(os.getenv("SHOE_SHOP_ASSETS_DIR", Path(__file__).resolve().parents[2] / "static" / "images"))
+LOGO_URL = "/static/images/logo.png"
+WORKER_THREADS = 4
+PRODUCT_IMAGE_SIZE = (200, 180)
+PAGE_SIZE = 50
+PRODUCT_ROW_HEIGHT = 310
+ORDER_ROW_HEIGHT = 300
+ADMIN_ACTIONS_HEIGHT = 60
+FILTER_DEBOUNCE_MS = 300
+CATALOGUE_REFRESH_DEBOUNCE_MS = 1000
+CATALOGUE_MAX_AGE = 30
+EVENT_DEBOUNCE_MS = 200
+OUTBOX_RETRY_MS = 30000
+APP_TITLE = "ООО «Обувь» - Магазин обуви"
+REPLICA_ENABLED = os.getenv("SHOE_SHOP_REPLICA", "1") != "0"
+QUEUED_MESSAGE = "Сервер недоступен. Изменения сохранены локально и будут отправлены при восстановлении связи"
+CONFLICT_MESSAGE = "Запись была изменена другим пользователем. Данные обновлены, повторите изменение"
 
 COLORS = {
     "primary_bg": "#FFFFFF",
@@ -31,7 +51,7 @@ class ShoeShopApp(ctk.CTk):
     def __init__(self):
         super().__init__()
 
-        self.title("ООО «Обувь» - Магазин обуви")
+        self.title(APP_TITLE)
         self.geometry("1400x900")
         self.minsize(1200, 700)
 
@@ -40,24 +60,94 @@ class ShoeShopApp(ctk.CTk):
 
         self.setup_icon()
 
+        self.api = ApiClient(API_BASE_URL, pool_size=WORKER_THREADS * 2)
+        self.tasks = TaskRunner(self, max_workers=WORKER_THREADS)
+        self._image_cache = None
+        self.replica = None
+        if REPLICA_ENABLED:
+            remove_replica(legacy_replica_path(API_BASE_URL))
+        self.outbox_flushing = False
+        self.offline = False
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.current_user = None
         self.access_token = None
 
         self.products_cache = []
+        self.products_total = 0
+        self.products_params = {}
+        self.products_page_loading = False
+        self.products_local_view = False
+        self.product_index = None
+        self.catalogue_token = 0
+        self.orders_token = 0
+        self.events = None
+        self.catalogue_loaded_at = 0.0
+        self.debounce_jobs = {}
         self.orders_cache = []
+        self.orders_total = 0
+        self.orders_page_loading = False
         self.suppliers_cache = []
         self.pickup_points_cache = []
 
         self.show_login_screen()
+        self.after_idle(self.tasks.submit, lambda: self.api.session)
 
     def setup_icon(self):
         try:
-            icon_path = Path("static/logo.ico")
+            icon_path = ASSETS_DIR / "Icon.ico"
             if icon_path.exists():
                 self.iconbitmap(str(icon_path))
         except:
             pass
 
+    @property
+    def image_cache(self):
+        if self._image_cache is None:
+            from image_cache import ImageCache
+
+            self._image_cache = ImageCache(self.api, max_workers=WORKER_THREADS)
+        return self._image_cache
+
+    @property
+    def access_token(self):
+        return self.api.access_token
+
+    @access_token.setter
+    def access_token(self, value):
+        self.api.access_token = value
+
+    def on_close(self):
+        self.stop_events()
+        self.tasks.shutdown()
+        if self._image_cache is not None:
+            self._image_cache.shutdown()
+        self.api.close()
+        if self.replica is not None:
+            self.replica.close()
+        self.destroy()
+
+    def show_logo(self, parent, size, **pack_options):
+        logo_url = LOGO_URL
+
+        def place_logo(logo_photo):
+            logo_label = ctk.CTkLabel(parent, image=logo_photo, text="")
+            logo_label.pack(**pack_options)
+
+        def load_logo():
+            return image_cache.load_local(logo_url, size, ASSETS_DIR / "logo.png") or image_cache.load(logo_url, size)
+
+        def on_loaded(logo_image):
+            if parent.winfo_exists():
+                place_logo(image_cache.store(logo_url, size, logo_image))
+
+        image_cache = self.image_cache
+        logo_photo = image_cache.cached(logo_url, size)
+        if logo_photo is not None:
+            place_logo(logo_photo)
+        else:
+            self.tasks.submit(load_logo, on_success=on_loaded, on_error=lambda e: None)
+
     def clear_window(self):
         for widget in self.winfo_children():
             widget.destroy()
@@ -80,17 +170,9 @@ class ShoeShopApp(ctk.CTk):
         content_frame = ctk.CTkFrame(login_frame, fg_color=COLORS["primary_bg"])
         content_frame.pack(padx=40, pady=40)
 
-        try:
-            logo_response = requests.get(f"{API_BASE_URL}/static/images/logo.png", timeout=2)
-            if logo_response.status_code == 200:
-                logo_image = Image.open(BytesIO(logo_response.content))
-                logo_image = logo_image.resize((120, 120), Image.Resampling.LANCZOS)
-                logo_photo = ctk.CTkImage(light_image=logo_image, size=(120, 120))
-
-                logo_label = ctk.CTkLabel(content_frame, image=logo_photo, text="")
-                logo_label.pack(pady=(0, 20))
-        except:
-            pass
+        logo_frame = ctk.CTkFrame(content_frame, fg_color=COLORS["primary_bg"])
+        logo_frame.pack()
+        self.show_logo(logo_frame, (120, 120), pady=(0, 20))
 
         title_label = ctk.CTkLabel(
             content_frame, text="ООО «Обувь»", font=("Times New Roman", 36, "bold"), text_color=COLORS["text"]
@@ -141,7 +223,7 @@ class ShoeShopApp(ctk.CTk):
         )
         self.password_entry.grid(row=3, column=0, pady=(0, 20))
 
-        login_button = ctk.CTkButton(
+        self.login_button = ctk.CTkButton(
             form_frame,
             text="Войти",
             width=350,
@@ -153,7 +235,7 @@ class ShoeShopApp(ctk.CTk):
             corner_radius=8,
             command=self.perform_login,
         )
-        login_button.grid(row=4, column=0, pady=(0, 10))
+        self.login_button.grid(row=4, column=0, pady=(0, 10))
 
         guest_button = ctk.CTkButton(
             form_frame,
@@ -184,10 +266,11 @@ class ShoeShopApp(ctk.CTk):
             messagebox.showerror("Ошибка", "Введите логин и пароль")
             return
 
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/auth/login-json", json={"login": login, "password": password}, timeout=5
-            )
+        def request_login():
+            return self.api.post("/api/auth/login-json", json={"login": login, "password": password})
+
+        def on_response(response):
+            self.login_button.configure(state="normal", text="Войти")
 
             if response.status_code == 200:
                 data = response.json()
@@ -198,22 +281,172 @@ class ShoeShopApp(ctk.CTk):
                 messagebox.showerror("Ошибка входа", "Неверный логин или пароль")
             else:
                 messagebox.showerror("Ошибка", f"Ошибка сервера: {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            messagebox.showerror(
-                "Ошибка подключения",
-                f"Не удалось подключиться к серверу\n\n"
-                f"Убедитесь, что FastAPI backend запущен по адресу:\n{API_BASE_URL}",
-            )
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
+
+        def on_error(error):
+            import requests
+
+            self.login_button.configure(state="normal", text="Войти")
+
+            if isinstance(error, requests.exceptions.ConnectionError):
+                messagebox.showerror(
+                    "Ошибка подключения",
+                    f"Не удалось подключиться к серверу\n\n"
+                    f"Убедитесь, что FastAPI backend запущен по адресу:\n{API_BASE_URL}",
+                )
+            else:
+                messagebox.showerror("Ошибка", f"Произошла ошибка: {str(error)}")
+
+        self.login_button.configure(state="disabled", text="⏳ Вход...")
+        self.tasks.submit(request_login, on_success=on_response, on_error=on_error, key="login")
 
     def login_as_guest(self):
         self.current_user = {"role": "Гость", "full_name": "Гость", "login": "guest"}
         self.access_token = None
         self.show_main_screen()
 
+    def start_events(self):
+        self.stop_events()
+        from event_stream import EventSubscriber
+
+        self.events = EventSubscriber(
+            self.api,
+            on_event=lambda event: self.tasks.call_soon(self.handle_event, event),
+            on_connected=lambda: self.tasks.call_soon(self.on_events_connected),
+        )
+        self.events.start()
+
+    def stop_events(self):
+        if self.events is not None:
+            self.events.stop()
+            self.events = None
+
+    def on_events_connected(self):
+        self.set_offline(False)
+        self.flush_outbox()
+        self.handle_event({"entity": "*", "op": "resync"})
+
+    def set_offline(self, offline):
+        if offline != self.offline:
+            self.offline = offline
+            self.title(f"{APP_TITLE} — нет связи, данные из локальной копии" if offline else APP_TITLE)
+
+    def send_write(self, method, path, body=None, entity=None, entity_id=None, base_version=None):
+        import requests
+
+        headers = {} if base_version is None else {"If-Match": f'"{base_version}"'}
+        try:
+            return self.api.request(method, path, json=body, headers=headers)
+        except requests.exceptions.ConnectionError:
+            if self.replica is None:
+                raise
+            self.replica.enqueue(self.current_user["login"], method, path, body, entity, entity_id, base_version)
+            return None
+
+    def flush_outbox(self):
+        if self.replica is None or self.current_user is None or self.outbox_flushing:
+            return
+        replica = self.replica
+        login = self.current_user["login"]
+        self.outbox_flushing = True
+
+        def replay():
+            import requests
+
+            sent = 0
+            problems = []
+            interrupted = False
+            versions = {}
+            for entry in replica.pending(login):
+                target = (entry["entity"], entry["entity_id"])
+                base_version = versions.get(target, entry["base_version"])
+                headers = {} if base_version is None else {"If-Match": f'"{base_version}"'}
+                try:
+                    response = self.api.request(entry["method"], entry["path"], json=entry["body"], headers=headers)
+                except requests.exceptions.ConnectionError:
+                    interrupted = True
+                    break
+
+                if response.status_code < 400:
+                    sent += 1
+                    replica.finish(entry["id"])
+                    if response.content:
+                        versions[target] = response.json().get("version", base_version)
+                    continue
+
+                try:
+                    detail = response.json().get("detail", response.status_code)
+                except ValueError:
+                    detail = response.status_code
+                status = "conflict" if response.status_code == 409 else "failed"
+                replica.finish(entry["id"], status, str(detail))
+                problems.append(f"{entry['method']} {entry['path']}: {detail}")
+
+            return sent, problems, interrupted
+
+        def on_done(result):
+            self.outbox_flushing = False
+            sent, problems, interrupted = result
+            if interrupted:
+                self.debounce("outbox", OUTBOX_RETRY_MS, self.flush_outbox)
+            if problems:
+                messagebox.showwarning(
+                    "Синхронизация",
+                    "Часть локальных изменений не удалось отправить, они отменены:\n\n" + "\n".join(problems),
+                )
+            if sent or problems:
+                self.handle_event({"entity": "*", "op": "resync"})
+
+        def on_error(error):
+            self.outbox_flushing = False
+            print(f"Ошибка отправки локальных изменений: {error}")
+
+        self.tasks.submit(replay, on_success=on_done, on_error=on_error, key="outbox")
+
+    def handle_event(self, event):
+        if self.current_user is None:
+            return
+
+        entity = event.get("entity")
+        if entity in ("product", "*"):
+            if self.product_index is not None:
+                self.debounce("catalogue", EVENT_DEBOUNCE_MS, self.refresh_catalogue)
+            elif entity == "product" and self.products_visible():
+                self.refresh_product(event.get("op"), event.get("id"))
+
+        if entity in ("order", "*") and self.orders_visible():
+            self.debounce("orders", EVENT_DEBOUNCE_MS, self.refresh_orders)
+
+    def refresh_product(self, op, article):
+        if not any(product["article"] == article for product in self.products_cache):
+            return
+        if op == "delete":
+            self.remove_product(article)
+            return
+
+        def request_product():
+            return self.api.get(f"/api/products/{article}")
+
+        def on_response(response):
+            if response.status_code == 200:
+                self.upsert_product(response.json())
+            elif response.status_code == 404:
+                self.remove_product(article)
+
+        self.tasks.submit(
+            request_product, on_success=on_response, on_error=lambda e: print(f"Ошибка обновления товара: {e}")
+        )
+
+    def open_replica(self):
+        if self.replica is not None:
+            self.replica.close()
+        self.replica = None
+        if REPLICA_ENABLED:
+            self.replica = Replica(replica_path(API_BASE_URL, self.current_user["login"], self.current_user["role"]))
+
     def show_main_screen(self):
         self.clear_window()
+        self.open_replica()
+        self.start_events()
 
         header_frame = ctk.CTkFrame(
             self, height=80, fg_color=COLORS["primary_bg"], border_width=0, border_color=COLORS["secondary_bg"]
@@ -227,17 +460,9 @@ class ShoeShopApp(ctk.CTk):
         left_frame = ctk.CTkFrame(header_frame, fg_color=COLORS["primary_bg"])
         left_frame.pack(side="left", fill="y", padx=20)
 
-        try:
-            logo_response = requests.get(f"{API_BASE_URL}/static/images/logo.png", timeout=2)
-            if logo_response.status_code == 200:
-                logo_image = Image.open(BytesIO(logo_response.content))
-                logo_image = logo_image.resize((50, 50), Image.Resampling.LANCZOS)
-                logo_photo = ctk.CTkImage(light_image=logo_image, size=(50, 50))
-
-                logo_label = ctk.CTkLabel(left_frame, image=logo_photo, text="")
-                logo_label.pack(side="left", padx=(0, 15))
-        except:
-            pass
+        logo_frame = ctk.CTkFrame(left_frame, fg_color=COLORS["primary_bg"])
+        logo_frame.pack(side="left")
+        self.show_logo(logo_frame, (50, 50), side="left", padx=(0, 15))
 
         title = ctk.CTkLabel(
             left_frame, text="ООО «Обувь»", font=("Times New Roman", 24, "bold"), text_color=COLORS["text"]
@@ -308,10 +533,29 @@ class ShoeShopApp(ctk.CTk):
         self.show_products_screen()
 
     def logout(self):
+        if self.replica is not None:
+            pending = len(self.replica.pending(self.current_user["login"]))
+            if pending and not messagebox.askyesno(
+                "Выход",
+                f"Есть неотправленные изменения ({pending}). При выходе они будут удалены.\n\nВыйти?",
+            ):
+                return
+            self.replica.purge()
+            self.replica = None
+
+        for key in ("products", "products-page", "catalogue", "suppliers", "orders", "orders-page", "orders-changes"):
+            self.tasks.cancel(key)
+        for job in self.debounce_jobs.values():
+            self.after_cancel(job)
+        self.debounce_jobs.clear()
+        self.stop_events()
+
         self.current_user = None
         self.access_token = None
         self.products_cache = []
+        self.product_index = None
         self.orders_cache = []
+        self.orders_token = 0
         self.show_login_screen()
 
     def show_products_screen(self):
@@ -442,31 +686,46 @@ class ShoeShopApp(ctk.CTk):
             )
             sort_combo.pack(fill="x")
 
-        self.products_scroll = ctk.CTkScrollableFrame(main_container, fg_color=COLORS["primary_bg"], border_width=0)
-        self.products_scroll.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+        row_height = PRODUCT_ROW_HEIGHT
+        if self.current_user["role"] == "Администратор":
+            row_height += ADMIN_ACTIONS_HEIGHT
+
+        self.products_list = VirtualList(
+            main_container,
+            row_height=row_height,
+            create_row=lambda master: ProductCard(master, self),
+            bg=COLORS["primary_bg"],
+            message_color=COLORS["text_gray"],
+            on_near_end=self.load_more_products,
+        )
+        self.products_list.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
         self.load_products()
 
-    def apply_filters(self):
-        self.load_products()
+    def can_filter_products(self):
+        return self.current_user is not None and self.current_user["role"] in ["Менеджер", "Администратор"]
 
-    def load_products(self):
-        for widget in self.products_scroll.winfo_children():
-            widget.destroy()
+    def orders_replica(self):
+        return self.replica if self.can_filter_products() else None
 
-        loading_label = ctk.CTkLabel(
-            self.products_scroll,
-            text="⏳ Загрузка товаров...",
-            font=("Times New Roman", 16),
-            text_color=COLORS["text_gray"],
-        )
-        loading_label.pack(pady=50)
+    def products_visible(self):
+        return hasattr(self, "products_list") and self.products_list.winfo_exists()
+
+    def debounce(self, name, delay_ms, callback):
+        job = self.debounce_jobs.get(name)
+        if job is not None:
+            self.after_cancel(job)
+
+        def run():
+            self.debounce_jobs.pop(name, None)
+            callback()
 
-        self.update()
+        self.debounce_jobs[name] = self.after(delay_ms, run)
 
+    def product_filters(self):
         params = {}
 
-        if self.current_user["role"] in ["Менеджер", "Администратор"]:
+        if self.can_filter_products():
             if hasattr(self, "search_entry"):
                 search = self.search_entry.get().strip()
                 if search:
@@ -484,297 +743,228 @@ class ShoeShopApp(ctk.CTk):
                 elif sort_option == "Количество ↓":
                     params["sort_by_quantity"] = "desc"
 
-        try:
-            headers = {}
-            if self.access_token:
-                headers["Authorization"] = f"Bearer {self.access_token}"
+        return params
 
-            response = requests.get(f"{API_BASE_URL}/api/products", params=params, headers=headers, timeout=5)
+    def apply_filters(self):
+        if self.product_index is None:
+            self.debounce("filters", FILTER_DEBOUNCE_MS, self.load_products)
+            return
 
-            if response.status_code == 200:
-                self.products_cache = response.json()
+        self.show_local_products()
+        if time.monotonic() - self.catalogue_loaded_at >= CATALOGUE_MAX_AGE:
+            self.debounce("catalogue", CATALOGUE_REFRESH_DEBOUNCE_MS, self.refresh_catalogue)
 
-                if self.current_user["role"] == "Администратор":
-                    self.load_suppliers()
+    def show_local_products(self, reset_view=True):
+        if not self.products_visible():
+            return
 
-                loading_label.destroy()
+        self.tasks.cancel("products")
+        self.tasks.cancel("products-page")
+        self.products_page_loading = False
+        self.products_local_view = True
 
-                if self.products_cache:
-                    self.display_products()
-                else:
-                    no_data = ctk.CTkLabel(
-                        self.products_scroll,
-                        text="Товары не найдены",
-                        font=("Times New Roman", 16),
-                        text_color=COLORS["text_gray"],
-                    )
-                    no_data.pack(pady=50)
-            else:
-                loading_label.destroy()
-                error_label = ctk.CTkLabel(
-                    self.products_scroll,
-                    text=f"❌ Ошибка загрузки товаров: {response.status_code}",
-                    font=("Times New Roman", 14),
-                    text_color=COLORS["error"],
-                )
-                error_label.pack(pady=50)
-        except Exception as e:
-            loading_label.destroy()
-            error_label = ctk.CTkLabel(
-                self.products_scroll,
-                text=f"❌ Не удалось загрузить товары:\n{str(e)}",
-                font=("Times New Roman", 14),
-                text_color=COLORS["error"],
-            )
-            error_label.pack(pady=50)
+        params = self.product_filters()
+        self.products_cache = self.product_index.query(
+            params.get("search"), params.get("supplier"), params.get("sort_by_quantity")
+        )
+        self.products_total = len(self.products_cache)
 
-    def load_suppliers(self):
-        try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(f"{API_BASE_URL}/api/products/suppliers", headers=headers, timeout=5)
+        if self.products_cache:
+            self.display_products(reset_view)
+        else:
+            self.products_list.show_message("Товары не найдены", COLORS["text_gray"])
 
-            if response.status_code == 200:
-                self.suppliers_cache = response.json()
-                if hasattr(self, "supplier_combo"):
-                    self.supplier_combo.configure(values=self.suppliers_cache)
-        except Exception as e:
-            print(f"Ошибка загрузки поставщиков: {e}")
+    def refresh_catalogue(self, render=False):
+        index = self.product_index
+        replica = self.replica
+        since = self.catalogue_token if index is not None else 0
 
-    def display_products(self):
-        for product in self.products_cache:
-            self.create_product_card(product)
+        def request_changes():
+            import requests
 
-    def create_product_card(self, product):
+            local_since = replica.token("product") if index is None and replica is not None else since
+            try:
+                response = self.api.get("/api/products/changes", params={"since": local_since})
+                response.raise_for_status()
+            except requests.exceptions.ConnectionError:
+                if index is None and local_since:
+                    return local_since, ProductIndex(replica.items("product")), [], [], True
+                raise
+
+            changes = response.json()
+            snapshot = changes.get("snapshot", not local_since)
+            if replica is not None:
+                replica.apply_changes(
+                    "product", changes["token"], changes["items"], changes["deleted"], snapshot=snapshot
+                )
+            if index is None or snapshot:
+                products = replica.items("product") if replica is not None else changes["items"]
+                return changes["token"], ProductIndex(products), [], [], False
+            return changes["token"], None, changes["items"], changes["deleted"], False
+
+        def on_loaded(result):
+            token, new_index, items, deleted, offline = result
+            self.set_offline(offline)
+            if new_index is not None:
+                self.product_index = new_index
+                changed = True
+            elif self.product_index is index:
+                changed = False
+                for article in deleted:
+                    changed = self.product_index.remove(article) or changed
+                for product in items:
+                    changed = self.product_index.upsert(product) or changed
+            else:
+                return
 
-        if product["quantity"] == 0 or product.get("out_of_stock", False):
-            card_bg = COLORS["out_of_stock_bg"]
-            border_color = COLORS["out_of_stock_bg"]
-            image_bg = COLORS["out_of_stock_bg"]
-        elif product["discount"] > 15:
-            card_bg = COLORS["discount_bg"]
-            border_color = COLORS["discount_bg"]
-            image_bg = COLORS["discount_bg"]
-        else:
-            card_bg = COLORS["primary_bg"]
-            border_color = COLORS["secondary_bg"]
-            image_bg = COLORS["secondary_bg"]
+            self.catalogue_token = token
+            self.catalogue_loaded_at = time.monotonic()
+            if render or offline or (changed and self.products_local_view):
+                self.show_local_products(reset_view=False)
 
-        card_outer = ctk.CTkFrame(self.products_scroll, fg_color="transparent")
-        card_outer.pack(fill="x", padx=10, pady=10)
+        self.tasks.submit(
+            request_changes,
+            on_success=on_loaded,
+            on_error=lambda e: print(f"Ошибка обновления каталога: {e}"),
+            key="catalogue",
+        )
 
-        card = ctk.CTkFrame(card_outer, fg_color=card_bg, border_width=3, border_color=border_color, corner_radius=8)
-        card.pack(fill="x")
+    def load_products(self):
+        if self.can_filter_products():
+            has_index = self.product_index is not None or (self.replica is not None and self.replica.token("product"))
+            self.refresh_catalogue(render=has_index)
+            if has_index:
+                return
 
-        if self.current_user["role"] == "Администратор":
-            card.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-            card.configure(cursor="hand2")
+        self.tasks.cancel("products-page")
+        self.products_cache = []
+        self.products_total = 0
+        self.products_page_loading = False
+        self.products_local_view = False
+        self.products_list.show_message("⏳ Загрузка товаров...", COLORS["text_gray"])
 
-        content_frame = ctk.CTkFrame(card, fg_color="transparent")
-        content_frame.pack(fill="both", expand=True)
+        params = self.product_filters()
+        self.products_params = params
 
-        if self.current_user["role"] == "Администратор":
-            content_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        def request_products():
+            return self.api.get("/api/products", params={**params, "limit": PAGE_SIZE, "offset": 0})
 
-        image_frame = ctk.CTkFrame(content_frame, width=220, fg_color=image_bg, corner_radius=0)
-        image_frame.pack(side="left", fill="y", padx=0, pady=0)
-        image_frame.pack_propagate(False)
+        def on_response(response):
+            if response.status_code == 200:
+                self.products_cache = response.json()
+                self.products_total = int(response.headers.get("X-Total-Count", len(self.products_cache)))
 
-        if self.current_user["role"] == "Администратор":
-            image_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+                if self.current_user["role"] == "Администратор":
+                    self.load_suppliers()
 
-        try:
-            if product.get("photo"):
-                img_url = f"{API_BASE_URL}{product['photo']}"
-                img_response = requests.get(img_url, timeout=2)
-                if img_response.status_code == 200:
-                    img = Image.open(BytesIO(img_response.content))
-                    img = img.resize((200, 180), Image.Resampling.LANCZOS)
-                    photo = ctk.CTkImage(light_image=img, size=(200, 180))
-
-                    img_label = ctk.CTkLabel(image_frame, image=photo, text="")
-                    img_label.place(relx=0.5, rely=0.5, anchor="center")
-
-                    if self.current_user["role"] == "Администратор":
-                        img_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+                if self.products_cache:
+                    self.display_products()
                 else:
-                    raise Exception()
+                    self.products_list.show_message("Товары не найдены", COLORS["text_gray"])
             else:
-                raise Exception()
-        except:
-            placeholder = ctk.CTkLabel(image_frame, text="👞", font=("Times New Roman", 72), text_color=COLORS["text"])
-            placeholder.place(relx=0.5, rely=0.5, anchor="center")
-            if self.current_user["role"] == "Администратор":
-                placeholder.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-        info_frame.pack(side="left", fill="both", expand=True, padx=20, pady=15)
-
-        if self.current_user["role"] == "Администратор":
-            info_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        top_row = ctk.CTkFrame(info_frame, fg_color="transparent")
-        top_row.pack(fill="x", pady=(0, 8))
-
-        if self.current_user["role"] == "Администратор":
-            top_row.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        article_label = ctk.CTkLabel(
-            top_row,
-            text=f"Артикул: {product['article']}",
-            font=("Times New Roman", 14, "bold"),
-            text_color=COLORS["text"],
-        )
-        article_label.pack(side="left")
+                self.products_list.show_message(f"❌ Ошибка загрузки товаров: {response.status_code}", COLORS["error"])
 
-        if self.current_user["role"] == "Администратор":
-            article_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        def on_error(error):
+            self.products_list.show_message(f"❌ Не удалось загрузить товары:\n{str(error)}", COLORS["error"])
 
-        if product["discount"] > 0:
-            discount_label = ctk.CTkLabel(
-                top_row,
-                text=f"-{product['discount']}%",
-                font=("Times New Roman", 13, "bold"),
-                text_color="#FFFFFF",
-                fg_color=COLORS["discount_bg"],
-                corner_radius=15,
-                padx=12,
-                pady=4,
-            )
-            discount_label.pack(side="right")
-            if self.current_user["role"] == "Администратор":
-                discount_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        self.tasks.submit(request_products, on_success=on_response, on_error=on_error, key="products")
 
-        name_label = ctk.CTkLabel(
-            info_frame,
-            text=product["name"],
-            font=("Times New Roman", 18, "bold"),
-            text_color=COLORS["text"],
-            anchor="w",
+    def load_more_products(self):
+        if self.products_page_loading or len(self.products_cache) >= self.products_total:
+            return
+        self.products_page_loading = True
+
+        def on_loaded(page):
+            products, total = page
+            self.products_page_loading = False
+            self.products_total = total
+            self.products_cache.extend(products)
+            self.image_cache.prefetch([product.get("photo") for product in products], PRODUCT_IMAGE_SIZE)
+            self.products_list.append_items(products, total)
+
+        def on_error(error):
+            self.products_page_loading = False
+            print(f"Ошибка загрузки страницы товаров: {error}")
+
+        self.tasks.submit(
+            self.request_page,
+            "/api/products",
+            self.products_params,
+            len(self.products_cache),
+            on_success=on_loaded,
+            on_error=on_error,
+            key="products-page",
         )
-        name_label.pack(fill="x", pady=(0, 8))
-        if self.current_user["role"] == "Администратор":
-            name_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        if product.get("description"):
-            desc_text = product["description"][:120] + ("..." if len(product["description"]) > 120 else "")
-            desc_label = ctk.CTkLabel(
-                info_frame,
-                text=desc_text,
-                font=("Times New Roman", 12),
-                text_color=COLORS["text_gray"],
-                anchor="w",
-                wraplength=700,
-            )
-            desc_label.pack(fill="x", pady=(0, 12))
-            if self.current_user["role"] == "Администратор":
-                desc_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
 
-        details_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-        details_frame.pack(fill="x", pady=(0, 12))
-        details_frame.grid_columnconfigure((0, 1, 2), weight=1)
+    def request_page(self, path, params, offset):
+        response = self.api.get(path, params={**params, "limit": PAGE_SIZE, "offset": offset})
+        response.raise_for_status()
+        return response.json(), int(response.headers.get("X-Total-Count", 0))
 
-        if self.current_user["role"] == "Администратор":
-            details_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        self._create_info_field(details_frame, "Категория", product["category"], 0, 0, product)
-        self._create_info_field(details_frame, "Производитель", product["manufacturer"], 0, 1, product)
-        self._create_info_field(details_frame, "Поставщик", product["supplier"], 0, 2, product)
-
-        separator = ctk.CTkFrame(info_frame, height=2, fg_color=COLORS["secondary_bg"])
-        separator.pack(fill="x", pady=(0, 12))
-        if self.current_user["role"] == "Администратор":
-            separator.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        bottom_row = ctk.CTkFrame(info_frame, fg_color="transparent")
-        bottom_row.pack(fill="x")
-        if self.current_user["role"] == "Администратор":
-            bottom_row.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+    def load_suppliers(self):
+        def request_suppliers():
+            return self.api.get("/api/products/suppliers")
 
-        price_frame = ctk.CTkFrame(bottom_row, fg_color="transparent")
-        price_frame.pack(side="left")
-        if self.current_user["role"] == "Администратор":
-            price_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        def on_response(response):
+            if response.status_code == 200:
+                self.suppliers_cache = response.json()
+                if hasattr(self, "supplier_combo"):
+                    self.supplier_combo.configure(values=self.suppliers_cache)
 
-        if product["discount"] > 0:
-            original_price = ctk.CTkLabel(
-                price_frame,
-                text=f"{product['price']:.2f} ₽",
-                font=("Times New Roman", 12, "overstrike"),
-                text_color=COLORS["error"],
-            )
-            original_price.pack()
-            if self.current_user["role"] == "Администратор":
-                original_price.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        final_price = ctk.CTkLabel(
-            price_frame,
-            text=f"{product['final_price']:.2f} ₽",
-            font=("Times New Roman", 22, "bold"),
-            text_color=COLORS["text"],
+        self.tasks.submit(
+            request_suppliers,
+            on_success=on_response,
+            on_error=lambda e: print(f"Ошибка загрузки поставщиков: {e}"),
+            key="suppliers",
         )
-        final_price.pack()
-        if self.current_user["role"] == "Администратор":
-            final_price.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        if product.get("out_of_stock", False) or product["quantity"] == 0:
-            stock_text = "НЕТ В НАЛИЧИИ"
-            stock_color = COLORS["error"]
-        elif product["quantity"] <= 3:
-            stock_text = f"Осталось {product['quantity']} {product['unit']}"
-            stock_color = "#FFA500"
-        else:
-            stock_text = f"В наличии: {product['quantity']} {product['unit']}"
-            stock_color = COLORS["discount_bg"]
 
-        stock_label = ctk.CTkLabel(
-            bottom_row, text=stock_text, font=("Times New Roman", 13, "bold"), text_color=stock_color
+    def display_products(self, reset_view=True):
+        self.image_cache.prefetch(
+            [product.get("photo") for product in self.products_cache[:PAGE_SIZE]], PRODUCT_IMAGE_SIZE
         )
-        stock_label.pack(side="right")
-        if self.current_user["role"] == "Администратор":
-            stock_label.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
-
-        if self.current_user["role"] == "Администратор":
-            separator2 = ctk.CTkFrame(card, height=2, fg_color=COLORS["secondary_bg"])
-            separator2.pack(fill="x")
+        self.products_list.set_items(self.products_cache, self.products_total, reset_view)
 
-            btn_frame = ctk.CTkFrame(card, fg_color="transparent")
-            btn_frame.pack(fill="x", padx=20, pady=12)
-
-            delete_btn = ctk.CTkButton(
-                btn_frame,
-                text="🗑️ Удалить",
-                width=140,
-                font=("Times New Roman", 12, "bold"),
-                fg_color=COLORS["discount_bg"],
-                hover_color="#246B43",
-                text_color="#FFFFFF",
-                corner_radius=6,
-                command=lambda p=product: self.delete_product(p),
-            )
-            delete_btn.pack(side="left")
+    def upsert_product(self, product):
+        if self.replica is not None:
+            self.replica.put("product", product)
+        if self.product_index is not None:
+            if not self.product_index.upsert(product):
+                return
+            if self.products_local_view:
+                self.show_local_products(reset_view=False)
+                return
 
-    def _create_info_field(self, parent, label, value, row, col, product=None):
-        field_frame = ctk.CTkFrame(parent, fg_color="transparent")
-        field_frame.grid(row=row, column=col, sticky="w", padx=(0, 15), pady=5)
+        if not self.products_visible():
+            return
 
-        if self.current_user["role"] == "Администратор" and product:
-            field_frame.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        for i, cached in enumerate(self.products_cache):
+            if cached["article"] == product["article"]:
+                self.products_cache[i] = product
+                self.products_list.set_items(self.products_cache, self.products_total, reset_view=False)
+                return
 
-        label_widget = ctk.CTkLabel(
-            field_frame, text=label.upper(), font=("Times New Roman", 10, "bold"), text_color=COLORS["text_gray"]
-        )
-        label_widget.pack(anchor="w")
+        self.load_products()
 
-        if self.current_user["role"] == "Администратор" and product:
-            label_widget.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+    def remove_product(self, article):
+        if self.replica is not None:
+            self.replica.delete("product", article)
+        if self.product_index is not None:
+            self.product_index.remove(article)
+            if self.products_local_view:
+                self.show_local_products(reset_view=False)
+                return
 
-        value_widget = ctk.CTkLabel(
-            field_frame, text=value, font=("Times New Roman", 13, "bold"), text_color=COLORS["text"]
-        )
-        value_widget.pack(anchor="w")
+        if not self.products_visible():
+            return
 
-        if self.current_user["role"] == "Администратор" and product:
-            value_widget.bind("<Button-1>", lambda e, p=product: self.edit_product(p))
+        remaining = [product for product in self.products_cache if product["article"] != article]
+        if len(remaining) != len(self.products_cache):
+            self.products_cache = remaining
+            self.products_total -= 1
+            if self.products_cache:
+                self.products_list.set_items(self.products_cache, self.products_total, reset_view=False)
+            else:
+                self.products_list.show_message("Товары не найдены", COLORS["text_gray"])
 
     def add_product(self):
         ProductDialog(self, mode="add")
@@ -789,21 +979,36 @@ class ShoeShopApp(ctk.CTk):
             f"Артикул: {product['article']}\n"
             f"Название: {product['name']}",
         ):
-            try:
-                headers = {"Authorization": f"Bearer {self.access_token}"}
-                response = requests.delete(
-                    f"{API_BASE_URL}/api/products/{product['article']}", headers=headers, timeout=5
+
+            def request_delete():
+                return self.send_write(
+                    "DELETE",
+                    f"/api/products/{product['article']}",
+                    entity="product",
+                    entity_id=product["article"],
+                    base_version=product.get("version"),
                 )
 
-                if response.status_code == 204:
+            def on_response(response):
+                if response is None:
+                    messagebox.showwarning("Нет связи", QUEUED_MESSAGE)
+                    self.remove_product(product["article"])
+                elif response.status_code == 204:
                     messagebox.showinfo("Успех", "Товар успешно удален")
-                    self.load_products()
+                    self.remove_product(product["article"])
+                elif response.status_code == 409:
+                    messagebox.showerror("Конфликт", CONFLICT_MESSAGE)
+                    self.refresh_product("update", product["article"])
                 elif response.status_code == 400:
                     messagebox.showerror("Ошибка удаления", "Невозможно удалить товар, который присутствует в заказах")
                 else:
                     messagebox.showerror("Ошибка", f"Ошибка удаления: {response.status_code}")
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить товар:\n{str(e)}")
+
+            self.tasks.submit(
+                request_delete,
+                on_success=on_response,
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось удалить товар:\n{str(e)}"),
+            )
 
     def show_orders_screen(self):
         self.products_nav_btn.configure(fg_color=COLORS["primary_bg"], border_width=2)
@@ -850,157 +1055,522 @@ class ShoeShopApp(ctk.CTk):
         header_border = ctk.CTkFrame(main_container, height=3, fg_color=COLORS["secondary_bg"])
         header_border.pack(fill="x", pady=(0, 20))
 
-        self.orders_scroll = ctk.CTkScrollableFrame(main_container, fg_color=COLORS["primary_bg"], border_width=0)
-        self.orders_scroll.pack(fill="both", expand=True)
+        row_height = ORDER_ROW_HEIGHT
+        if self.current_user["role"] == "Администратор":
+            row_height += ADMIN_ACTIONS_HEIGHT
+
+        self.orders_list = VirtualList(
+            main_container,
+            row_height=row_height,
+            create_row=lambda master: OrderCard(master, self),
+            bg=COLORS["primary_bg"],
+            message_color=COLORS["text_gray"],
+            on_near_end=self.load_more_orders,
+        )
+        self.orders_list.pack(fill="both", expand=True)
 
         self.load_orders()
 
     def load_orders(self):
-        for widget in self.orders_scroll.winfo_children():
-            widget.destroy()
+        self.tasks.cancel("orders-page")
+        self.orders_cache = []
+        self.orders_total = 0
+        self.orders_page_loading = False
+        self.orders_list.show_message("⏳ Загрузка заказов...", COLORS["text_gray"])
 
-        loading_label = ctk.CTkLabel(
-            self.orders_scroll,
-            text="⏳ Загрузка заказов...",
-            font=("Times New Roman", 16),
-            text_color=COLORS["text_gray"],
-        )
-        loading_label.pack(pady=50)
-        self.update()
+        if self.orders_replica() is not None:
+            self.load_orders_from_replica()
+            return
 
-        try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(f"{API_BASE_URL}/api/orders", headers=headers, timeout=5)
+        def request_orders():
+            return self.api.get("/api/orders", params={"limit": PAGE_SIZE, "offset": 0})
 
+        def on_response(response):
             if response.status_code == 200:
                 self.orders_cache = response.json()
-                loading_label.destroy()
+                self.orders_token = int(response.headers.get("X-Sync-Token", 0))
+                self.orders_total = int(response.headers.get("X-Total-Count", len(self.orders_cache)))
 
                 if self.orders_cache:
                     self.display_orders()
                 else:
-                    ctk.CTkLabel(
-                        self.orders_scroll,
-                        text="Заказы не найдены",
-                        font=("Times New Roman", 16),
-                        text_color=COLORS["text_gray"],
-                    ).pack(pady=50)
+                    self.orders_list.show_message("Заказы не найдены", COLORS["text_gray"])
             else:
-                loading_label.destroy()
-                ctk.CTkLabel(
-                    self.orders_scroll,
-                    text=f"❌ Ошибка загрузки: {response.status_code}",
-                    font=("Times New Roman", 14),
-                    text_color=COLORS["error"],
-                ).pack(pady=50)
-        except Exception as e:
-            loading_label.destroy()
-            ctk.CTkLabel(
-                self.orders_scroll,
-                text=f"❌ Не удалось загрузить заказы:\n{str(e)}",
-                font=("Times New Roman", 14),
-                text_color=COLORS["error"],
-            ).pack(pady=50)
+                self.orders_list.show_message(f"❌ Ошибка загрузки: {response.status_code}", COLORS["error"])
+
+        def on_error(error):
+            self.orders_list.show_message(f"❌ Не удалось загрузить заказы:\n{str(error)}", COLORS["error"])
+
+        self.tasks.submit(request_orders, on_success=on_response, on_error=on_error, key="orders")
+
+    def sync_orders(self, since):
+        import requests
+
+        replica = self.orders_replica()
+        try:
+            response = self.api.get("/api/orders/changes", params={"since": since})
+            response.raise_for_status()
+        except requests.exceptions.ConnectionError:
+            if replica is None or not since:
+                raise
+            return None
+
+        changes = response.json()
+        if replica is not None:
+            replica.apply_changes(
+                "order",
+                changes["token"],
+                changes["items"],
+                changes["deleted"],
+                snapshot=changes.get("snapshot", not since),
+            )
+        return changes
+
+    def load_orders_from_replica(self):
+        replica = self.orders_replica()
+
+        def request_orders():
+            changes = self.sync_orders(replica.token("order"))
+            return replica.items("order"), replica.token("order"), changes is None
+
+        def on_loaded(result):
+            orders, token, offline = result
+            self.set_offline(offline)
+            if not self.orders_visible():
+                return
+
+            self.orders_cache = orders
+            self.orders_total = len(orders)
+            self.orders_token = token
+            if self.orders_cache:
+                self.display_orders()
+            else:
+                self.orders_list.show_message("Заказы не найдены", COLORS["text_gray"])
+
+        def on_error(error):
+            self.orders_list.show_message(f"❌ Не удалось загрузить заказы:\n{str(error)}", COLORS["error"])
+
+        self.tasks.submit(request_orders, on_success=on_loaded, on_error=on_error, key="orders")
+
+    def load_more_orders(self):
+        if self.orders_page_loading or len(self.orders_cache) >= self.orders_total:
+            return
+        self.orders_page_loading = True
+
+        def on_loaded(page):
+            orders, total = page
+            self.orders_page_loading = False
+            self.orders_total = total
+            self.orders_cache.extend(orders)
+            self.orders_list.append_items(orders, total)
+
+        def on_error(error):
+            self.orders_page_loading = False
+            print(f"Ошибка загрузки страницы заказов: {error}")
+
+        self.tasks.submit(
+            self.request_page,
+            "/api/orders",
+            {},
+            len(self.orders_cache),
+            on_success=on_loaded,
+            on_error=on_error,
+            key="orders-page",
+        )
+
+    def refresh_orders(self):
+        if not self.orders_token:
+            self.load_orders()
+            return
+
+        since = self.orders_token
+
+        def request_changes():
+            return self.sync_orders(since)
+
+        def on_loaded(changes):
+            self.set_offline(changes is None)
+            if changes is None or not self.orders_visible():
+                return
+            if changes.get("snapshot"):
+                self.orders_token = 0
+                self.load_orders()
+                return
+            for order_id in changes["deleted"]:
+                self.remove_order(order_id)
+            for order in changes["items"]:
+                self.upsert_order(order)
+            self.orders_token = changes["token"]
+
+        self.tasks.submit(
+            request_changes,
+            on_success=on_loaded,
+            on_error=lambda e: print(f"Ошибка обновления заказов: {e}"),
+            key="orders-changes",
+        )
 
     def display_orders(self):
-        for order in self.orders_cache:
-            self.create_order_card(order)
+        self.orders_list.set_items(self.orders_cache, self.orders_total)
 
-    def create_order_card(self, order):
-        if order["status"].lower() in ["новый", "new"]:
-            status_bg = COLORS["secondary_bg"]
-            status_text = COLORS["text"]
+    def orders_visible(self):
+        return hasattr(self, "orders_list") and self.orders_list.winfo_exists()
+
+    def upsert_order(self, order):
+        replica = self.orders_replica()
+        if replica is not None:
+            replica.put("order", order)
+        if not self.orders_visible():
+            return
+
+        for i, cached in enumerate(self.orders_cache):
+            if cached["id"] == order["id"]:
+                if cached != order:
+                    self.orders_cache[i] = order
+                    self.orders_list.set_items(self.orders_cache, self.orders_total, reset_view=False)
+                return
+
+        if len(self.orders_cache) >= self.orders_total:
+            self.orders_cache.append(order)
+        self.orders_total += 1
+        self.orders_list.set_items(self.orders_cache, self.orders_total, reset_view=False)
+
+    def remove_order(self, order_id):
+        replica = self.orders_replica()
+        if replica is not None:
+            replica.delete("order", order_id)
+        if not self.orders_visible():
+            return
+
+        remaining = [order for order in self.orders_cache if order["id"] != order_id]
+        if len(remaining) != len(self.orders_cache):
+            self.orders_cache = remaining
+            self.orders_total -= 1
+            if self.orders_cache:
+                self.orders_list.set_items(self.orders_cache, self.orders_total, reset_view=False)
+            else:
+                self.orders_list.show_message("Заказы не найдены", COLORS["text_gray"])
+
+    def add_order(self):
+        OrderDialog(self, mode="add")
+
+    def edit_order(self, order):
+        OrderDialog(self, mode="edit", order=order)
+
+    def delete_order(self, order):
+        if messagebox.askyesno(
+            "Подтверждение удаления",
+            f"Вы уверены, что хотите удалить заказ?\n\n"
+            f"Номер заказа: {order['order_number']}\n"
+            f"Клиент: {order['client_full_name']}",
+        ):
+
+            def request_delete():
+                return self.send_write(
+                    "DELETE",
+                    f"/api/orders/{order['id']}",
+                    entity="order",
+                    entity_id=order["id"],
+                    base_version=order.get("version"),
+                )
+
+            def on_response(response):
+                if response is None:
+                    messagebox.showwarning("Нет связи", QUEUED_MESSAGE)
+                    self.remove_order(order["id"])
+                elif response.status_code == 204:
+                    messagebox.showinfo("Успех", "Заказ успешно удален")
+                    self.remove_order(order["id"])
+                elif response.status_code == 409:
+                    messagebox.showerror("Конфликт", CONFLICT_MESSAGE)
+                    self.refresh_orders()
+                else:
+                    messagebox.showerror("Ошибка", f"Ошибка удаления: {response.status_code}")
+
+            self.tasks.submit(
+                request_delete,
+                on_success=on_response,
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось удалить заказ:\n{str(e)}"),
+            )
+
+
+def bind_click(widget, command):
+    if isinstance(widget, ctk.CTkButton):
+        return
+
+    widget.bind("<Button-1>", lambda e: command(), add="+")
+    for child in widget.winfo_children():
+        if isinstance(child, ctk.CTkBaseClass):
+            bind_click(child, command)
+
+
+def create_info_field(parent, label, row, col):
+    field_frame = ctk.CTkFrame(parent, fg_color="transparent")
+    field_frame.grid(row=row, column=col, sticky="w", padx=(0, 15), pady=5)
+
+    label_widget = ctk.CTkLabel(
+        field_frame, text=label.upper(), font=("Times New Roman", 10, "bold"), text_color=COLORS["text_gray"]
+    )
+    label_widget.pack(anchor="w")
+
+    value_widget = ctk.CTkLabel(field_frame, text="", font=("Times New Roman", 13, "bold"), text_color=COLORS["text"])
+    value_widget.pack(anchor="w")
+    return value_widget
+
+
+class ProductCard(ctk.CTkFrame):
+
+    def __init__(self, master, app):
+        super().__init__(master, fg_color="transparent")
+        self.app = app
+        self.product = None
+        is_admin = app.current_user["role"] == "Администратор"
+
+        self.card = ctk.CTkFrame(self, border_width=3, corner_radius=8)
+        self.card.pack(fill="both", expand=True, padx=10, pady=10)
+
+        content_frame = ctk.CTkFrame(self.card, fg_color="transparent")
+        content_frame.pack(fill="both", expand=True)
+
+        self.image_frame = ctk.CTkFrame(content_frame, width=220, corner_radius=0)
+        self.image_frame.pack(side="left", fill="y", padx=0, pady=0)
+        self.image_frame.pack_propagate(False)
+
+        self.placeholder = ctk.CTkLabel(
+            self.image_frame, text="👞", font=("Times New Roman", 72), text_color=COLORS["text"]
+        )
+        self.image_label = ctk.CTkLabel(self.image_frame, text="")
+
+        info_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        info_frame.pack(side="left", fill="both", expand=True, padx=20, pady=15)
+
+        top_row = ctk.CTkFrame(info_frame, fg_color="transparent")
+        top_row.pack(fill="x", pady=(0, 8))
+
+        self.article_label = ctk.CTkLabel(
+            top_row, text="", font=("Times New Roman", 14, "bold"), text_color=COLORS["text"]
+        )
+        self.article_label.pack(side="left")
+
+        self.discount_label = ctk.CTkLabel(
+            top_row,
+            text="",
+            font=("Times New Roman", 13, "bold"),
+            text_color="#FFFFFF",
+            fg_color=COLORS["discount_bg"],
+            corner_radius=15,
+            padx=12,
+            pady=4,
+        )
+
+        self.name_label = ctk.CTkLabel(
+            info_frame, text="", font=("Times New Roman", 18, "bold"), text_color=COLORS["text"], anchor="w"
+        )
+        self.name_label.pack(fill="x", pady=(0, 8))
+
+        self.desc_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Times New Roman", 12),
+            text_color=COLORS["text_gray"],
+            anchor="w",
+            wraplength=700,
+        )
+
+        self.details_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        self.details_frame.pack(fill="x", pady=(0, 12))
+        self.details_frame.grid_columnconfigure((0, 1, 2), weight=1)
+
+        self.category_value = create_info_field(self.details_frame, "Категория", 0, 0)
+        self.manufacturer_value = create_info_field(self.details_frame, "Производитель", 0, 1)
+        self.supplier_value = create_info_field(self.details_frame, "Поставщик", 0, 2)
+
+        separator = ctk.CTkFrame(info_frame, height=2, fg_color=COLORS["secondary_bg"])
+        separator.pack(fill="x", pady=(0, 12))
+
+        bottom_row = ctk.CTkFrame(info_frame, fg_color="transparent")
+        bottom_row.pack(fill="x")
+
+        price_frame = ctk.CTkFrame(bottom_row, fg_color="transparent")
+        price_frame.pack(side="left")
+
+        self.original_price = ctk.CTkLabel(
+            price_frame, text="", font=("Times New Roman", 12, "overstrike"), text_color=COLORS["error"]
+        )
+        self.final_price = ctk.CTkLabel(
+            price_frame, text="", font=("Times New Roman", 22, "bold"), text_color=COLORS["text"]
+        )
+        self.final_price.pack()
+
+        self.stock_label = ctk.CTkLabel(bottom_row, text="", font=("Times New Roman", 13, "bold"))
+        self.stock_label.pack(side="right")
+
+        if is_admin:
+            separator2 = ctk.CTkFrame(self.card, height=2, fg_color=COLORS["secondary_bg"])
+            separator2.pack(fill="x")
+
+            btn_frame = ctk.CTkFrame(self.card, fg_color="transparent")
+            btn_frame.pack(fill="x", padx=20, pady=12)
+
+            delete_btn = ctk.CTkButton(
+                btn_frame,
+                text="🗑️ Удалить",
+                width=140,
+                font=("Times New Roman", 12, "bold"),
+                fg_color=COLORS["discount_bg"],
+                hover_color="#246B43",
+                text_color="#FFFFFF",
+                corner_radius=6,
+                command=lambda: app.delete_product(self.product),
+            )
+            delete_btn.pack(side="left")
+
+            self.card.configure(cursor="hand2")
+            bind_click(self.card, lambda: app.edit_product(self.product))
+
+    def update_item(self, product):
+        self.product = product
+
+        if product["quantity"] == 0 or product.get("out_of_stock", False):
+            card_bg = COLORS["out_of_stock_bg"]
+            border_color = COLORS["out_of_stock_bg"]
+            image_bg = COLORS["out_of_stock_bg"]
+        elif product["discount"] > 15:
+            card_bg = COLORS["discount_bg"]
+            border_color = COLORS["discount_bg"]
+            image_bg = COLORS["discount_bg"]
         else:
-            status_bg = COLORS["accent"]
-            status_text = COLORS["text"]
+            card_bg = COLORS["primary_bg"]
+            border_color = COLORS["secondary_bg"]
+            image_bg = COLORS["secondary_bg"]
+
+        self.card.configure(fg_color=card_bg, border_color=border_color)
+        self.image_frame.configure(fg_color=image_bg)
+
+        self.article_label.configure(text=f"Артикул: {product['article']}")
+        if product["discount"] > 0:
+            self.discount_label.configure(text=f"-{product['discount']}%")
+            self.discount_label.pack(side="right")
+            self.original_price.configure(text=f"{product['price']:.2f} ₽")
+            self.original_price.pack(before=self.final_price)
+        else:
+            self.discount_label.pack_forget()
+            self.original_price.pack_forget()
+
+        self.name_label.configure(text=product["name"])
+        if product.get("description"):
+            desc_text = product["description"][:120] + ("..." if len(product["description"]) > 120 else "")
+            self.desc_label.configure(text=desc_text)
+            self.desc_label.pack(fill="x", pady=(0, 12), before=self.details_frame)
+        else:
+            self.desc_label.pack_forget()
+
+        self.category_value.configure(text=product["category"])
+        self.manufacturer_value.configure(text=product["manufacturer"])
+        self.supplier_value.configure(text=product["supplier"])
+        self.final_price.configure(text=f"{product['final_price']:.2f} ₽")
+
+        if product.get("out_of_stock", False) or product["quantity"] == 0:
+            stock_text = "НЕТ В НАЛИЧИИ"
+            stock_color = COLORS["error"]
+        elif product["quantity"] <= 3:
+            stock_text = f"Осталось {product['quantity']} {product['unit']}"
+            stock_color = "#FFA500"
+        else:
+            stock_text = f"В наличии: {product['quantity']} {product['unit']}"
+            stock_color = COLORS["discount_bg"]
+        self.stock_label.configure(text=stock_text, text_color=stock_color)
+
+        self.show_image(product.get("photo"))
+
+    def show_image(self, photo_url):
+        image_cache = self.app.image_cache
+        photo = image_cache.cached(photo_url, PRODUCT_IMAGE_SIZE) if photo_url else None
+        if photo is not None:
+            self.set_image(photo)
+            return
+
+        self.image_label.place_forget()
+        self.placeholder.place(relx=0.5, rely=0.5, anchor="center")
+        if not photo_url:
+            return
+
+        def on_loaded(img):
+            photo = image_cache.store(photo_url, PRODUCT_IMAGE_SIZE, img)
+            if self.winfo_exists() and self.product.get("photo") == photo_url:
+                self.set_image(photo)
+
+        self.app.tasks.submit(
+            image_cache.load, photo_url, PRODUCT_IMAGE_SIZE, on_success=on_loaded, on_error=lambda e: None
+        )
+
+    def set_image(self, photo):
+        self.image_label.configure(image=photo)
+        self.placeholder.place_forget()
+        self.image_label.place(relx=0.5, rely=0.5, anchor="center")
+
+
+class OrderCard(ctk.CTkFrame):
+
+    def __init__(self, master, app):
+        super().__init__(master, fg_color="transparent")
+        self.app = app
+        self.order = None
+        is_admin = app.current_user["role"] == "Администратор"
 
         card = ctk.CTkFrame(
-            self.orders_scroll,
+            self,
             fg_color=COLORS["primary_bg"],
             border_width=3,
             border_color=COLORS["secondary_bg"],
             corner_radius=8,
         )
-        card.pack(fill="x", pady=(0, 15))
-
-        if self.current_user["role"] == "Администратор":
-            card.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-            card.configure(cursor="hand2")
+        card.pack(fill="both", expand=True, pady=(0, 15))
 
         content = ctk.CTkFrame(card, fg_color=COLORS["primary_bg"])
         content.pack(fill="both", padx=20, pady=20)
 
-        if self.current_user["role"] == "Администратор":
-            content.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
         header_frame = ctk.CTkFrame(content, fg_color=COLORS["primary_bg"])
         header_frame.pack(fill="x", pady=(0, 15))
 
-        if self.current_user["role"] == "Администратор":
-            header_frame.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
-        order_num = ctk.CTkLabel(
-            header_frame,
-            text=f"Заказ №{order['order_number']}",
-            font=("Times New Roman", 22, "bold"),
-            text_color=COLORS["text"],
+        self.order_num = ctk.CTkLabel(
+            header_frame, text="", font=("Times New Roman", 22, "bold"), text_color=COLORS["text"]
         )
-        order_num.pack(side="left")
+        self.order_num.pack(side="left")
 
-        if self.current_user["role"] == "Администратор":
-            order_num.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
-        status_label = ctk.CTkLabel(
+        self.status_label = ctk.CTkLabel(
             header_frame,
-            text=order["status"],
+            text="",
             font=("Times New Roman", 13, "bold"),
-            text_color=status_text,
-            fg_color=status_bg,
+            text_color=COLORS["text"],
             corner_radius=20,
             padx=16,
             pady=6,
         )
-        status_label.pack(side="right")
-
-        if self.current_user["role"] == "Администратор":
-            status_label.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
+        self.status_label.pack(side="right")
 
         separator = ctk.CTkFrame(content, height=2, fg_color=COLORS["secondary_bg"])
         separator.pack(fill="x", pady=(0, 15))
 
-        if self.current_user["role"] == "Администратор":
-            separator.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
         info_grid = ctk.CTkFrame(content, fg_color=COLORS["primary_bg"])
         info_grid.pack(fill="x", pady=(0, 15))
         info_grid.grid_columnconfigure((0, 1, 2), weight=1)
 
-        if self.current_user["role"] == "Администратор":
-            info_grid.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
-        self._create_info_field(info_grid, "Дата заказа", order["order_date"], 0, 0)
-        self._create_info_field(info_grid, "Дата выдачи", order["delivery_date"], 0, 1)
-        self._create_info_field(info_grid, "Клиент", order["client_full_name"], 1, 0)
-        self._create_info_field(info_grid, "Код получения", str(order["code"]), 1, 1)
+        self.order_date_value = create_info_field(info_grid, "Дата заказа", 0, 0)
+        self.delivery_date_value = create_info_field(info_grid, "Дата выдачи", 0, 1)
+        self.client_value = create_info_field(info_grid, "Клиент", 1, 0)
+        self.code_value = create_info_field(info_grid, "Код получения", 1, 1)
 
-        if order.get("pickup_address"):
-            address_label = ctk.CTkLabel(
-                info_grid, text="ПУНКТ ВЫДАЧИ", font=("Times New Roman", 10, "bold"), text_color=COLORS["text_gray"]
-            )
-            address_label.grid(row=2, column=0, columnspan=3, sticky="w", pady=(10, 2))
-
-            if self.current_user["role"] == "Администратор":
-                address_label.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
-
-            address_value = ctk.CTkLabel(
-                info_grid, text=order["pickup_address"], font=("Times New Roman", 13, "bold"), text_color=COLORS["text"]
-            )
-            address_value.grid(row=3, column=0, columnspan=3, sticky="w")
+        self.address_label = ctk.CTkLabel(
+            info_grid, text="ПУНКТ ВЫДАЧИ", font=("Times New Roman", 10, "bold"), text_color=COLORS["text_gray"]
+        )
+        self.address_label.grid(row=2, column=0, columnspan=3, sticky="w", pady=(10, 2))
 
-            if self.current_user["role"] == "Администратор":
-                address_value.bind("<Button-1>", lambda e, o=order: self.edit_order(o))
+        self.address_value = ctk.CTkLabel(
+            info_grid, text="", font=("Times New Roman", 13, "bold"), text_color=COLORS["text"]
+        )
+        self.address_value.grid(row=3, column=0, columnspan=3, sticky="w")
 
-        if self.current_user["role"] == "Администратор":
+        if is_admin:
             separator2 = ctk.CTkFrame(content, height=2, fg_color=COLORS["secondary_bg"])
             separator2.pack(fill="x", pady=(15, 0))
 
@@ -1016,34 +1586,36 @@ class ShoeShopApp(ctk.CTk):
                 hover_color="#246B43",
                 text_color="#FFFFFF",
                 corner_radius=6,
-                command=lambda o=order: self.delete_order(o),
+                command=lambda: app.delete_order(self.order),
             )
             delete_btn.pack(side="left")
 
-    def add_order(self):
-        OrderDialog(self, mode="add")
+            card.configure(cursor="hand2")
+            bind_click(card, lambda: app.edit_order(self.order))
 
-    def edit_order(self, order):
-        OrderDialog(self, mode="edit", order=order)
+    def update_item(self, order):
+        self.order = order
 
-    def delete_order(self, order):
-        if messagebox.askyesno(
-            "Подтверждение удаления",
-            f"Вы уверены, что хотите удалить заказ?\n\n"
-            f"Номер заказа: {order['order_number']}\n"
-            f"Клиент: {order['client_full_name']}",
-        ):
-            try:
-                headers = {"Authorization": f"Bearer {self.access_token}"}
-                response = requests.delete(f"{API_BASE_URL}/api/orders/{order['id']}", headers=headers, timeout=5)
+        if order["status"].lower() in ["новый", "new"]:
+            status_bg = COLORS["secondary_bg"]
+        else:
+            status_bg = COLORS["accent"]
 
-                if response.status_code == 204:
-                    messagebox.showinfo("Успех", "Заказ успешно удален")
-                    self.load_orders()
-                else:
-                    messagebox.showerror("Ошибка", f"Ошибка удаления: {response.status_code}")
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить заказ:\n{str(e)}")
+        self.order_num.configure(text=f"Заказ №{order['order_number']}")
+        self.status_label.configure(text=order["status"], fg_color=status_bg)
+
+        self.order_date_value.configure(text=order["order_date"])
+        self.delivery_date_value.configure(text=order["delivery_date"])
+        self.client_value.configure(text=order["client_full_name"])
+        self.code_value.configure(text=str(order["code"]))
+
+        if order.get("pickup_address"):
+            self.address_value.configure(text=order["pickup_address"])
+            self.address_label.grid()
+            self.address_value.grid()
+        else:
+            self.address_label.grid_remove()
+            self.address_value.grid_remove()
 
 
 class ProductDialog(ctk.CTkToplevel):
@@ -1222,7 +1794,7 @@ class ProductDialog(ctk.CTkToplevel):
         )
         cancel_btn.pack(side="left", padx=10)
 
-        save_btn = ctk.CTkButton(
+        self.save_btn = ctk.CTkButton(
             btn_frame,
             text="💾 Сохранить",
             width=150,
@@ -1233,7 +1805,7 @@ class ProductDialog(ctk.CTkToplevel):
             corner_radius=8,
             command=self.save,
         )
-        save_btn.pack(side="left", padx=10)
+        self.save_btn.pack(side="left", padx=10)
 
     def select_image(self):
         filename = filedialog.askopenfilename(
@@ -1275,47 +1847,96 @@ class ProductDialog(ctk.CTkToplevel):
         desc = self.description_text.get("1.0", "end-1c").strip()
         data["description"] = desc if desc else None
 
-        try:
-            headers = {"Authorization": f"Bearer {self.parent.access_token}", "Content-Type": "application/json"}
+        selected_image = self.selected_image
 
+        def request_save():
             if self.mode == "add":
-                response = requests.post(f"{API_BASE_URL}/api/products", json=data, headers=headers, timeout=5)
+                response = self.parent.send_write("POST", "/api/products", data, "product", data["article"])
             else:
-                article = self.product["article"]
-                response = requests.put(f"{API_BASE_URL}/api/products/{article}", json=data, headers=headers, timeout=5)
+                response = self.parent.send_write(
+                    "PUT",
+                    f"/api/products/{self.product['article']}",
+                    data,
+                    "product",
+                    self.product["article"],
+                    self.product.get("version"),
+                )
+            if response is None:
+                return None, None, None
 
+            image_warning = None
+            saved = None
             if response.status_code in [200, 201]:
-                product_data = response.json()
-                article = product_data.get("article")
+                article = response.json().get("article")
+                if selected_image and article:
+                    image_warning = self.upload_image(article, selected_image)
+
+                saved_response = self.parent.api.get(f"/api/products/{article}")
+                if saved_response.status_code == 200:
+                    saved = saved_response.json()
+
+            return response, image_warning, saved
+
+        def on_response(result):
+            response, image_warning, saved = result
+            if response is None:
+                self.parent.upsert_product(self.local_product(data))
+                messagebox.showwarning("Нет связи", QUEUED_MESSAGE)
+                if self.winfo_exists():
+                    self.destroy()
+                return
+            if not self.winfo_exists():
+                return
+            self.save_btn.configure(state="normal")
 
-                if self.selected_image and article:
-                    self.upload_image(article)
+            if response.status_code == 409:
+                messagebox.showerror("Конфликт", CONFLICT_MESSAGE)
+                self.parent.refresh_product("update", self.product["article"])
+            elif response.status_code in [200, 201]:
+                if image_warning:
+                    messagebox.showwarning("Предупреждение", image_warning)
+                elif selected_image and self.mode == "edit" and self.product.get("photo"):
+                    self.parent.image_cache.invalidate(self.product["photo"])
 
                 messagebox.showinfo("Успех", "Товар успешно сохранен")
-                self.parent.load_products()
+                if saved is not None:
+                    self.parent.upsert_product(saved)
+                    if self.parent.current_user["role"] == "Администратор":
+                        self.parent.load_suppliers()
+                else:
+                    self.parent.load_products()
                 self.destroy()
             elif response.status_code == 400:
                 error_detail = response.json().get("detail", "Ошибка валидации")
                 messagebox.showerror("Ошибка", error_detail)
             else:
                 messagebox.showerror("Ошибка", f"Ошибка сохранения: {response.status_code}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить товар:\n{str(e)}")
 
-    def upload_image(self, article):
-        try:
-            with open(self.selected_image, "rb") as f:
-                files = {"file": f}
-                headers = {"Authorization": f"Bearer {self.parent.access_token}"}
+        def on_error(error):
+            if self.winfo_exists():
+                self.save_btn.configure(state="normal")
+            messagebox.showerror("Ошибка", f"Не удалось сохранить товар:\n{str(error)}")
 
-                response = requests.post(
-                    f"{API_BASE_URL}/api/products/{article}/upload-image", files=files, headers=headers, timeout=10
-                )
+        self.save_btn.configure(state="disabled")
+        self.parent.tasks.submit(request_save, on_success=on_response, on_error=on_error)
+
+    def local_product(self, data):
+        product = {**(self.product or {"photo": "/static/images/picture.png"}), **data}
+        product["final_price"] = round(product["price"] * (100 - product["discount"]) / 100, 2)
+        product["out_of_stock"] = product["quantity"] == 0
+        return product
+
+    def upload_image(self, article, image_path):
+        try:
+            with open(image_path, "rb") as f:
+                response = self.parent.api.post(f"/api/products/{article}/upload-image", files={"file": f}, timeout=10)
 
                 if response.status_code != 200:
-                    messagebox.showwarning("Предупреждение", "Не удалось загрузить изображение")
+                    return "Не удалось загрузить изображение"
         except Exception as e:
-            messagebox.showwarning("Предупреждение", f"Ошибка загрузки изображения: {str(e)}")
+            return f"Ошибка загрузки изображения: {str(e)}"
+
+        return None
 
 
 class OrderDialog(ctk.CTkToplevel):
@@ -1335,8 +1956,8 @@ class OrderDialog(ctk.CTkToplevel):
         self.transient(parent)
         self.grab_set()
 
-        self.load_pickup_points()
         self.create_widgets()
+        self.load_pickup_points()
 
         self.update_idletasks()
         x = (self.winfo_screenwidth() // 2) - (self.winfo_width() // 2)
@@ -1344,14 +1965,30 @@ class OrderDialog(ctk.CTkToplevel):
         self.geometry(f"+{x}+{y}")
 
     def load_pickup_points(self):
-        try:
-            headers = {"Authorization": f"Bearer {self.parent.access_token}"}
-            response = requests.get(f"{API_BASE_URL}/api/orders/pickup-points", headers=headers, timeout=5)
+        def request_pickup_points():
+            return self.parent.api.get("/api/orders/pickup-points")
 
-            if response.status_code == 200:
-                self.parent.pickup_points_cache = response.json()
-        except Exception as e:
-            print(f"Ошибка загрузки пунктов выдачи: {e}")
+        def on_response(response):
+            if response.status_code != 200:
+                return
+
+            self.parent.pickup_points_cache = response.json()
+            if not self.winfo_exists():
+                return
+
+            pickup_addresses = [p["address"] for p in self.parent.pickup_points_cache]
+            self.pickup_combo.configure(values=pickup_addresses if pickup_addresses else ["Нет пунктов выдачи"])
+            if pickup_addresses and self.pickup_var.get() not in pickup_addresses:
+                if self.order and self.order.get("pickup_address") in pickup_addresses:
+                    self.pickup_var.set(self.order["pickup_address"])
+                else:
+                    self.pickup_var.set(pickup_addresses[0])
+
+        self.parent.tasks.submit(
+            request_pickup_points,
+            on_success=on_response,
+            on_error=lambda e: print(f"Ошибка загрузки пунктов выдачи: {e}"),
+        )
 
     def create_widgets(self):
         header = ctk.CTkFrame(self, fg_color=COLORS["secondary_bg"], height=60)
@@ -1593,7 +2230,7 @@ class OrderDialog(ctk.CTkToplevel):
         )
         cancel_btn.pack(side="left", padx=10)
 
-        save_btn = ctk.CTkButton(
+        self.save_btn = ctk.CTkButton(
             btn_frame,
             text="💾 Сохранить",
             width=150,
@@ -1604,7 +2241,7 @@ class OrderDialog(ctk.CTkToplevel):
             corner_radius=8,
             command=self.save,
         )
-        save_btn.pack(side="left", padx=10)
+        self.save_btn.pack(side="left", padx=10)
 
     def add_product_row(self):
         row_frame = ctk.CTkFrame(
@@ -1718,18 +2355,39 @@ class OrderDialog(ctk.CTkToplevel):
                 "products": products,
             }
 
-            headers = {"Authorization": f"Bearer {self.parent.access_token}", "Content-Type": "application/json"}
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Неверный формат данных:\n{str(e)}")
+            return
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить заказ:\n{str(e)}")
+            return
 
+        def request_save():
             if self.mode == "add":
-                response = requests.post(f"{API_BASE_URL}/api/orders", json=data, headers=headers, timeout=5)
-            else:
-                response = requests.put(
-                    f"{API_BASE_URL}/api/orders/{self.order['id']}", json=data, headers=headers, timeout=5
-                )
+                return self.parent.send_write("POST", "/api/orders", data, "order")
+            return self.parent.send_write(
+                "PUT", f"/api/orders/{self.order['id']}", data, "order", self.order["id"], self.order.get("version")
+            )
 
-            if response.status_code in [200, 201]:
+        def on_response(response):
+            if response is None:
+                if self.mode == "edit":
+                    fields = {key: value for key, value in data.items() if key != "products"}
+                    self.parent.upsert_order({**self.order, **fields, "pickup_address": pickup_address})
+                messagebox.showwarning("Нет связи", QUEUED_MESSAGE)
+                if self.winfo_exists():
+                    self.destroy()
+                return
+            if not self.winfo_exists():
+                return
+            self.save_btn.configure(state="normal")
+
+            if response.status_code == 409:
+                messagebox.showerror("Конфликт", CONFLICT_MESSAGE)
+                self.parent.refresh_orders()
+            elif response.status_code in [200, 201]:
                 messagebox.showinfo("Успех", "Заказ успешно сохранен")
-                self.parent.load_orders()
+                self.parent.upsert_order(response.json())
                 self.destroy()
             elif response.status_code == 400:
                 error_detail = response.json().get("detail", "Ошибка валидации")
@@ -1739,12 +2397,21 @@ class OrderDialog(ctk.CTkToplevel):
             else:
                 messagebox.showerror("Ошибка", f"Ошибка сохранения: {response.status_code}")
 
-        except ValueError as e:
-            messagebox.showerror("Ошибка", f"Неверный формат данных:\n{str(e)}")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить заказ:\n{str(e)}")
+        def on_error(error):
+            if self.winfo_exists():
+                self.save_btn.configure(state="normal")
+            messagebox.showerror("Ошибка", f"Не удалось сохранить заказ:\n{str(error)}")
 
+        self.save_btn.configure(state="disabled")
+        self.parent.tasks.submit(request_save, on_success=on_response, on_error=on_error)
 
-if __name__ == "__main__":
+
+def main(on_started=None):
     app = ShoeShopApp()
+    if on_started is not None:
+        app.after_idle(on_started, app)
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import json
+import threading
+from typing import Callable
+
+import requests
+
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+READ_TIMEOUT = 45
+
+
+class EventSubscriber:
+    def __init__(self, api, on_event: Callable[[dict], None], on_connected: Callable[[], None] | None = None):
+        self.api = api
+        self.on_event = on_event
+        self.on_connected = on_connected
+        self.stopped = threading.Event()
+        self.response: requests.Response | None = None
+        self.thread = threading.Thread(target=self._run, name="shoe-shop-events", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        response = self.response
+        if response is not None:
+            response.close()
+
+    def _run(self):
+        attempt = 0
+        while not self.stopped.is_set():
+            try:
+                self._listen()
+                attempt = 0
+            except (requests.RequestException, ValueError, AttributeError) as e:
+                if self.stopped.is_set():
+                    break
+                print(f"Поток событий прерван: {e}")
+
+            delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+            attempt += 1
+            self.stopped.wait(delay)
+
+    def _listen(self):
+        with self.api.get(
+            "/api/events", stream=True, timeout=(5, READ_TIMEOUT), headers={"Accept": "text/event-stream"}
+        ) as response:
+            response.raise_for_status()
+            self.response = response
+            if self.on_connected:
+                self.on_connected()
+
+            data = []
+            for line in response.iter_lines(decode_unicode=True):
+                if self.stopped.is_set():
+                    return
+                if line is None:
+                    continue
+                if not line:
+                    if data:
+                        self.on_event(json.loads("\n".join(data)))
+                        data = []
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+
+        self.response = None
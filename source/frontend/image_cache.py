@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import customtkinter as ctk
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_CACHE_DIR = Path(os.getenv("SHOE_SHOP_CACHE_DIR", Path.home() / ".cache" / "shoe_shop")) / "images"
+DEFAULT_MAX_ITEMS = 256
+DEFAULT_MAX_AGE = 3600
+
+
+class ImageCache:
+    def __init__(
+        self,
+        api,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_workers: int = 4,
+    ):
+        self.api = api
+        self.cache_dir = Path(cache_dir)
+        self.max_items = max_items
+        self.max_age = max_age
+        self.images: OrderedDict[tuple[str, tuple[int, int]], ctk.CTkImage] = OrderedDict()
+        self.pending: dict[tuple[str, tuple[int, int]], Future] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shoe-shop-images")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{name}.img", self.cache_dir / f"{name}.json"
+
+    def _read_meta(self, meta_path: Path) -> dict:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data_path: Path, meta_path: Path, content: bytes | None, meta: dict):
+        if content is not None:
+            tmp_path = data_path.with_suffix(".tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, data_path)
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    def fetch(self, url: str) -> bytes:
+        data_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        has_data = data_path.exists()
+
+        if has_data and time.time() - meta.get("fetched_at", 0) < self.max_age:
+            return data_path.read_bytes()
+
+        headers = {}
+        if has_data and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+
+        try:
+            response = self.api.get(url, headers=headers, timeout=5)
+        except Exception:
+            if has_data:
+                return data_path.read_bytes()
+            raise
+
+        if response.status_code == 304 and has_data:
+            meta["fetched_at"] = time.time()
+            self._write(data_path, meta_path, None, meta)
+            return data_path.read_bytes()
+
+        response.raise_for_status()
+        self._write(
+            data_path,
+            meta_path,
+            response.content,
+            {"url": url, "etag": response.headers.get("ETag"), "fetched_at": time.time()},
+        )
+        return response.content
+
+    def _load(self, url: str, size: tuple[int, int]) -> "Image.Image":
+        from PIL import Image
+
+        img = Image.open(BytesIO(self.fetch(url)))
+        return img.resize(size, Image.Resampling.LANCZOS)
+
+    def _submit(self, url: str, size: tuple[int, int]) -> Future:
+        key = (url, size)
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(self._load, url, size)
+                self.pending[key] = future
+                future.add_done_callback(lambda f: self._forget(key, f))
+            return future
+
+    def _forget(self, key, future: Future):
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+    def load(self, url: str, size: tuple[int, int]) -> "Image.Image":
+        return self._submit(url, size).result()
+
+    def prefetch(self, urls, size: tuple[int, int]):
+        for url in dict.fromkeys(urls):
+            if url and (url, size) not in self.images:
+                self._submit(url, size)
+
+    def cached(self, url: str, size: tuple[int, int]) -> ctk.CTkImage | None:
+        photo = self.images.get((url, size))
+        if photo is not None:
+            self.images.move_to_end((url, size))
+        return photo
+
+    def load_local(self, url: str, size: tuple[int, int], bundled: Path | None = None) -> "Image.Image | None":
+        from PIL import Image
+
+        for path in (bundled, self._paths(url)[0]):
+            if path is None or not path.exists():
+                continue
+            try:
+                with Image.open(path) as img:
+                    return img.resize(size, Image.Resampling.LANCZOS)
+            except OSError:
+                continue
+        return None
+
+    def store(self, url: str, size: tuple[int, int], img: "Image.Image") -> ctk.CTkImage:
+        photo = ctk.CTkImage(light_image=img, size=size)
+        self.images[(url, size)] = photo
+        self.images.move_to_end((url, size))
+        while len(self.images) > self.max_items:
+            self.images.popitem(last=False)
+        return photo
+
+    def invalidate(self, url: str):
+        for key in [key for key in self.images if key[0] == url]:
+            del self.images[key]
+        for path in self._paths(url):
+            path.unlink(missing_ok=True)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+from functools import partial
+
+STARTED_AT = time.perf_counter()
+PROFILE_STARTUP = "--profile-startup" in sys.argv or os.getenv("SHOE_SHOP_PROFILE_STARTUP") == "1"
+PROFILE_TOP_FUNCTIONS = 25
+
+
+def report_startup(app, profiler=None):
+    import io
+    import pstats
+
+    app.update_idletasks()
+    print(f"Окно входа показано через {(time.perf_counter() - STARTED_AT) * 1000:.0f} мс")
+    if profiler is not None:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        print(stream.getvalue())
+
+
+def main():
+    profiler = None
+    if PROFILE_STARTUP:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    import app
+
+    app.main(partial(report_startup, profiler=profiler) if PROFILE_STARTUP else None)
+
+
+if __name__ == "__main__":
+    main()
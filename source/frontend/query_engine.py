@@ -0,0 +1,100 @@
+from collections import defaultdict
+
+SEARCH_FIELDS = ("article", "name", "supplier", "manufacturer", "category", "description")
+NGRAM_SIZE = 3
+
+
+def ngrams(text: str) -> set[str]:
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def haystack(product: dict) -> str:
+    return "\n".join(str(product.get(field) or "") for field in SEARCH_FIELDS).lower()
+
+
+class ProductIndex:
+    def __init__(self, products: list[dict]):
+        self.products: list[dict | None] = []
+        self.haystacks: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.postings: dict[str, set[int]] = defaultdict(set)
+        self.suppliers: dict[str, set[int]] = defaultdict(set)
+
+        for product in products:
+            self.upsert(product)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def get(self, article: str) -> dict | None:
+        position = self.positions.get(article)
+        return None if position is None else self.products[position]
+
+    def upsert(self, product: dict) -> bool:
+        position = self.positions.get(product["article"])
+        if position is None:
+            position = len(self.products)
+            self.products.append(None)
+            self.haystacks.append("")
+            self.positions[product["article"]] = position
+        elif self.products[position] == product:
+            return False
+        else:
+            self._unindex(position)
+
+        self.products[position] = product
+        self.haystacks[position] = haystack(product)
+        for gram in ngrams(self.haystacks[position]):
+            self.postings[gram].add(position)
+        self.suppliers[product["supplier"]].add(position)
+        return True
+
+    def remove(self, article: str) -> bool:
+        position = self.positions.pop(article, None)
+        if position is None:
+            return False
+
+        self._unindex(position)
+        self.products[position] = None
+        self.haystacks[position] = ""
+        return True
+
+    def _unindex(self, position: int):
+        for gram in ngrams(self.haystacks[position]):
+            self.postings[gram].discard(position)
+        self.suppliers[self.products[position]["supplier"]].discard(position)
+
+    def _match_term(self, term: str, candidates: set[int] | None) -> set[int]:
+        if len(term) >= NGRAM_SIZE:
+            postings = sorted((self.postings.get(gram, set()) for gram in ngrams(term)), key=len)
+            found = set(postings[0])
+            for posting in postings[1:]:
+                found &= posting
+            if candidates is not None:
+                found &= candidates
+        else:
+            found = candidates if candidates is not None else self.positions.values()
+
+        return {position for position in found if term in self.haystacks[position]}
+
+    def query(self, search: str | None = None, supplier: str | None = None, sort: str | None = None) -> list[dict]:
+        candidates = None
+        if supplier:
+            candidates = set(self.suppliers.get(supplier, ()))
+
+        for term in (search or "").lower().split():
+            candidates = self._match_term(term, candidates)
+            if not candidates:
+                return []
+
+        products = [
+            self.products[position] for position in (self.positions.values() if candidates is None else candidates)
+        ]
+        if sort == "asc":
+            products.sort(key=lambda product: (product["quantity"], product["article"]))
+        elif sort == "desc":
+            products.sort(key=lambda product: (-product["quantity"], product["article"]))
+        else:
+            products.sort(key=lambda product: product["article"])
+
+        return products
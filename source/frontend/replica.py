@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_REPLICA_DIR = Path(os.getenv("SHOE_SHOP_CACHE_DIR", Path.home() / ".cache" / "shoe_shop"))
+
+ENTITIES = {
+    "product": ("products", "article"),
+    "order": ("orders", "id"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (article TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS orders (id INTEGER PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sync_tokens (entity TEXT PRIMARY KEY, token INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    body TEXT,
+    entity TEXT NOT NULL,
+    entity_id TEXT,
+    base_version INTEGER,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT
+);
+"""
+
+
+REPLICA_SUFFIXES = ("", "-wal", "-shm", "-journal")
+
+
+def replica_path(base_url: str, login: str, role: str, directory: Path = DEFAULT_REPLICA_DIR) -> Path:
+    name = hashlib.sha256(f"{base_url}\n{login}\n{role}".encode("utf-8")).hexdigest()[:16]
+    return Path(directory) / f"replica-{name}.sqlite3"
+
+
+def legacy_replica_path(base_url: str, directory: Path = DEFAULT_REPLICA_DIR) -> Path:
+    name = hashlib.sha1(base_url.encode("utf-8")).hexdigest()[:12]
+    return Path(directory) / f"replica-{name}.sqlite3"
+
+
+def remove_replica(path: Path):
+    for suffix in REPLICA_SUFFIXES:
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+class Replica:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.lock = threading.Lock()
+
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+
+    def token(self, entity: str) -> int:
+        with self.lock:
+            row = self.connection.execute("SELECT token FROM sync_tokens WHERE entity = ?", (entity,)).fetchone()
+        return row[0] if row else 0
+
+    def items(self, entity: str) -> list[dict]:
+        table, key = ENTITIES[entity]
+        with self.lock:
+            rows = self.connection.execute(f"SELECT data FROM {table} ORDER BY {key}").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def apply_changes(self, entity: str, token: int, items: list[dict], deleted: list, snapshot: bool = False):
+        table, key = ENTITIES[entity]
+        with self.lock, self.connection:
+            if snapshot:
+                self.connection.execute(f"DELETE FROM {table}")
+            if deleted:
+                self.connection.executemany(f"DELETE FROM {table} WHERE {key} = ?", [(item_id,) for item_id in deleted])
+            if items:
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({key}, version, data) VALUES (?, ?, ?)",
+                    [(item[key], item.get("version", 0), json.dumps(item, ensure_ascii=False)) for item in items],
+                )
+            self.connection.execute("INSERT OR REPLACE INTO sync_tokens (entity, token) VALUES (?, ?)", (entity, token))
+
+    def put(self, entity: str, item: dict):
+        table, key = ENTITIES[entity]
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {table} ({key}, version, data) VALUES (?, ?, ?)",
+                (item[key], item.get("version", 0), json.dumps(item, ensure_ascii=False)),
+            )
+
+    def delete(self, entity: str, item_id):
+        table, key = ENTITIES[entity]
+        with self.lock, self.connection:
+            self.connection.execute(f"DELETE FROM {table} WHERE {key} = ?", (item_id,))
+
+    def enqueue(
+        self,
+        login: str,
+        method: str,
+        path: str,
+        body: dict | None,
+        entity: str,
+        entity_id=None,
+        base_version: int | None = None,
+    ) -> int:
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO outbox (login, method, path, body, entity, entity_id, base_version, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    login,
+                    method,
+                    path,
+                    None if body is None else json.dumps(body, ensure_ascii=False),
+                    entity,
+                    None if entity_id is None else str(entity_id),
+                    base_version,
+                    time.time(),
+                ),
+            )
+        return cursor.lastrowid
+
+    def pending(self, login: str) -> list[dict]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, method, path, body, entity, entity_id, base_version FROM outbox "
+                "WHERE login = ? AND status = 'pending' ORDER BY id",
+                (login,),
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "method": row[1],
+                "path": row[2],
+                "body": None if row[3] is None else json.loads(row[3]),
+                "entity": row[4],
+                "entity_id": row[5],
+                "base_version": row[6],
+            }
+            for row in rows
+        ]
+
+    def finish(self, entry_id: int, status: str = "sent", error: str | None = None):
+        with self.lock, self.connection:
+            self.connection.execute("UPDATE outbox SET status = ?, error = ? WHERE id = ?", (status, error, entry_id))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def purge(self):
+        self.close()
+        remove_replica(self.path)
@@ -0,0 +1,109 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+POLL_INTERVAL_MS = 20
+
+
+class TaskRunner:
+    def __init__(self, root, max_workers: int = 4):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shoe-shop-worker")
+        self.results: queue.Queue = queue.Queue()
+        self.callbacks: queue.Queue = queue.Queue()
+        self.generations: dict[str, int] = {}
+        self.futures: dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+        self.root.after(POLL_INTERVAL_MS, self._drain)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        on_success: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        key: str | None = None,
+        **kwargs,
+    ) -> Future:
+        generation = None
+        if key is not None:
+            with self.lock:
+                generation = self.generations.get(key, 0) + 1
+                self.generations[key] = generation
+                previous = self.futures.get(key)
+                if previous is not None:
+                    previous.cancel()
+
+        future = self.executor.submit(fn, *args, **kwargs)
+        if key is not None:
+            with self.lock:
+                self.futures[key] = future
+
+        future.add_done_callback(lambda f: self.results.put((f, key, generation, on_success, on_error)))
+        return future
+
+    def call_soon(self, fn: Callable[..., Any], *args):
+        self.callbacks.put((fn, args))
+
+    def cancel(self, key: str):
+        with self.lock:
+            self.generations[key] = self.generations.get(key, 0) + 1
+            future = self.futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_current(self, key: str | None, generation: int | None) -> bool:
+        if key is None:
+            return True
+        with self.lock:
+            return self.generations.get(key) == generation
+
+    def _drain(self):
+        if self.closed:
+            return
+
+        while True:
+            try:
+                future, key, generation, on_success, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if future.cancelled() or not self.is_current(key, generation):
+                continue
+
+            if key is not None:
+                with self.lock:
+                    if self.futures.get(key) is future:
+                        del self.futures[key]
+
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Ошибка фоновой задачи: {error}")
+                elif on_success:
+                    on_success(future.result())
+            except Exception as e:
+                print(f"Ошибка обработки результата задачи: {e}")
+
+        while True:
+            try:
+                fn, args = self.callbacks.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Ошибка обработки события: {e}")
+
+        self.root.after(POLL_INTERVAL_MS, self._drain)
+
+    def shutdown(self):
+        self.closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
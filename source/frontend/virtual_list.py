@@ -0,0 +1,147 @@
+import sys
+import tkinter as tk
+from typing import Any, Callable
+
+import customtkinter as ctk
+
+DEFAULT_BUFFER_ROWS = 2
+SCROLL_STEP = 40
+
+
+class VirtualList(ctk.CTkFrame):
+    def __init__(
+        self,
+        master,
+        row_height: int,
+        create_row: Callable[[tk.Misc], Any],
+        bg: str = "#FFFFFF",
+        message_color: str = "#666666",
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        on_near_end: Callable[[], None] | None = None,
+        **kwargs,
+    ):
+        super().__init__(master, fg_color=bg, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.buffer_rows = buffer_rows
+        self.on_near_end = on_near_end
+
+        self.items: list = []
+        self.total = 0
+        self.slots: list[list] = []
+        self.refresh_pending = False
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, bd=0, yscrollincrement=SCROLL_STEP)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.message = ctk.CTkLabel(self.canvas, text="", font=("Times New Roman", 16), text_color=message_color)
+
+        self.canvas.bind("<Configure>", lambda e: self._on_resize(e.width))
+        self._bind_wheel(self.canvas)
+
+    def set_items(self, items: list, total: int | None = None, reset_view: bool = True):
+        self.items = list(items)
+        self.total = max(total or 0, len(self.items))
+        self.message.place_forget()
+
+        self._update_scrollregion()
+        if reset_view:
+            self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def append_items(self, items: list, total: int | None = None):
+        self.items.extend(items)
+        self.total = max(total or 0, len(self.items))
+        self._update_scrollregion()
+        self.refresh()
+
+    def show_message(self, text: str, color: str | None = None):
+        self.items = []
+        self.total = 0
+        self._update_scrollregion()
+        self.refresh()
+
+        if color:
+            self.message.configure(text=text, text_color=color)
+        else:
+            self.message.configure(text=text)
+        self.message.place(relx=0.5, y=50, anchor="n")
+
+    def refresh(self):
+        self.refresh_pending = False
+        if not self.winfo_exists():
+            return
+
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height) - self.buffer_rows)
+        last = min(len(self.items), int((top + height) // self.row_height) + 1 + self.buffer_rows)
+
+        needed = last - first
+        while len(self.slots) < needed:
+            row = self.create_row(self.canvas)
+            window = self.canvas.create_window(
+                0, -self.row_height, window=row, anchor="nw", width=self.canvas.winfo_width(), height=self.row_height
+            )
+            self._bind_wheel(row)
+            self.slots.append([row, window, None])
+
+        assigned = set()
+        for index in range(first, last):
+            slot = self.slots[index % len(self.slots)]
+            row, window, bound = slot
+            item = self.items[index]
+            if bound is not item and bound != item:
+                row.update_item(item)
+            slot[2] = item
+            self.canvas.coords(window, 0, index * self.row_height)
+            assigned.add(window)
+
+        for slot in self.slots:
+            if slot[1] not in assigned:
+                self.canvas.coords(slot[1], 0, -self.row_height * 2)
+                slot[2] = None
+
+        if self.on_near_end and len(self.items) < self.total and last >= len(self.items) - self.buffer_rows:
+            self.on_near_end()
+
+    def _schedule_refresh(self):
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.after_idle(self.refresh)
+
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), len(self.items) * self.row_height))
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_refresh()
+
+    def _on_resize(self, width: int):
+        for _, window, _ in self.slots:
+            self.canvas.itemconfigure(window, width=width)
+        self._update_scrollregion()
+        self._schedule_refresh()
+
+    def _on_wheel(self, event):
+        if not self.items:
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -int(event.delta / 120)
+        self.canvas.yview_scroll(steps, "units")
+
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tk.Misc.bind(widget, sequence, self._on_wheel, "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
@@ -0,0 +1,147 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from src.db.database import SessionLocal
+from src.db.models.models import Product as ProductModel
+from src.db.sync import current_version
+from src.schemas.product import Product, ProductWithFinalPrice
+from src.utils.events import broker
+from src.utils.images import get_image_path
+
+CATALOG_SNAPSHOT = os.getenv("CATALOG_SNAPSHOT", "1") != "0"
+CATALOG_REBUILD_DELAY = float(os.getenv("CATALOG_REBUILD_DELAY", "0.5"))
+CATALOG_CACHED_PAGES = 64
+GZIP_LEVEL = 6
+CATALOG_ENTITIES = {"product", "*"}
+
+product_adapter = TypeAdapter(ProductWithFinalPrice)
+
+
+def with_final_price(product: ProductModel) -> dict:
+    return {
+        **Product.model_validate(product).model_dump(),
+        "final_price": product.final_price,
+        "out_of_stock": product.quantity == 0,
+        "photo": get_image_path(product.photo),
+    }
+
+
+def accepts_gzip(header: str | None) -> bool:
+    for part in (header or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class CatalogSnapshot:
+    def __init__(self, token: int, items: list[bytes]):
+        self.token = token
+        self.items = items
+        self.count = len(items)
+        self.pages: OrderedDict[tuple, tuple[bytes, bytes, str]] = OrderedDict()
+        self.lock = threading.Lock()
+        body = self.render(0, None)
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.pages[(0, None)] = (body, gzip.compress(body, GZIP_LEVEL, mtime=0), f'"{self.digest}"')
+
+    def render(self, offset: int, limit: int | None) -> bytes:
+        end = None if limit is None else offset + limit
+        return b"[" + b",".join(self.items[offset:end]) + b"]"
+
+    def page(self, offset: int, limit: int | None) -> tuple[bytes, bytes, str]:
+        key = (offset, limit)
+        with self.lock:
+            cached = self.pages.get(key)
+            if cached is not None:
+                self.pages.move_to_end(key)
+                return cached
+
+        body = self.render(offset, limit)
+        cached = (body, gzip.compress(body, GZIP_LEVEL, mtime=0), f'"{self.digest}-{offset}-{limit or 0}"')
+        with self.lock:
+            self.pages[key] = cached
+            while len(self.pages) > CATALOG_CACHED_PAGES:
+                self.pages.popitem(last=False)
+        return cached
+
+    def response(self, request: Request, offset: int, limit: int | None) -> Response:
+        body, compressed, etag = self.page(offset, limit)
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "X-Total-Count": str(self.count),
+            "X-Sync-Token": str(self.token),
+        }
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        if accepts_gzip(request.headers.get("accept-encoding")):
+            headers["Content-Encoding"] = "gzip"
+            body = compressed
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_snapshot() -> CatalogSnapshot:
+    db = SessionLocal()
+    try:
+        token = current_version(db)
+        products = db.query(ProductModel).order_by(ProductModel.article).all()
+        items = [product_adapter.dump_json(product_adapter.validate_python(with_final_price(p))) for p in products]
+        return CatalogSnapshot(token, items)
+    finally:
+        db.close()
+
+
+class CatalogCache:
+    def __init__(self, enabled: bool = CATALOG_SNAPSHOT, delay: float = CATALOG_REBUILD_DELAY):
+        self.enabled = enabled
+        self.delay = delay
+        self.snapshot: CatalogSnapshot | None = None
+        self.task: asyncio.Task | None = None
+
+    def current(self) -> CatalogSnapshot | None:
+        return self.snapshot if self.enabled else None
+
+    async def start(self):
+        if self.enabled:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.snapshot = None
+
+    async def rebuild(self):
+        try:
+            self.snapshot = await asyncio.to_thread(build_snapshot)
+        except Exception as e:
+            self.snapshot = None
+            print(f"Не удалось собрать снимок каталога: {e}")
+
+    async def run(self):
+        async with broker.subscribe() as queue:
+            await self.rebuild()
+            while True:
+                event = await queue.get()
+                if event.get("entity") not in CATALOG_ENTITIES:
+                    continue
+                await asyncio.sleep(self.delay)
+                while not queue.empty():
+                    queue.get_nowait()
+                await self.rebuild()
+
+
+catalog = CatalogCache()
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Query as OrmQuery
+
+from src.db.models.models import Category, Manufacturer, Product
+
+SORT_COLUMNS = {
+    "article": Product.article,
+    "name": Product.name,
+    "price": Product.price,
+    "final_price": Product.final_price,
+    "discount": Product.discount,
+    "quantity": Product.quantity,
+    "updated_at": Product.updated_at,
+}
+MAX_SORT_FIELDS = 3
+
+
+@dataclass
+class ProductFilter:
+    min_price: Decimal | None = Query(None, ge=0)
+    max_price: Decimal | None = Query(None, ge=0)
+    min_final_price: Decimal | None = Query(None, ge=0)
+    max_final_price: Decimal | None = Query(None, ge=0)
+    min_discount: int | None = Query(None, ge=0, le=100)
+    max_discount: int | None = Query(None, ge=0, le=100)
+    min_quantity: int | None = Query(None, ge=0)
+    max_quantity: int | None = Query(None, ge=0)
+    category: list[str] | None = Query(None)
+    manufacturer: list[str] | None = Query(None)
+    in_stock: bool = False
+    sort: str | None = Query(None, description="Поля через запятую, минус для убывания: -final_price,quantity")
+
+    def ranges(self) -> list[tuple]:
+        return [
+            (Product.price, self.min_price, self.max_price),
+            (Product.final_price, self.min_final_price, self.max_final_price),
+            (Product.discount, self.min_discount, self.max_discount),
+            (Product.quantity, self.min_quantity, self.max_quantity),
+        ]
+
+
+def parse_sort(sort: str | None) -> list:
+    if not sort:
+        return []
+
+    fields = [field.strip() for field in sort.split(",") if field.strip()]
+    if len(fields) > MAX_SORT_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Можно указать не более {MAX_SORT_FIELDS} полей сортировки"
+        )
+
+    ordering = []
+    for field in fields:
+        name = field.lstrip("+-")
+        column = SORT_COLUMNS.get(name)
+        if column is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Недопустимое поле сортировки: {name}")
+        ordering.append(column.desc() if field.startswith("-") else column.asc())
+    return ordering
+
+
+def lookup_in(column, model, names: list[str]):
+    return column.in_(select(model.id).where(model.name.in_(names)))
+
+
+def apply_product_filter(query: OrmQuery, spec: ProductFilter) -> OrmQuery:
+    for column, low, high in spec.ranges():
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+
+    if spec.category:
+        query = query.filter(lookup_in(Product.category_id, Category, spec.category))
+    if spec.manufacturer:
+        query = query.filter(lookup_in(Product.manufacturer_id, Manufacturer, spec.manufacturer))
+    if spec.in_stock:
+        query = query.filter(Product.quantity > 0)
+    return query
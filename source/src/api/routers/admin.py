@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.api.utils import require_admin
+from src.db.models.models import User
+from src.db.slow_queries import slow_query_log
+from src.utils.profiler import MAX_PROFILE_SECONDS, profile_for, profile_lock, profile_store
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int | None = Query(None, ge=1),
+    current_user: User = Depends(require_admin),
+):
+    return {"threshold_ms": slow_query_log.threshold_ms, "entries": slow_query_log.snapshot(limit)}
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: User = Depends(require_admin)):
+    slow_query_log.clear()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def run_profiler(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    include_idle: bool = False,
+    current_user: User = Depends(require_admin),
+):
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Профилирование уже выполняется")
+
+    try:
+        collapsed = await asyncio.to_thread(profile_for, seconds, interval_ms / 1000, include_idle)
+    finally:
+        profile_lock.release()
+
+    return PlainTextResponse(collapsed, headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'})
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str, current_user: User = Depends(require_admin)):
+    collapsed = profile_store.get(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    return PlainTextResponse(collapsed)
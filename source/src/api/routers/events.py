@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from src.api.utils import oauth2_scheme, user_from_token
+from src.db.database import SessionLocal
+from src.utils.events import broker
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+STAFF_ENTITIES = {"order"}
+
+
+def format_event(event: dict) -> str:
+    lines = []
+    if event.get("version") is not None:
+        lines.append(f"id: {event['version']}")
+    lines.append("event: change")
+    lines.append(f"data: {json.dumps(event, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(request: Request, is_staff: bool):
+    yield f"retry: {RETRY_MS}\n\n"
+
+    async with broker.subscribe() as queue:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            if event.get("entity") in STAFF_ENTITIES and not is_staff:
+                continue
+            yield format_event(event)
+
+
+def resolve_is_staff(token: str | None = Depends(oauth2_scheme)) -> bool:
+    db = SessionLocal()
+    try:
+        current_user = user_from_token(token, db)
+        return current_user is not None and current_user.role in ["Менеджер", "Администратор"]
+    finally:
+        db.close()
+
+
+@router.get("")
+async def subscribe_events(request: Request, is_staff: bool = Depends(resolve_is_staff)):
+    return StreamingResponse(
+        event_stream(request, is_staff),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,43 @@
+import importlib.util
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.utils import require_manager_or_admin
+from src.db.database import SessionLocal
+from src.db.models.models import User
+from src.utils.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, MAX_EXPORT_CHUNK_SIZE, export_stream
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+def stream_with_session(entity: str, fmt: str, chunk_size: int):
+    db = SessionLocal()
+    try:
+        yield from export_stream(db, entity, fmt, chunk_size)
+    finally:
+        db.close()
+
+
+@router.get("/{entity}")
+async def export_data(
+    entity: str,
+    format: str = "csv",
+    chunk_size: int = Query(EXPORT_CHUNK_SIZE, ge=1, le=MAX_EXPORT_CHUNK_SIZE),
+    current_user: User = Depends(require_manager_or_admin),
+):
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Неизвестный набор данных для выгрузки")
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Неподдерживаемый формат: {format}")
+
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=400, detail="Выгрузка в Parquet недоступна: не установлен pyarrow")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_with_session(entity, format, chunk_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{extension}"'},
+    )
@@ -1,16 +1,18 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 
-from src.api.utils import require_admin, require_manager_or_admin
+from src.api.utils import MAX_PAGE_SIZE, check_version, paginate, require_admin, require_manager_or_admin
 from src.db.database import get_db
 from src.db.models.models import Order as OrderModel
 from src.db.models.models import PickupPoint
 from src.db.models.models import Product as ProductModel
 from src.db.models.models import User, order_product
-from src.schemas.order import Order, OrderCreate, OrderUpdate
+from src.db.sync import changes_since, current_version, record_deletion, touch
+from src.schemas.order import Order, OrderChanges, OrderCreate, OrderUpdate
 from src.schemas.order import PickupPoint as PickupPointSchema
+from src.utils.events import publish_change
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
@@ -19,6 +21,29 @@ def generate_order_number(order_date: date, count: int) -> str:
     return f"{order_date.strftime('%d%m%y')}-{count}"
 
 
+def check_products_exist(db: Session, products):
+    articles = {product_item.product_id for product_item in products}
+    found = {article for (article,) in db.query(ProductModel.article).filter(ProductModel.article.in_(articles))}
+    for product_item in products:
+        if product_item.product_id not in found:
+            raise HTTPException(status_code=404, detail=f"Товар {product_item.product_id} не найден")
+
+
+def insert_order_products(db: Session, order_id: int, products):
+    quantities = {}
+    for product_item in products:
+        quantities[product_item.product_id] = quantities.get(product_item.product_id, 0) + product_item.quantity
+
+    if quantities:
+        db.execute(
+            order_product.insert(),
+            [
+                {"order_id": order_id, "product_id": product_id, "quantity": quantity}
+                for product_id, quantity in quantities.items()
+            ],
+        )
+
+
 @router.get("/pickup-points", response_model=list[PickupPointSchema])
 async def get_pickup_points(current_user: User = Depends(require_manager_or_admin), db: Session = Depends(get_db)):
     points = db.query(PickupPoint).all()
@@ -26,8 +51,16 @@ async def get_pickup_points(current_user: User = Depends(require_manager_or_admi
 
 
 @router.get("", response_model=list[Order])
-async def get_orders(current_user: User = Depends(require_manager_or_admin), db: Session = Depends(get_db)):
-    orders = db.query(OrderModel).all()
+async def get_orders(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(require_manager_or_admin),
+    db: Session = Depends(get_db),
+):
+    response.headers["X-Sync-Token"] = str(current_version(db))
+    query = db.query(OrderModel).options(joinedload(OrderModel.pickup_point)).order_by(OrderModel.id)
+    orders = paginate(query, response, limit, offset).all()
 
     result = []
     for order in orders:
@@ -39,11 +72,31 @@ async def get_orders(current_user: User = Depends(require_manager_or_admin), db:
     return result
 
 
+@router.get("/changes", response_model=OrderChanges)
+async def get_order_changes(
+    since: int = Query(0, ge=0),
+    current_user: User = Depends(require_manager_or_admin),
+    db: Session = Depends(get_db),
+):
+    token, orders, deleted, snapshot = changes_since(
+        db, OrderModel, OrderModel.id, "order", since, options=[joinedload(OrderModel.pickup_point)]
+    )
+
+    items = []
+    for order in orders:
+        order_dict = Order.model_validate(order).model_dump()
+        if order.pickup_point:
+            order_dict["pickup_address"] = order.pickup_point.address
+        items.append(order_dict)
+
+    return {"token": token, "items": items, "deleted": [int(order_id) for order_id in deleted], "snapshot": snapshot}
+
+
 @router.get("/{order_id}", response_model=Order)
 async def get_order(
     order_id: int, current_user: User = Depends(require_manager_or_admin), db: Session = Depends(get_db)
 ):
-    order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    order = db.query(OrderModel).options(joinedload(OrderModel.pickup_point)).filter(OrderModel.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Заказ не найден")
 
@@ -60,10 +113,7 @@ async def create_order(order: OrderCreate, current_user: User = Depends(require_
     if not pickup_point:
         raise HTTPException(status_code=404, detail="Пункт выдачи не найден")
 
-    for product_item in order.products:
-        product = db.query(ProductModel).filter(ProductModel.article == product_item.product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Товар {product_item.product_id} не найден")
+    check_products_exist(db, order.products)
 
     orders_count = db.query(OrderModel).filter(OrderModel.order_date == order.order_date).count()
     order_number = generate_order_number(order.order_date, orders_count + 1)
@@ -79,16 +129,14 @@ async def create_order(order: OrderCreate, current_user: User = Depends(require_
     )
 
     db.add(db_order)
+    version = touch(db, db_order)
     db.flush()
 
-    for product_item in order.products:
-        stmt = order_product.insert().values(
-            order_id=db_order.id, product_id=product_item.product_id, quantity=product_item.quantity
-        )
-        db.execute(stmt)
+    insert_order_products(db, db_order.id, order.products)
 
     db.commit()
     db.refresh(db_order)
+    publish_change("order", "upsert", db_order.id, version)
 
     order_dict = Order.model_validate(db_order).model_dump()
     order_dict["pickup_address"] = pickup_point.address
@@ -98,11 +146,16 @@ async def create_order(order: OrderCreate, current_user: User = Depends(require_
 
 @router.put("/{order_id}", response_model=Order)
 async def update_order(
-    order_id: int, order_update: OrderUpdate, current_user: User = Depends(require_admin), db: Session = Depends(get_db)
+    order_id: int,
+    order_update: OrderUpdate,
+    if_match: str | None = Header(None),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
 ):
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).with_for_update().first()
     if not db_order:
         raise HTTPException(status_code=404, detail="Заказ не найден")
+    check_version(db_order.version, if_match)
 
     update_data = order_update.model_dump(exclude_unset=True, exclude={"products"})
 
@@ -110,20 +163,14 @@ async def update_order(
         setattr(db_order, field, value)
 
     if order_update.products is not None:
+        check_products_exist(db, order_update.products)
         db.execute(order_product.delete().where(order_product.c.order_id == order_id))
+        insert_order_products(db, order_id, order_update.products)
 
-        for product_item in order_update.products:
-            product = db.query(ProductModel).filter(ProductModel.article == product_item.product_id).first()
-            if not product:
-                raise HTTPException(status_code=404, detail=f"Товар {product_item.product_id} не найден")
-
-            stmt = order_product.insert().values(
-                order_id=order_id, product_id=product_item.product_id, quantity=product_item.quantity
-            )
-            db.execute(stmt)
-
+    version = touch(db, db_order)
     db.commit()
     db.refresh(db_order)
+    publish_change("order", "upsert", order_id, version)
 
     order_dict = Order.model_validate(db_order).model_dump()
     if db_order.pickup_point:
@@ -133,14 +180,22 @@ async def update_order(
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_order(order_id: int, current_user: User = Depends(require_admin), db: Session = Depends(get_db)):
-    order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+async def delete_order(
+    order_id: int,
+    if_match: str | None = Header(None),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    order = db.query(OrderModel).filter(OrderModel.id == order_id).with_for_update().first()
     if not order:
         raise HTTPException(status_code=404, detail="Заказ не найден")
+    check_version(order.version, if_match)
 
     db.execute(order_product.delete().where(order_product.c.order_id == order_id))
 
     db.delete(order)
+    version = record_deletion(db, "order", order_id)
     db.commit()
+    publish_change("order", "delete", order_id, version)
 
     return None
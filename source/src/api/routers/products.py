@@ -1,42 +1,50 @@
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from sqlalchemy import and_, or_  # <--- Добавлен импорт and_
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, Response, UploadFile, status
+from sqlalchemy import and_, or_, select  # <--- Добавлен импорт and_
 from sqlalchemy.orm import Session
 
-from src.api.utils import get_current_user, require_admin
+from src.api.catalog import catalog, with_final_price
+from src.api.filters import ProductFilter, apply_product_filter, parse_sort
+from src.api.utils import MAX_PAGE_SIZE, check_version, get_current_user, paginate, require_admin
 from src.db.database import get_db
+from src.db.lookups import resolve_lookups
+from src.db.models.models import Category, Manufacturer
 from src.db.models.models import Product as ProductModel
-from src.db.models.models import User
-from src.schemas.product import Product, ProductCreate, ProductUpdate, ProductWithFinalPrice
+from src.db.models.models import Supplier, User
+from src.db.sync import changes_since, current_version, record_deletion, touch
+from src.schemas.product import Product, ProductChanges, ProductCreate, ProductUpdate, ProductWithFinalPrice
+from src.utils.events import publish_change
 from src.utils.images import delete_product_image, get_image_path, save_product_image
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
 
-def calculate_final_price(product: ProductModel) -> dict:
-    final_price = product.price
-    if product.discount > 0:
-        final_price = product.price * (1 - product.discount / 100)
-
-    return {
-        **Product.model_validate(product).model_dump(),
-        "final_price": round(final_price, 2),
-        "out_of_stock": product.quantity == 0,
-        "photo": get_image_path(product.photo),
-    }
+def lookup_matches(column, model, term: str):
+    return column.in_(select(model.id).where(model.name.ilike(f"%{term}%")))
 
 
 @router.get("", response_model=list[ProductWithFinalPrice])
 async def get_products(
+    request: Request,
+    response: Response,
     search: str | None = None,
     supplier: str | None = None,
     sort_by_quantity: str | None = None,  # 'asc' или 'desc'
+    filters: ProductFilter = Depends(),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     current_user: User | None = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    query = db.query(ProductModel)
-
     can_filter = current_user and current_user.role in ["Менеджер", "Администратор"]
 
+    snapshot = None if can_filter else catalog.current()
+    if snapshot is not None:
+        return snapshot.response(request, offset, limit)
+
+    response.headers["X-Sync-Token"] = str(current_version(db))
+    query = db.query(ProductModel)
+    ordering = []
+
     if can_filter:
         if search:
             # Разбиваем поисковый запрос на отдельные слова
@@ -50,9 +58,9 @@ async def get_products(
                 term_filter = or_(
                     ProductModel.article.ilike(f"%{term}%"),
                     ProductModel.name.ilike(f"%{term}%"),
-                    ProductModel.supplier.ilike(f"%{term}%"),
-                    ProductModel.manufacturer.ilike(f"%{term}%"),
-                    ProductModel.category.ilike(f"%{term}%"),
+                    lookup_matches(ProductModel.supplier_id, Supplier, term),
+                    lookup_matches(ProductModel.manufacturer_id, Manufacturer, term),
+                    lookup_matches(ProductModel.category_id, Category, term),
                     ProductModel.description.ilike(f"%{term}%"),
                 )
                 and_conditions.append(term_filter)
@@ -62,23 +70,43 @@ async def get_products(
                 query = query.filter(and_(*and_conditions))
 
         if supplier and supplier != "Все поставщики":
-            query = query.filter(ProductModel.supplier == supplier)
+            supplier_id = select(Supplier.id).where(Supplier.name == supplier).scalar_subquery()
+            query = query.filter(ProductModel.supplier_id == supplier_id)
+
+        query = apply_product_filter(query, filters)
+        ordering = parse_sort(filters.sort)
 
-        if sort_by_quantity == "asc":
-            query = query.order_by(ProductModel.quantity.asc())
-        elif sort_by_quantity == "desc":
-            query = query.order_by(ProductModel.quantity.desc())
+        if not ordering and sort_by_quantity == "asc":
+            ordering = [ProductModel.quantity.asc()]
+        elif not ordering and sort_by_quantity == "desc":
+            ordering = [ProductModel.quantity.desc()]
 
+    query = paginate(query.order_by(*ordering, ProductModel.article), response, limit, offset)
     products = query.all()
-    return [calculate_final_price(p) for p in products]
+    return [with_final_price(p) for p in products]
 
 
 @router.get("/suppliers")
 async def get_suppliers(current_user: User = Depends(require_admin), db: Session = Depends(get_db)):
-    suppliers = db.query(ProductModel.supplier).distinct().all()
+    suppliers = db.query(Supplier.name).filter(Supplier.products.any()).order_by(Supplier.name).all()
     return ["Все поставщики"] + [s[0] for s in suppliers]
 
 
+@router.get("/changes", response_model=ProductChanges)
+async def get_product_changes(
+    since: int = Query(0, ge=0),
+    current_user: User | None = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    token, products, deleted, snapshot = changes_since(db, ProductModel, ProductModel.article, "product", since)
+    return {
+        "token": token,
+        "items": [with_final_price(p) for p in products],
+        "deleted": deleted,
+        "snapshot": snapshot,
+    }
+
+
 @router.get("/{article}", response_model=ProductWithFinalPrice)
 async def get_product(
     article: str, current_user: User | None = Depends(get_current_user), db: Session = Depends(get_db)
@@ -87,7 +115,7 @@ async def get_product(
     if not product:
         raise HTTPException(status_code=404, detail="Товар не найден")
 
-    return calculate_final_price(product)
+    return with_final_price(product)
 
 
 @router.post("", response_model=Product, status_code=status.HTTP_201_CREATED)
@@ -98,10 +126,12 @@ async def create_product(
     if existing:
         raise HTTPException(status_code=400, detail="Товар с таким артикулом уже существует")
 
-    db_product = ProductModel(**product.model_dump())
+    db_product = ProductModel(**resolve_lookups(db, product.model_dump()))
     db.add(db_product)
+    version = touch(db, db_product)
     db.commit()
     db.refresh(db_product)
+    publish_change("product", "upsert", db_product.article, version)
 
     return db_product
 
@@ -110,19 +140,23 @@ async def create_product(
 async def update_product(
     article: str,
     product_update: ProductUpdate,
+    if_match: str | None = Header(None),
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    db_product = db.query(ProductModel).filter(ProductModel.article == article).first()
+    db_product = db.query(ProductModel).filter(ProductModel.article == article).with_for_update().first()
     if not db_product:
         raise HTTPException(status_code=404, detail="Товар не найден")
+    check_version(db_product.version, if_match)
 
-    update_data = product_update.model_dump(exclude_unset=True)
+    update_data = resolve_lookups(db, product_update.model_dump(exclude_unset=True))
     for field, value in update_data.items():
         setattr(db_product, field, value)
 
+    version = touch(db, db_product)
     db.commit()
     db.refresh(db_product)
+    publish_change("product", "upsert", article, version)
 
     return db_product
 
@@ -144,18 +178,26 @@ async def upload_product_image(
     filename = await save_product_image(file, article)
     product.photo = filename
 
+    version = touch(db, product)
     db.commit()
+    publish_change("product", "upsert", article, version)
 
     return {"filename": filename, "path": get_image_path(filename)}
 
 
 @router.delete("/{article}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_product(article: str, current_user: User = Depends(require_admin), db: Session = Depends(get_db)):
+async def delete_product(
+    article: str,
+    if_match: str | None = Header(None),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
     from src.db.models.models import order_product
 
-    product = db.query(ProductModel).filter(ProductModel.article == article).first()
+    product = db.query(ProductModel).filter(ProductModel.article == article).with_for_update().first()
     if not product:
         raise HTTPException(status_code=404, detail="Товар не найден")
+    check_version(product.version, if_match)
 
     has_orders = db.query(order_product).filter(order_product.c.product_id == article).first()
     if has_orders:
@@ -165,6 +207,8 @@ async def delete_product(article: str, current_user: User = Depends(require_admi
         delete_product_image(product.photo)
 
     db.delete(product)
+    version = record_deletion(db, "product", article)
     db.commit()
+    publish_change("product", "delete", article, version)
 
     return None
@@ -1,6 +1,6 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from src.db.database import get_db
 from src.db.models.models import User
@@ -8,8 +8,30 @@ from src.utils.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
 
+MAX_PAGE_SIZE = 500
 
-async def get_current_user(token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User | None:
+
+def paginate(query: Query, response: Response, limit: int | None, offset: int) -> Query:
+    response.headers["X-Total-Count"] = str(query.order_by(None).count())
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+    return query
+
+
+def check_version(current: int, if_match: str | None):
+    if if_match is None:
+        return
+
+    expected = if_match.strip().removeprefix("W/").strip('"')
+    if expected != "*" and expected != str(current):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Запись была изменена другим пользователем, обновите данные"
+        )
+
+
+def user_from_token(token: str | None, db: Session) -> User | None:
     if not token:
         return None
 
@@ -32,6 +54,10 @@ async def get_current_user(token: str | None = Depends(oauth2_scheme), db: Sessi
     return user
 
 
+async def get_current_user(token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User | None:
+    return user_from_token(token, db)
+
+
 async def require_auth(current_user: User | None = Depends(get_current_user)) -> User:
     if current_user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Требуется авторизация")
@@ -5,14 +5,16 @@ from sqlalchemy.orm import Session
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from src.db.database import SessionLocal, engine
-from src.db.models.models import Base, PickupPoint, Product, User
+from src.db.database import SessionLocal
+from src.db.lookups import resolve_lookups
+from src.db.migrate import upgrade_database
+from src.db.models.models import PickupPoint, Product, User
 from src.utils.security import get_password_hash
 
 
 def create_tables():
-    print("Создание таблиц...")
-    Base.metadata.create_all(bind=engine)
+    print("Применение миграций...")
+    upgrade_database()
     print("Таблицы созданы успешно!")
 
 
@@ -75,7 +77,7 @@ def load_products(db: Session):
     for product_data in products_data:
         existing = db.query(Product).filter(Product.article == product_data["article"]).first()
         if not existing:
-            product = Product(**product_data)
+            product = Product(**resolve_lookups(db, dict(product_data)))
             db.add(product)
             count += 1
 
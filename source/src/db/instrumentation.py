@@ -0,0 +1,32 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.db.query_guard import record_statement
+from src.db.slow_queries import slow_query_log
+from src.utils.metrics import record_query
+
+
+def statement_operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def instrument_engine(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+        record_query(statement_operation(statement), seconds)
+        record_statement(statement)
+        slow_query_log.record(conn, statement, parameters, executemany, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            record_query(statement_operation(context.statement or ""), time.perf_counter() - started.pop())
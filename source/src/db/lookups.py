@@ -0,0 +1,37 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.db.models.models import Category, Manufacturer, Supplier
+
+LOOKUP_FIELDS = {
+    "supplier": Supplier,
+    "manufacturer": Manufacturer,
+    "category": Category,
+}
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split())
+
+
+def get_or_create(db: Session, model, name: str) -> int:
+    name = normalize_name(name)
+    lookup_id = db.query(model.id).filter(model.name == name).scalar()
+    if lookup_id is not None:
+        return lookup_id
+
+    entry = model(name=name)
+    try:
+        with db.begin_nested():
+            db.add(entry)
+        return entry.id
+    except IntegrityError:
+        return db.query(model.id).filter(model.name == name).scalar()
+
+
+def resolve_lookups(db: Session, data: dict) -> dict:
+    for field, model in LOOKUP_FIELDS.items():
+        if field in data:
+            name = data.pop(field)
+            data[f"{field}_id"] = None if name is None else get_or_create(db, model, name)
+    return data
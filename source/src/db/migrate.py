@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from src.db.database import engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(revision: str = "head"):
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "products" in tables:
+            print("Найдена база без истории миграций, отмечаем базовую ревизию...")
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
+
+
+def downgrade_database(revision: str):
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), revision)
+
+
+def stamp_database(revision: str = "head"):
+    with engine.begin() as connection:
+        command.stamp(alembic_config(connection), revision)
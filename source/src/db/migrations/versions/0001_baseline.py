@@ -0,0 +1,72 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("login", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_login", "users", ["login"], unique=True)
+
+    op.create_table(
+        "pickup_points",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("address", sa.String(), nullable=False, unique=True),
+    )
+    op.create_index("ix_pickup_points_id", "pickup_points", ["id"])
+
+    op.create_table(
+        "products",
+        sa.Column("article", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("unit", sa.String(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("supplier", sa.String(), nullable=False),
+        sa.Column("manufacturer", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("discount", sa.Integer()),
+        sa.Column("quantity", sa.Integer()),
+        sa.Column("description", sa.String()),
+        sa.Column("photo", sa.String()),
+    )
+    op.create_index("ix_products_article", "products", ["article"])
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_number", sa.String(), nullable=False),
+        sa.Column("order_date", sa.Date(), nullable=False),
+        sa.Column("delivery_date", sa.Date(), nullable=False),
+        sa.Column("pickup_point_id", sa.Integer(), sa.ForeignKey("pickup_points.id")),
+        sa.Column("client_full_name", sa.String(), nullable=False),
+        sa.Column("code", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    op.create_index("ix_orders_id", "orders", ["id"])
+    op.create_index("ix_orders_order_number", "orders", ["order_number"], unique=True)
+
+    op.create_table(
+        "order_product",
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id", ondelete="CASCADE")),
+        sa.Column("product_id", sa.String(), sa.ForeignKey("products.article", ondelete="CASCADE")),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("order_product")
+    op.drop_table("orders")
+    op.drop_table("products")
+    op.drop_table("pickup_points")
+    op.drop_table("users")
@@ -0,0 +1,63 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("products", "orders")
+HASHED_TABLES = ("users", "orders")
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table in HASHED_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "source_hash" not in columns:
+            op.add_column(table, sa.Column("source_hash", sa.String(64)))
+
+    for table in VERSIONED_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "version" not in columns:
+            op.add_column(table, sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"))
+        if "updated_at" not in columns:
+            recreate = "always" if op.get_bind().dialect.name == "sqlite" else "auto"
+            with op.batch_alter_table(table, recreate=recreate) as batch:
+                batch.add_column(sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()))
+        if f"ix_{table}_version" not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(f"ix_{table}_version", table, ["version"])
+
+    if "sync_counters" not in tables:
+        op.create_table(
+            "sync_counters",
+            sa.Column("name", sa.String(), primary_key=True),
+            sa.Column("value", sa.BigInteger(), nullable=False),
+        )
+
+    if "tombstones" not in tables:
+        op.create_table(
+            "tombstones",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("entity", sa.String(), nullable=False),
+            sa.Column("entity_id", sa.String(), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_tombstones_id", "tombstones", ["id"])
+        op.create_index("ix_tombstones_version", "tombstones", ["version"])
+
+
+def downgrade():
+    op.drop_table("tombstones")
+    op.drop_table("sync_counters")
+    for table in VERSIONED_TABLES:
+        op.drop_index(f"ix_{table}_version", table_name=table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
+            batch.drop_column("version")
+    for table in HASHED_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("source_hash")
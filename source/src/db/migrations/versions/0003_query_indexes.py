@@ -0,0 +1,55 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_orders_order_date", "orders", ["order_date"]),
+    ("ix_orders_status_order_date", "orders", ["status", "order_date"]),
+    ("ix_orders_pickup_point_id", "orders", ["pickup_point_id"]),
+    ("ix_products_supplier_article", "products", ["supplier", "article"]),
+    ("ix_products_quantity_article", "products", ["quantity", "article"]),
+    ("ix_tombstones_entity_version", "tombstones", ["entity", "version"]),
+]
+
+
+def order_product_table(name: str, with_key: bool) -> list:
+    columns = [
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id", ondelete="CASCADE"), nullable=not with_key),
+        sa.Column(
+            "product_id", sa.String(), sa.ForeignKey("products.article", ondelete="CASCADE"), nullable=not with_key
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    ]
+    if with_key:
+        columns.append(sa.PrimaryKeyConstraint("order_id", "product_id", name="pk_order_product"))
+    return [name, *columns]
+
+
+def rebuild_order_product(with_key: bool):
+    op.rename_table("order_product", "order_product_old")
+    op.create_table(*order_product_table("order_product", with_key))
+    op.execute(
+        "INSERT INTO order_product (order_id, product_id, quantity) "
+        "SELECT order_id, product_id, SUM(quantity) FROM order_product_old "
+        "WHERE order_id IS NOT NULL AND product_id IS NOT NULL "
+        "GROUP BY order_id, product_id"
+    )
+    op.drop_table("order_product_old")
+
+
+def upgrade():
+    rebuild_order_product(with_key=True)
+    op.create_index("ix_order_product_product_id", "order_product", ["product_id"])
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index("ix_order_product_product_id", table_name="order_product")
+    rebuild_order_product(with_key=False)
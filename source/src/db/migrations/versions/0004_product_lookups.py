@@ -0,0 +1,72 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+LOOKUPS = [
+    ("supplier", "suppliers"),
+    ("manufacturer", "manufacturers"),
+    ("category", "categories"),
+]
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split())
+
+
+def fill_lookup(bind, column: str, table: str):
+    values = [row[0] for row in bind.execute(sa.text(f"SELECT DISTINCT {column} FROM products"))]
+    names = sorted({normalize_name(value) for value in values if value is not None})
+    if names:
+        bind.execute(sa.text(f"INSERT INTO {table} (name) VALUES (:name)"), [{"name": name} for name in names])
+
+    ids = dict(bind.execute(sa.text(f"SELECT name, id FROM {table}")).all())
+    mapping = [{"value": value, "id": ids[normalize_name(value)]} for value in values if value is not None]
+    if mapping:
+        bind.execute(sa.text(f"UPDATE products SET {column}_id = :id WHERE {column} = :value"), mapping)
+
+
+def upgrade():
+    bind = op.get_bind()
+    for column, table in LOOKUPS:
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False, unique=True),
+        )
+        op.add_column("products", sa.Column(f"{column}_id", sa.Integer(), nullable=True))
+        fill_lookup(bind, column, table)
+
+    op.drop_index("ix_products_supplier_article", table_name="products")
+    with op.batch_alter_table("products") as batch:
+        for column, table in LOOKUPS:
+            batch.drop_column(column)
+            batch.alter_column(f"{column}_id", existing_type=sa.Integer(), nullable=False)
+            batch.create_foreign_key(f"fk_products_{column}_id_{table}", table, [f"{column}_id"], ["id"])
+
+    op.create_index("ix_products_supplier_id_article", "products", ["supplier_id", "article"])
+    op.create_index("ix_products_manufacturer_id", "products", ["manufacturer_id"])
+    op.create_index("ix_products_category_id", "products", ["category_id"])
+
+
+def downgrade():
+    op.drop_index("ix_products_category_id", table_name="products")
+    op.drop_index("ix_products_manufacturer_id", table_name="products")
+    op.drop_index("ix_products_supplier_id_article", table_name="products")
+
+    for column, table in LOOKUPS:
+        op.add_column("products", sa.Column(column, sa.String(), nullable=True))
+        op.execute(f"UPDATE products SET {column} = (SELECT name FROM {table} WHERE {table}.id = products.{column}_id)")
+
+    with op.batch_alter_table("products") as batch:
+        for column, table in LOOKUPS:
+            batch.drop_constraint(f"fk_products_{column}_id_{table}", type_="foreignkey")
+            batch.drop_column(f"{column}_id")
+            batch.alter_column(column, existing_type=sa.String(), nullable=False)
+
+    for _, table in reversed(LOOKUPS):
+        op.drop_table(table)
+    op.create_index("ix_products_supplier_article", "products", ["supplier", "article"])
@@ -0,0 +1,36 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+MONEY = sa.Numeric(12, 2)
+FINAL_PRICE = "ROUND(price * (100 - COALESCE(discount, 0)) / 100.0, 2)"
+
+
+def recreate_mode() -> str:
+    return "always" if op.get_bind().dialect.name == "sqlite" else "auto"
+
+
+def upgrade():
+    with op.batch_alter_table("products", recreate=recreate_mode()) as batch:
+        batch.alter_column(
+            "price",
+            existing_type=sa.Float(),
+            type_=MONEY,
+            existing_nullable=False,
+            postgresql_using="ROUND(price::numeric, 2)",
+        )
+        batch.add_column(sa.Column("final_price", MONEY, sa.Computed(FINAL_PRICE, persisted=True)))
+
+    op.execute("UPDATE products SET price = ROUND(price, 2)")
+    op.create_index("ix_products_final_price_article", "products", ["final_price", "article"])
+
+
+def downgrade():
+    op.drop_index("ix_products_final_price_article", table_name="products")
+    with op.batch_alter_table("products", recreate=recreate_mode()) as batch:
+        batch.drop_column("final_price")
+        batch.alter_column("price", existing_type=MONEY, type_=sa.Float(), existing_nullable=False)
@@ -0,0 +1,30 @@
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_products_price_article", ["price", "article"]),
+    ("ix_products_category_id_final_price", ["category_id", "final_price"]),
+    ("ix_products_manufacturer_id_final_price", ["manufacturer_id", "final_price"]),
+]
+REPLACED_INDEXES = [
+    ("ix_products_category_id", ["category_id"]),
+    ("ix_products_manufacturer_id", ["manufacturer_id"]),
+]
+
+
+def upgrade():
+    for name, columns in INDEXES:
+        op.create_index(name, "products", columns)
+    for name, _ in REPLACED_INDEXES:
+        op.drop_index(name, table_name="products")
+
+
+def downgrade():
+    for name, columns in REPLACED_INDEXES:
+        op.create_index(name, "products", columns)
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="products")
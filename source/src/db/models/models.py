@@ -1,14 +1,31 @@
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String, Table
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Table,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from src.db.database import Base
 
+MONEY = Numeric(12, 2)
+FINAL_PRICE = "ROUND(price * (100 - COALESCE(discount, 0)) / 100.0, 2)"
+
 order_product = Table(
     "order_product",
     Base.metadata,
-    Column("order_id", Integer, ForeignKey("orders.id", ondelete="CASCADE")),
-    Column("product_id", String, ForeignKey("products.article", ondelete="CASCADE")),
+    Column("order_id", Integer, ForeignKey("orders.id", ondelete="CASCADE"), primary_key=True),
+    Column("product_id", String, ForeignKey("products.article", ondelete="CASCADE"), primary_key=True),
     Column("quantity", Integer, nullable=False, default=1),
+    Index("ix_order_product_product_id", "product_id"),
 )
 
 
@@ -20,6 +37,7 @@ class User(Base):
     full_name = Column(String, nullable=False)
     login = Column(String, unique=True, nullable=False, index=True)
     password = Column(String, nullable=False)
+    source_hash = Column(String(64))
 
 
 class PickupPoint(Base):
@@ -31,23 +49,83 @@ class PickupPoint(Base):
     orders = relationship("Order", back_populates="pickup_point")
 
 
+class Supplier(Base):
+    __tablename__ = "suppliers"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+    products = relationship("Product", back_populates="supplier_ref")
+
+
+class Manufacturer(Base):
+    __tablename__ = "manufacturers"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+    products = relationship("Product", back_populates="manufacturer_ref")
+
+
+class Category(Base):
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+    products = relationship("Product", back_populates="category_ref")
+
+
 class Product(Base):
     __tablename__ = "products"
 
     article = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     unit = Column(String, nullable=False)
-    price = Column(Float, nullable=False)
-    supplier = Column(String, nullable=False)
-    manufacturer = Column(String, nullable=False)
-    category = Column(String, nullable=False)
+    price = Column(MONEY, nullable=False)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", name="fk_products_supplier_id_suppliers"), nullable=False)
+    manufacturer_id = Column(
+        Integer,
+        ForeignKey("manufacturers.id", name="fk_products_manufacturer_id_manufacturers"),
+        nullable=False,
+    )
+    category_id = Column(
+        Integer, ForeignKey("categories.id", name="fk_products_category_id_categories"), nullable=False
+    )
     discount = Column(Integer, default=0)
+    final_price = Column(MONEY, Computed(FINAL_PRICE, persisted=True))
     quantity = Column(Integer, default=0)
     description = Column(String)
     photo = Column(String)
+    version = Column(BigInteger, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    supplier_ref = relationship("Supplier", back_populates="products", lazy="joined", innerjoin=True)
+    manufacturer_ref = relationship("Manufacturer", back_populates="products", lazy="joined", innerjoin=True)
+    category_ref = relationship("Category", back_populates="products", lazy="joined", innerjoin=True)
     orders = relationship("Order", secondary=order_product, back_populates="products")
 
+    __table_args__ = (
+        Index("ix_products_supplier_id_article", "supplier_id", "article"),
+        Index("ix_products_quantity_article", "quantity", "article"),
+        Index("ix_products_final_price_article", "final_price", "article"),
+        Index("ix_products_price_article", "price", "article"),
+        Index("ix_products_category_id_final_price", "category_id", "final_price"),
+        Index("ix_products_manufacturer_id_final_price", "manufacturer_id", "final_price"),
+    )
+
+    @property
+    def supplier(self) -> str:
+        return self.supplier_ref.name
+
+    @property
+    def manufacturer(self) -> str:
+        return self.manufacturer_ref.name
+
+    @property
+    def category(self) -> str:
+        return self.category_ref.name
+
 
 class Order(Base):
     __tablename__ = "orders"
@@ -60,6 +138,34 @@ class Order(Base):
     client_full_name = Column(String, nullable=False)
     code = Column(Integer, nullable=False)
     status = Column(String, nullable=False)
+    source_hash = Column(String(64))
+    version = Column(BigInteger, nullable=False, default=0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     pickup_point = relationship("PickupPoint", back_populates="orders")
     products = relationship("Product", secondary=order_product, back_populates="orders")
+
+    __table_args__ = (
+        Index("ix_orders_order_date", "order_date"),
+        Index("ix_orders_status_order_date", "status", "order_date"),
+        Index("ix_orders_pickup_point_id", "pickup_point_id"),
+    )
+
+
+class SyncCounter(Base):
+    __tablename__ = "sync_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    version = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_tombstones_entity_version", "entity", "version"),)
@@ -0,0 +1,20 @@
+import pytest
+
+from src.db.query_guard import QUERY_GUARD_MAX_QUERIES, QUERY_GUARD_MAX_REPEATS, QueryGuard
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries=None, max_repeats=None): лимиты SQL-запросов для фикстуры query_guard"
+    )
+
+
+@pytest.fixture
+def query_guard(request):
+    marker = request.node.get_closest_marker("query_budget")
+    budget = {"max_queries": QUERY_GUARD_MAX_QUERIES, "max_repeats": QUERY_GUARD_MAX_REPEATS}
+    if marker is not None:
+        budget.update(marker.kwargs)
+
+    with QueryGuard(**budget, mode="raise", label=request.node.nodeid, all_threads=True) as guard:
+        yield guard
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import warnings
+from collections import Counter
+from contextvars import ContextVar
+
+from src.db.slow_queries import normalize_sql
+
+QUERY_GUARD = os.getenv("QUERY_GUARD", "off")
+QUERY_GUARD_MAX_QUERIES = int(os.getenv("QUERY_GUARD_MAX_QUERIES", "50"))
+QUERY_GUARD_MAX_REPEATS = int(os.getenv("QUERY_GUARD_MAX_REPEATS", "5"))
+REPORTED_SHAPES = 3
+
+active_guards: ContextVar[tuple["QueryGuard", ...]] = ContextVar("active_guards", default=())
+global_guards: set["QueryGuard"] = set()
+global_guards_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryGuardWarning(UserWarning):
+    pass
+
+
+class QueryGuard:
+    def __init__(
+        self,
+        max_queries: int | None = QUERY_GUARD_MAX_QUERIES,
+        max_repeats: int | None = QUERY_GUARD_MAX_REPEATS,
+        mode: str = "raise",
+        label: str | None = None,
+        all_threads: bool = False,
+    ):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.mode = mode
+        self.label = label
+        self.all_threads = all_threads
+        self.shapes: Counter[str] = Counter()
+        self.lock = threading.Lock()
+        self.token = None
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def record(self, statement: str):
+        shape = normalize_sql(statement)
+        with self.lock:
+            self.shapes[shape] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        if self.max_repeats is None:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > self.max_repeats]
+
+    def violations(self) -> list[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"выполнено {self.count} SQL-запросов при лимите {self.max_queries}")
+        for shape, count in self.repeated()[:REPORTED_SHAPES]:
+            problems.append(f"запрос повторён {count} раз (возможен N+1): {shape[:300]}")
+        return problems
+
+    def report(self) -> str | None:
+        problems = self.violations()
+        if not problems:
+            return None
+        prefix = f"{self.label}: " if self.label else ""
+        return prefix + "; ".join(problems)
+
+    def check(self):
+        message = self.report()
+        if message is None:
+            return
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(message)
+        warnings.warn(message, QueryGuardWarning, stacklevel=3)
+
+    def __enter__(self) -> "QueryGuard":
+        if self.all_threads:
+            with global_guards_lock:
+                global_guards.add(self)
+        else:
+            self.token = active_guards.set(active_guards.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.all_threads:
+            with global_guards_lock:
+                global_guards.discard(self)
+        else:
+            active_guards.reset(self.token)
+        if exc_type is None:
+            self.check()
+
+
+def record_statement(statement: str):
+    for guard in active_guards.get():
+        guard.record(statement)
+    if global_guards:
+        with global_guards_lock:
+            guards = list(global_guards)
+        for guard in guards:
+            guard.record(statement)
+
+
+class QueryGuardMiddleware:
+    def __init__(
+        self,
+        app,
+        mode: str = QUERY_GUARD,
+        max_queries: int | None = QUERY_GUARD_MAX_QUERIES,
+        max_repeats: int | None = QUERY_GUARD_MAX_REPEATS,
+    ):
+        self.app = app
+        self.mode = mode
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode not in ("warn", "raise"):
+            await self.app(scope, receive, send)
+            return
+
+        guard = QueryGuard(self.max_queries, self.max_repeats, self.mode, f"{scope['method']} {scope['path']}")
+        rejected = False
+
+        async def send_wrapper(message):
+            nonlocal rejected
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-query-count", str(guard.count).encode())]
+                report = guard.report()
+                if report is not None and self.mode == "raise":
+                    rejected = True
+                    body = json.dumps({"detail": report}, ensure_ascii=False).encode("utf-8")
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                            ],
+                        }
+                    )
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if report is not None:
+                    print(f"Предупреждение о запросах к БД: {report}")
+            if not rejected:
+                await send(message)
+
+        token = active_guards.set(active_guards.get() + (guard,))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            active_guards.reset(token)
@@ -0,0 +1,186 @@
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "1") != "0"
+EXPLAIN_INTERVAL_SECONDS = 60
+EXPLAIN_QUEUE_SIZE = 32
+ROUTERS_PACKAGE = os.path.join("src", "api", "routers")
+SOURCE_PACKAGE = os.sep + "src" + os.sep
+DB_PACKAGE = os.path.join("src", "db")
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.%])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*\)")
+WHITESPACE = re.compile(r"\s+")
+FROM_CLAUSE = re.compile(r"\bFROM\b", re.IGNORECASE)
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+MODIFYING_STATEMENT = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+FUNCTION_CALL = re.compile(r"(?<![\w.\"])([A-Za-z_][\w.]*)\s*\(")
+PARENTHESIZED_KEYWORDS = frozenset(
+    (
+        "all and any array as between by else exists from in is join lateral like not on or over filter row "
+        "select then using values when where within"
+    ).split()
+)
+SAFE_FUNCTIONS = frozenset(
+    (
+        "abs avg bool_and bool_or cast ceil char_length coalesce concat count date_trunc extract floor "
+        "greatest least length lower max min now nullif round row_number string_agg sum trim upper"
+    ).split()
+)
+
+
+def normalize_sql(statement: str) -> str:
+    statement = STRING_LITERAL.sub("?", statement)
+    statement = NUMBER_LITERAL.sub("?", statement)
+    statement = PLACEHOLDER_LIST.sub("(...)", statement)
+    return WHITESPACE.sub(" ", statement).strip()
+
+
+def parameters_shape(parameters, executemany: bool = False):
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters_shape(parameters[0]) if parameters else None
+        return {"rows": len(parameters), "row": first}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def describe_frame(frame) -> str:
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def call_site() -> str | None:
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if ROUTERS_PACKAGE in filename:
+            return describe_frame(frame)
+        if fallback is None and SOURCE_PACKAGE in filename and DB_PACKAGE not in filename:
+            fallback = describe_frame(frame)
+        frame = frame.f_back
+    return fallback
+
+
+def is_explainable(statement: str) -> bool:
+    head = statement.lstrip().split(None, 1)
+    if not head or head[0].upper() not in ("SELECT", "WITH"):
+        return False
+    body = STRING_LITERAL.sub("?", statement)
+    if not FROM_CLAUSE.search(body) or LOCKING_CLAUSE.search(body):
+        return False
+    for name in FUNCTION_CALL.findall(body):
+        if name.lower() not in PARENTHESIZED_KEYWORDS and name.lower() not in SAFE_FUNCTIONS:
+            return False
+    return head[0].upper() == "SELECT" or not MODIFYING_STATEMENT.search(body)
+
+
+def explain_plan(engine, statement: str, parameters) -> list[str]:
+    try:
+        connection = engine.raw_connection()
+    except Exception as e:
+        return [f"EXPLAIN не выполнен: {e}"]
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            connection.rollback()
+    except Exception as e:
+        return [f"EXPLAIN не выполнен: {e}"]
+    finally:
+        connection.close()
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        size: int = SLOW_QUERY_LOG_SIZE,
+        explain: bool = SLOW_QUERY_EXPLAIN,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.entries: deque[dict] = deque(maxlen=size)
+        self.explained_at: dict[str, float] = {}
+        self.pending: queue.Queue[tuple] = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self.worker: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def record(self, conn, statement: str, parameters, executemany: bool, seconds: float):
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        normalized = normalize_sql(statement)
+        entry = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "statement": normalized,
+            "parameters": parameters_shape(parameters, executemany),
+            "call_site": call_site(),
+            "plan": None,
+            "plan_type": None,
+        }
+        with self.lock:
+            self.entries.append(entry)
+
+        if self.explain and not executemany and conn.dialect.name == "postgresql" and is_explainable(statement):
+            self.schedule_plan(conn.engine, entry, normalized, statement, parameters)
+
+    def schedule_plan(self, engine, entry: dict, normalized: str, statement: str, parameters):
+        now = time.monotonic()
+        with self.lock:
+            if now - self.explained_at.get(normalized, -EXPLAIN_INTERVAL_SECONDS) < EXPLAIN_INTERVAL_SECONDS:
+                return
+            self.explained_at[normalized] = now
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.explain_worker, name="slow-query-explain", daemon=True)
+                self.worker.start()
+
+        try:
+            self.pending.put_nowait((engine, entry, statement, parameters))
+        except queue.Full:
+            with self.lock:
+                self.explained_at.pop(normalized, None)
+
+    def explain_worker(self):
+        while True:
+            engine, entry, statement, parameters = self.pending.get()
+            try:
+                plan = explain_plan(engine, statement, parameters)
+                with self.lock:
+                    entry["plan"] = plan
+                    entry["plan_type"] = "estimated"
+            finally:
+                self.pending.task_done()
+
+    def wait_for_plans(self):
+        self.pending.join()
+
+    def snapshot(self, limit: int | None = None) -> list[dict]:
+        with self.lock:
+            entries = [dict(entry) for entry in reversed(self.entries)]
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.explained_at.clear()
+
+
+slow_query_log = SlowQueryLog()
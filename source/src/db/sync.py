@@ -0,0 +1,62 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.db.models.models import SyncCounter, Tombstone
+
+GLOBAL_COUNTER = "global"
+
+
+def next_version(db: Session) -> int:
+    stmt = (
+        update(SyncCounter)
+        .where(SyncCounter.name == GLOBAL_COUNTER)
+        .values(value=SyncCounter.value + 1)
+        .returning(SyncCounter.value)
+    )
+    version = db.execute(stmt).scalar()
+    if version is not None:
+        return version
+
+    try:
+        with db.begin_nested():
+            db.execute(insert(SyncCounter).values(name=GLOBAL_COUNTER, value=1))
+        return 1
+    except IntegrityError:
+        return db.execute(stmt).scalar()
+
+
+def current_version(db: Session) -> int:
+    return db.execute(select(SyncCounter.value).where(SyncCounter.name == GLOBAL_COUNTER)).scalar() or 0
+
+
+def touch(db: Session, *entities) -> int:
+    version = next_version(db)
+    for entity in entities:
+        entity.version = version
+    return version
+
+
+def record_deletion(db: Session, entity: str, entity_id) -> int:
+    version = next_version(db)
+    db.add(Tombstone(entity=entity, entity_id=str(entity_id), version=version))
+    return version
+
+
+def changes_since(db: Session, model, key, entity: str, since: int, options=()) -> tuple[int, list, list[str], bool]:
+    token = current_version(db)
+    query = db.query(model).options(*options)
+    if since <= 0 or since > token:
+        return token, query.filter(model.version <= token).order_by(key).all(), [], True
+    if since == token:
+        return token, [], [], False
+
+    rows = query.filter(model.version > since, model.version <= token).order_by(model.version).all()
+    alive = {str(getattr(row, key.key)) for row in rows}
+    deleted = (
+        db.query(Tombstone.entity_id)
+        .filter(Tombstone.entity == entity, Tombstone.version > since, Tombstone.version <= token)
+        .order_by(Tombstone.version)
+        .all()
+    )
+    return token, rows, list(dict.fromkeys(entity_id for (entity_id,) in deleted if entity_id not in alive)), False
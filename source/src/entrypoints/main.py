@@ -1,12 +1,31 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
-from src.api.routers import auth, orders, products
+from src.api.catalog import catalog
+from src.api.routers import admin, auth, events, export, orders, products
+from src.db.query_guard import QUERY_GUARD, QueryGuardMiddleware
+from src.utils.events import broker
+from src.utils.metrics import MetricsMiddleware, registry
+from src.utils.profiler import PROFILE_SECRET, ProfileRequestMiddleware
 
-app = FastAPI(title="Shoe Shop API", description="API для магазина обуви ООО «Обувь»", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await broker.start()
+    await catalog.start()
+    yield
+    await catalog.stop()
+    await broker.stop()
+
+
+app = FastAPI(
+    title="Shoe Shop API", description="API для магазина обуви ООО «Обувь»", version="1.0.0", lifespan=lifespan
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +33,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Sync-Token", "ETag"],
 )
+if QUERY_GUARD in ("warn", "raise"):
+    app.add_middleware(QueryGuardMiddleware)
+app.add_middleware(MetricsMiddleware)
+if PROFILE_SECRET:
+    app.add_middleware(ProfileRequestMiddleware)
 
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -22,6 +47,9 @@ if os.path.exists("static"):
 app.include_router(auth.router)
 app.include_router(products.router)
 app.include_router(orders.router)
+app.include_router(export.router)
+app.include_router(events.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -32,3 +60,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -41,11 +41,20 @@ class OrderUpdate(BaseModel):
 class Order(OrderBase):
     id: int
     pickup_address: str | None = None
+    version: int = 0
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
 
 
+class OrderChanges(BaseModel):
+    token: int
+    items: list[Order]
+    deleted: list[int]
+    snapshot: bool = False
+
+
 class PickupPointBase(BaseModel):
     address: str
 
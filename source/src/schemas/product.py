@@ -1,11 +1,26 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field, PlainSerializer
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+Money = Annotated[
+    Decimal, AfterValidator(to_cents), PlainSerializer(float, return_type=float, when_used="json-unless-none")
+]
 
 
 class ProductBase(BaseModel):
     article: str
     name: str
     unit: str
-    price: float = Field(gt=0)
+    price: Money = Field(gt=0)
     supplier: str
     manufacturer: str
     category: str
@@ -22,7 +37,7 @@ class ProductCreate(ProductBase):
 class ProductUpdate(BaseModel):
     name: str | None = None
     unit: str | None = None
-    price: float | None = Field(None, gt=0)
+    price: Money | None = Field(None, gt=0)
     supplier: str | None = None
     manufacturer: str | None = None
     category: str | None = None
@@ -33,10 +48,20 @@ class ProductUpdate(BaseModel):
 
 
 class Product(ProductBase):
+    version: int = 0
+    updated_at: datetime | None = None
+
     class Config:
         from_attributes = True
 
 
 class ProductWithFinalPrice(Product):
-    final_price: float
+    final_price: Money
     out_of_stock: bool
+
+
+class ProductChanges(BaseModel):
+    token: int
+    items: list[ProductWithFinalPrice]
+    deleted: list[str]
+    snapshot: bool = False
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import select
+import threading
+from contextlib import asynccontextmanager
+
+from sqlalchemy.engine import URL
+
+from src.db.database import engine
+
+EVENT_BROKER = os.getenv("EVENT_BROKER", "memory")
+EVENT_CHANNEL = "shoe_shop_events"
+SUBSCRIBER_QUEUE_SIZE = 256
+LISTEN_POLL_SECONDS = 1.0
+RECONNECT_SECONDS = 5.0
+
+RESYNC_EVENT = {"entity": "*", "op": "resync"}
+
+
+def libpq_dsn(url: URL) -> str:
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def notify_database(event: dict, channel: str = EVENT_CHANNEL) -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT pg_notify(%s, %s)", (channel, json.dumps(event)))
+        connection.commit()
+    return True
+
+
+class InMemoryBroker:
+    blocking = False
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        self.subscribers.clear()
+
+    def publish(self, event: dict):
+        self.dispatch(event)
+
+    def dispatch(self, event: dict):
+        if self.loop is None:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            self._fan_out(event)
+        else:
+            self.loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _fan_out(self, event: dict):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self.subscribers.discard(queue)
+
+
+class PostgresBroker(InMemoryBroker):
+    blocking = True
+
+    def __init__(self, dsn: str | None = None, channel: str = EVENT_CHANNEL):
+        super().__init__()
+        self.dsn = dsn or libpq_dsn(engine.url)
+        self.channel = channel
+        self.stopped = threading.Event()
+        self.listener: threading.Thread | None = None
+
+    async def start(self):
+        await super().start()
+        self.stopped.clear()
+        self.listener = threading.Thread(target=self._listen, name="shoe-shop-events", daemon=True)
+        self.listener.start()
+
+    async def stop(self):
+        self.stopped.set()
+        if self.listener is not None:
+            await asyncio.to_thread(self.listener.join, LISTEN_POLL_SECONDS * 2)
+        await super().stop()
+
+    def publish(self, event: dict):
+        notify_database(event, self.channel)
+
+    def _listen(self):
+        import psycopg2
+
+        while not self.stopped.is_set():
+            try:
+                connection = psycopg2.connect(self.dsn)
+            except Exception as e:
+                print(f"Брокер событий: не удалось подключиться к базе, повтор через {RECONNECT_SECONDS:.0f} с: {e}")
+                self.stopped.wait(RECONNECT_SECONDS)
+                continue
+
+            try:
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                self.dispatch(RESYNC_EVENT)
+
+                while not self.stopped.is_set():
+                    if select.select([connection], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.receive(connection.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Брокер событий: соединение потеряно, повтор через {RECONNECT_SECONDS:.0f} с: {e}")
+                self.stopped.wait(RECONNECT_SECONDS)
+            finally:
+                connection.close()
+
+    def receive(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError as e:
+            print(f"Брокер событий: некорректное событие {payload!r}: {e}")
+            return
+        self.dispatch(event)
+
+
+def create_broker() -> InMemoryBroker:
+    if EVENT_BROKER == "postgres":
+        return PostgresBroker()
+    return InMemoryBroker()
+
+
+broker = create_broker()
+
+
+def safe_publish(event: dict):
+    try:
+        broker.publish(event)
+    except Exception as e:
+        print(f"Не удалось опубликовать событие {event}: {e}")
+
+
+def publish_change(entity: str, op: str, entity_id, version: int | None = None):
+    event = {"entity": entity, "op": op, "id": entity_id, "version": version}
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None and broker.blocking:
+        loop.run_in_executor(None, safe_publish, event)
+    else:
+        safe_publish(event)
+
+
+def publish_external_change(entity: str, op: str, entity_id, version: int | None = None) -> bool:
+    event = {"entity": entity, "op": op, "id": entity_id, "version": version}
+    try:
+        return notify_database(event)
+    except Exception as e:
+        print(f"Не удалось опубликовать событие {event}: {e}")
+        return False
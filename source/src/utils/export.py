@@ -0,0 +1,203 @@
+import csv
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Iterator
+
+from sqlalchemy import ColumnElement, Select, select
+from sqlalchemy.orm import Session
+
+from src.db.models.models import Category, Manufacturer, Order, PickupPoint, Product, Supplier, order_product
+
+EXPORT_CHUNK_SIZE = 1000
+MAX_EXPORT_CHUNK_SIZE = 10000
+FILE_READ_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def products_query() -> Select:
+    return (
+        select(
+            Product.article,
+            Product.name,
+            Product.unit,
+            Product.price,
+            Supplier.name.label("supplier"),
+            Manufacturer.name.label("manufacturer"),
+            Category.name.label("category"),
+            Product.discount,
+            Product.quantity,
+            Product.description,
+            Product.photo,
+        )
+        .join(Supplier, Supplier.id == Product.supplier_id)
+        .join(Manufacturer, Manufacturer.id == Product.manufacturer_id)
+        .join(Category, Category.id == Product.category_id)
+        .order_by(Product.article)
+    )
+
+
+def orders_query() -> Select:
+    return (
+        select(
+            Order.id,
+            Order.order_number,
+            Order.order_date,
+            Order.delivery_date,
+            Order.pickup_point_id,
+            PickupPoint.address.label("pickup_address"),
+            Order.client_full_name,
+            Order.code,
+            Order.status,
+        )
+        .outerjoin(PickupPoint, PickupPoint.id == Order.pickup_point_id)
+        .order_by(Order.id)
+    )
+
+
+def order_lines_query() -> Select:
+    return (
+        select(
+            order_product.c.order_id,
+            Order.order_number,
+            Order.order_date,
+            order_product.c.product_id,
+            Product.name.label("product_name"),
+            Product.price,
+            Product.discount,
+            order_product.c.quantity,
+        )
+        .join(Order, Order.id == order_product.c.order_id)
+        .outerjoin(Product, Product.article == order_product.c.product_id)
+        .order_by(order_product.c.order_id, order_product.c.product_id)
+    )
+
+
+EXPORTS: dict[str, Callable[[], Select]] = {
+    "products": products_query,
+    "orders": orders_query,
+    "order_lines": order_lines_query,
+}
+
+
+def iter_chunks(db: Session, stmt: Select, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for partition in result.partitions():
+        yield list(partition)
+
+
+def write_csv(columns: list[ColumnElement], chunks: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write("\ufeff")
+    writer.writerow([column.name for column in columns])
+    for chunk in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def write_xlsx(columns: list[ColumnElement], chunks: Iterator[list]) -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([column.name for column in columns])
+    for chunk in chunks:
+        for row in chunk:
+            sheet.append(list(row))
+
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        yield from _read_file(file)
+
+
+def _arrow_type(column: ColumnElement):
+    import pyarrow as pa
+
+    python_type = column.type.python_type
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is Decimal:
+        return pa.decimal128(column.type.precision, column.type.scale)
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def write_parquet(columns: list[ColumnElement], chunks: Iterator[list]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column.name, _arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist([dict(zip(schema.names, row)) for row in chunk], schema))
+            if data := sink.drain():
+                yield data
+
+    if data := sink.drain():
+        yield data
+
+
+def _read_file(file) -> Iterator[bytes]:
+    file.seek(0)
+    while data := file.read(FILE_READ_SIZE):
+        yield data
+
+
+WRITERS = {
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+    "parquet": write_parquet,
+}
+
+
+def export_stream(db: Session, entity: str, fmt: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    stmt = EXPORTS[entity]()
+    yield from WRITERS[fmt](list(stmt.selected_columns), iter_chunks(db, stmt, chunk_size))
@@ -0,0 +1,210 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from starlette.routing import Match
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+UNMATCHED_ROUTE = "<unmatched>"
+INF_BUCKET = 'le="+Inf"'
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self.values: dict[tuple, float] = {}
+        self.lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}" for key, value in items]
+
+    def render(self) -> list[str]:
+        return self.header() + self.samples()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def samples(self) -> list[str]:
+        with self.lock:
+            items = [(key, list(counts), total, value_sum) for key, (counts, total, value_sum) in self.series.items()]
+
+        lines = []
+        for key, counts, total, value_sum in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(self.label_names, key, f'le="{format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{format_labels(self.label_names, key, INF_BUCKET)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {format_value(value_sum)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter("http_requests_total", "Количество обработанных HTTP-запросов", ("method", "route", "status"))
+)
+http_latency = registry.register(
+    Histogram("http_request_duration_seconds", "Время обработки HTTP-запроса", ("method", "route"))
+)
+http_in_flight = registry.register(Gauge("http_requests_in_flight", "HTTP-запросы в обработке", ("method", "route")))
+http_response_size = registry.register(
+    Histogram("http_response_size_bytes", "Размер тела ответа", ("method", "route"), SIZE_BUCKETS)
+)
+request_queries = registry.register(
+    Histogram("http_request_db_queries", "Количество SQL-запросов на HTTP-запрос", ("method", "route"), COUNT_BUCKETS)
+)
+request_db_time = registry.register(
+    Histogram("http_request_db_seconds", "Время в базе данных на HTTP-запрос", ("method", "route"))
+)
+db_queries = registry.register(Counter("db_queries_total", "Количество SQL-запросов", ("operation",)))
+db_query_latency = registry.register(
+    Histogram("db_query_duration_seconds", "Время выполнения SQL-запроса", ("operation",))
+)
+
+
+def resolve_route(app, scope) -> str:
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = resolve_route(scope.get("app"), scope)
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc(method, route)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec(method, route)
+            http_latency.observe(time.perf_counter() - started_at, method, route)
+            http_requests.inc(method, route, status_code)
+            http_response_size.observe(size, method, route)
+            request_queries.observe(stats.queries, method, route)
+            request_db_time.observe(stats.db_seconds, method, route)
+            current_request.reset(token)
+
+
+def record_query(operation: str, seconds: float):
+    db_queries.inc(operation)
+    db_query_latency.observe(seconds, operation)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
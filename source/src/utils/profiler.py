@@ -0,0 +1,147 @@
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import uuid
+from collections import Counter, OrderedDict
+
+DEFAULT_INTERVAL = 0.005
+MAX_PROFILE_SECONDS = 60
+PROFILE_SECRET = os.getenv("PROFILE_SECRET")
+PROFILE_HEADER = b"x-profile"
+STORED_PROFILES = 20
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> "SamplingProfiler":
+        self.thread = threading.Thread(target=self._run, name="shoe-shop-profiler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        return self
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (not self.include_idle and is_idle(frame)):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)).replace(";", ","))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    def __init__(self, size: int = STORED_PROFILES):
+        self.size = size
+        self.profiles: OrderedDict[str, str] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def add(self, collapsed: str, profile_id: str | None = None) -> str:
+        profile_id = profile_id or uuid.uuid4().hex
+        with self.lock:
+            self.profiles[profile_id] = collapsed
+            while len(self.profiles) > self.size:
+                self.profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> str | None:
+        with self.lock:
+            return self.profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
+profile_lock = threading.Lock()
+
+
+def profile_for(seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> str:
+    profiler = SamplingProfiler(interval, include_idle).start()
+    threading.Event().wait(seconds)
+    return profiler.stop().collapsed()
+
+
+def finish_profile(profiler: SamplingProfiler, profile_id: str):
+    try:
+        profile_store.add(profiler.stop().collapsed(), profile_id)
+    finally:
+        profile_lock.release()
+
+
+def header_value(scope, name: bytes) -> bytes | None:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value
+    return None
+
+
+class ProfileRequestMiddleware:
+    def __init__(self, app, secret: str | None = PROFILE_SECRET):
+        self.app = app
+        self.secret = secret
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.secret:
+            await self.app(scope, receive, send)
+            return
+
+        token = header_value(scope, PROFILE_HEADER)
+        if (
+            token is None
+            or not hmac.compare_digest(token, self.secret.encode())
+            or not profile_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler().start()
+        profile_id = uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode()),
+                    (b"x-profile-scope", b"process"),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            await asyncio.to_thread(finish_profile, profiler, profile_id)
@@ -0,0 +1,95 @@
+import os
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["CATALOG_SNAPSHOT"] = "0"
+os.environ["CATALOG_REBUILD_DELAY"] = "0.05"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db.database import Base, SessionLocal, engine
+from src.db.lookups import resolve_lookups
+from src.db.migrate import upgrade_database
+from src.db.models.models import PickupPoint, Product, User
+from src.db.sync import touch
+from src.utils.security import create_access_token, get_password_hash
+
+pytest_plugins = ["pytester", "src.db.pytest_query_guard"]
+
+ROLES = {
+    "admin": "Администратор",
+    "manager": "Менеджер",
+    "client": "авторизованный клиент",
+}
+PASSWORD_HASH = get_password_hash("test")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    upgrade_database()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    from src.entrypoints.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(db):
+    def make(role: str) -> dict:
+        login = f"test_{role}"
+        if db.query(User).filter(User.login == login).first() is None:
+            db.add(User(role=ROLES[role], full_name=login, login=login, password=PASSWORD_HASH))
+            db.commit()
+        return {"Authorization": f"Bearer {create_access_token({'sub': login})}"}
+
+    return make
+
+
+@pytest.fixture
+def make_product(db):
+    def make(article: str, **fields) -> Product:
+        data = {
+            "name": f"Товар {article}",
+            "unit": "шт.",
+            "price": 1000,
+            "supplier": "Kari",
+            "manufacturer": "Kari",
+            "category": "Женская обувь",
+            "discount": 0,
+            "quantity": 5,
+            **fields,
+        }
+        product = Product(article=article, **resolve_lookups(db, data))
+        db.add(product)
+        touch(db, product)
+        db.commit()
+        return product
+
+    return make
+
+
+@pytest.fixture
+def pickup_point(db):
+    point = PickupPoint(address="420151, г. Лесной, ул. Вишневая, 32")
+    db.add(point)
+    db.commit()
+    return point
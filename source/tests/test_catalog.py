@@ -0,0 +1,177 @@
+import gzip
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.catalog import accepts_gzip, catalog
+
+REBUILD_DELAY = 0.3
+
+
+def wait_for_snapshot(token: int | None = None, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        snapshot = catalog.current()
+        if snapshot is not None and (token is None or snapshot.token >= token):
+            return snapshot
+        time.sleep(0.01)
+    raise AssertionError("Снимок каталога не пересобран")
+
+
+@pytest.fixture
+def products(make_product):
+    for i in range(7):
+        make_product(f"A{i:03d}", price=1000 + i * 100, discount=i * 5, quantity=i)
+
+
+@pytest.fixture
+def catalog_client(products, monkeypatch):
+    from src.entrypoints.main import app
+
+    monkeypatch.setattr(catalog, "enabled", True)
+    monkeypatch.setattr(catalog, "delay", REBUILD_DELAY)
+    with TestClient(app) as client:
+        wait_for_snapshot()
+        yield client
+
+
+def database_listing(client, **params) -> list[dict]:
+    catalog.enabled = False
+    try:
+        return client.get("/api/products", params=params).json()
+    finally:
+        catalog.enabled = True
+
+
+def test_snapshot_matches_database_listing(catalog_client):
+    response = catalog_client.get("/api/products")
+
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.headers["x-total-count"] == "7"
+    assert response.headers["x-sync-token"] == str(catalog.current().token)
+    assert response.json() == database_listing(catalog_client)
+
+
+@pytest.mark.parametrize("offset, limit", [(0, 3), (3, 3), (6, 3), (10, 3), (2, None)])
+def test_snapshot_pagination(catalog_client, offset, limit):
+    params = {"offset": offset} | ({"limit": limit} if limit else {})
+    response = catalog_client.get("/api/products", params=params)
+
+    assert response.headers["x-total-count"] == "7"
+    assert response.json() == database_listing(catalog_client, **params)
+
+
+def test_pages_have_distinct_etags(catalog_client):
+    etags = {
+        catalog_client.get("/api/products", params={"limit": 3, "offset": offset}).headers["etag"] for offset in (0, 3)
+    }
+    etags.add(catalog_client.get("/api/products").headers["etag"])
+    assert len(etags) == 3
+
+
+def test_if_none_match_returns_304(catalog_client):
+    etag = catalog_client.get("/api/products", params={"limit": 3}).headers["etag"]
+
+    response = catalog_client.get("/api/products", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = catalog_client.get("/api/products", params={"limit": 3}, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_gzip_negotiation(catalog_client):
+    compressed = catalog_client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+
+    plain = catalog_client.get("/api/products", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == compressed.json()
+
+    body, gzipped, _ = catalog.current().page(0, None)
+    assert gzip.decompress(gzipped) == body == plain.content
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0", False),
+        ("deflate, br", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+def test_snapshot_served_to_clients_but_not_staff(catalog_client, auth_headers):
+    client_response = catalog_client.get("/api/products", headers=auth_headers("client"))
+    assert "etag" in client_response.headers
+
+    manager_response = catalog_client.get("/api/products", headers=auth_headers("manager"))
+    assert "etag" not in manager_response.headers
+    assert manager_response.json() == client_response.json()
+
+
+def test_product_update_rebuilds_snapshot_after_debounce(catalog_client, auth_headers):
+    before = catalog_client.get("/api/products")
+    old_token = int(before.headers["x-sync-token"])
+
+    response = catalog_client.put("/api/products/A003", json={"quantity": 99}, headers=auth_headers("admin"))
+    assert response.status_code == 200
+    new_version = response.json()["version"]
+
+    stale = catalog_client.get("/api/products")
+    assert stale.headers["x-sync-token"] == str(old_token)
+    assert stale.headers["etag"] == before.headers["etag"]
+
+    wait_for_snapshot(new_version)
+    fresh = catalog_client.get("/api/products")
+    assert int(fresh.headers["x-sync-token"]) >= new_version
+    assert fresh.headers["etag"] != before.headers["etag"]
+    assert {item["article"]: item["quantity"] for item in fresh.json()}["A003"] == 99
+
+    response = catalog_client.get("/api/products", headers={"If-None-Match": before.headers["etag"]})
+    assert response.status_code == 200
+
+
+def test_delete_and_create_rebuild_snapshot(catalog_client, auth_headers):
+    headers = auth_headers("admin")
+    assert catalog_client.delete("/api/products/A000", headers=headers).status_code == 204
+    created = catalog_client.post(
+        "/api/products",
+        json={
+            "article": "B001",
+            "name": "Новый",
+            "unit": "шт.",
+            "price": 10,
+            "supplier": "Kari",
+            "manufacturer": "Kari",
+            "category": "Женская обувь",
+        },
+        headers=headers,
+    )
+    assert created.status_code == 201
+
+    wait_for_snapshot(created.json()["version"])
+    articles = [item["article"] for item in catalog_client.get("/api/products").json()]
+    assert "A000" not in articles
+    assert "B001" in articles
+
+
+def test_disabled_snapshot_falls_back_to_database(products, client):
+    assert catalog.current() is None
+    response = client.get("/api/products")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert len(response.json()) == 7
@@ -0,0 +1,56 @@
+import threading
+
+import psycopg2
+import pytest
+from sqlalchemy.engine import make_url
+
+from src.utils import events
+from src.utils.events import PostgresBroker, libpq_dsn
+
+
+@pytest.mark.parametrize(
+    "url, dsn",
+    [
+        ("postgresql+psycopg2://shop:s3cret@db:5432/shoe_shop", "postgresql://shop:s3cret@db:5432/shoe_shop"),
+        ("postgresql://shop:s3cret@db/shoe_shop", "postgresql://shop:s3cret@db/shoe_shop"),
+        (
+            "postgresql+psycopg2://shop@db/shoe_shop?sslmode=require",
+            "postgresql://shop@db/shoe_shop?sslmode=require",
+        ),
+    ],
+)
+def test_libpq_dsn_drops_sqlalchemy_driver(url, dsn):
+    assert libpq_dsn(make_url(url)) == dsn
+
+
+def test_broker_dsn_defaults_to_engine_url(monkeypatch):
+    monkeypatch.setattr(events, "engine", type("Engine", (), {"url": make_url("postgresql+psycopg2://u:p@h/d")})())
+    assert PostgresBroker().dsn == "postgresql://u:p@h/d"
+
+
+def test_listener_logs_connection_failures_and_retries(monkeypatch, capsys):
+    attempts = []
+    broker = PostgresBroker(dsn="postgresql://u:p@h/d")
+
+    def connect(dsn):
+        attempts.append(dsn)
+        if len(attempts) == 2:
+            broker.stopped.set()
+        raise psycopg2.OperationalError("connection refused")
+
+    monkeypatch.setattr(psycopg2, "connect", connect)
+    monkeypatch.setattr(events, "RECONNECT_SECONDS", 0.01)
+
+    listener = threading.Thread(target=broker._listen)
+    listener.start()
+    listener.join(5)
+
+    assert not listener.is_alive()
+    assert attempts == ["postgresql://u:p@h/d"] * 2
+    assert capsys.readouterr().out.count("не удалось подключиться к базе") == 2
+
+
+def test_malformed_notification_is_logged_not_raised(capsys):
+    broker = PostgresBroker(dsn="postgresql://u:p@h/d")
+    broker.receive("not json")
+    assert "некорректное событие" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import csv
+import io
+from decimal import Decimal
+
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+
+from src.utils.export import products_query, write_parquet
+
+
+@pytest.fixture
+def products(make_product):
+    for i in range(5):
+        make_product(f"A{i:03d}", price=1000 + i, quantity=i)
+
+
+def export(client, auth_headers, fmt: str, **params):
+    response = client.get("/api/export/products", params={"format": fmt, **params}, headers=auth_headers("manager"))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_csv_export(client, auth_headers, products):
+    response = export(client, auth_headers, "csv", chunk_size=2)
+    assert response.headers["content-disposition"] == 'attachment; filename="products.csv"'
+
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [row["article"] for row in rows] == ["A000", "A001", "A002", "A003", "A004"]
+    assert rows[4]["quantity"] == "4"
+
+
+def test_xlsx_export(client, auth_headers, products):
+    response = export(client, auth_headers, "xlsx", chunk_size=2)
+
+    sheet = load_workbook(io.BytesIO(response.content), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][0] == "article"
+    assert [row[0] for row in rows[1:]] == ["A000", "A001", "A002", "A003", "A004"]
+
+
+def test_parquet_export_has_row_group_per_chunk(client, auth_headers, products):
+    response = export(client, auth_headers, "parquet", chunk_size=2)
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("article").to_pylist() == ["A000", "A001", "A002", "A003", "A004"]
+    assert table.column("price").to_pylist()[1] == Decimal("1001.00")
+
+
+def test_parquet_is_streamed_row_group_by_row_group():
+    columns = list(products_query().selected_columns)
+    consumed = []
+
+    def chunks():
+        for index in range(3):
+            consumed.append(index)
+            yield [(f"A{index}", "Туфли", "шт.", Decimal("10.00"), "Kari", "Kari", "Женская обувь", 0, 1, None, None)]
+
+    stream = write_parquet(columns, chunks())
+    assert next(stream).startswith(b"PAR1")
+    assert consumed == [0]
+
+    rest = b"".join(stream)
+    assert consumed == [0, 1, 2]
+    assert rest.endswith(b"PAR1")
+
+
+@pytest.mark.parametrize(
+    "path, role, status",
+    [
+        ("/api/export/products?format=json", "manager", 400),
+        ("/api/export/users", "manager", 404),
+        ("/api/export/products", "client", 403),
+    ],
+)
+def test_export_rejects_bad_requests(client, auth_headers, path, role, status):
+    assert client.get(path, headers=auth_headers(role)).status_code == status
+
+
+@pytest.mark.parametrize("chunk_size", [0, -5, 10001, 10000000])
+def test_export_rejects_chunk_size_out_of_range(client, auth_headers, chunk_size):
+    response = client.get(
+        "/api/export/products", params={"format": "parquet", "chunk_size": chunk_size}, headers=auth_headers("manager")
+    )
+    assert response.status_code == 422
@@ -0,0 +1,104 @@
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from src.db.lookups import resolve_lookups
+from src.db.migrate import alembic_config
+from src.db.models.models import Category, Manufacturer, Product, Supplier
+
+NEW_PRODUCT = {
+    "article": "B001",
+    "name": "Ботинки",
+    "unit": "шт.",
+    "price": 2500,
+    "supplier": "Обувь для вас",
+    "manufacturer": "Marco Tozzi",
+    "category": "Мужская обувь",
+}
+
+
+def lookup_names(db, model) -> list[str]:
+    return [name for (name,) in db.query(model.name).order_by(model.name)]
+
+
+def test_resolve_lookups_creates_and_reuses_rows(db):
+    first = resolve_lookups(db, {"supplier": "Kari", "manufacturer": "Kari", "category": "Женская обувь"})
+    second = resolve_lookups(db, {"supplier": "  Kari ", "manufacturer": "Rieker", "name": "Туфли"})
+    db.commit()
+
+    assert set(first) == {"supplier_id", "manufacturer_id", "category_id"}
+    assert second["supplier_id"] == first["supplier_id"]
+    assert second["manufacturer_id"] != first["manufacturer_id"]
+    assert second["name"] == "Туфли"
+    assert "category_id" not in second
+    assert lookup_names(db, Supplier) == ["Kari"]
+    assert lookup_names(db, Manufacturer) == ["Kari", "Rieker"]
+    assert lookup_names(db, Category) == ["Женская обувь"]
+
+
+def test_resolve_lookups_normalizes_whitespace(db):
+    data = resolve_lookups(db, {"category": "Женская \t  обувь", "supplier": None})
+    db.commit()
+
+    assert data["supplier_id"] is None
+    assert lookup_names(db, Category) == ["Женская обувь"]
+
+
+def test_api_accepts_lookup_names(client, db, auth_headers, make_product):
+    make_product("A001")
+    headers = auth_headers("admin")
+
+    response = client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+    assert response.status_code == 201
+    assert {key: response.json()[key] for key in ("supplier", "manufacturer", "category")} == {
+        "supplier": "Обувь для вас",
+        "manufacturer": "Marco Tozzi",
+        "category": "Мужская обувь",
+    }
+
+    response = client.put("/api/products/A001", json={"supplier": "Обувь для вас"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["supplier"] == "Обувь для вас"
+
+    products = {product.article: product for product in db.query(Product)}
+    assert products["A001"].supplier_id == products["B001"].supplier_id
+    assert lookup_names(db, Supplier) == ["Kari", "Обувь для вас"]
+    assert client.get("/api/products/suppliers", headers=headers).json() == ["Все поставщики", "Обувь для вас"]
+
+
+def test_migration_moves_names_to_lookup_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'shop.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0003")
+        connection.execute(
+            text(
+                "INSERT INTO products (article, name, unit, price, supplier, manufacturer, category) VALUES "
+                "('A001', 'Туфли', 'шт.', 1000, 'Kari', 'Kari', 'Женская обувь'), "
+                "('A002', 'Сапоги', 'шт.', 2000, 'Kari ', 'Rieker', 'Женская  обувь')"
+            )
+        )
+        command.upgrade(alembic_config(connection), "0004")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT name FROM suppliers")).scalars().all() == ["Kari"]
+        assert connection.execute(text("SELECT name FROM categories")).scalars().all() == ["Женская обувь"]
+        rows = connection.execute(
+            text(
+                "SELECT products.article, suppliers.name, manufacturers.name FROM products "
+                "JOIN suppliers ON suppliers.id = products.supplier_id "
+                "JOIN manufacturers ON manufacturers.id = products.manufacturer_id ORDER BY products.article"
+            )
+        ).all()
+    assert rows == [("A001", "Kari", "Kari"), ("A002", "Kari", "Rieker")]
+    foreign_keys = {key["name"] for key in inspect(engine).get_foreign_keys("products")}
+    assert foreign_keys == {
+        "fk_products_supplier_id_suppliers",
+        "fk_products_manufacturer_id_manufacturers",
+        "fk_products_category_id_categories",
+    }
+
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), "0003")
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT article, supplier, category FROM products ORDER BY article")).all()
+    assert rows == [("A001", "Kari", "Женская обувь"), ("A002", "Kari", "Женская обувь")]
+    engine.dispose()
@@ -0,0 +1,103 @@
+import pytest
+
+from src.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    RequestStats,
+    current_request,
+    db_queries,
+    format_labels,
+    record_query,
+)
+
+
+def sample(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Время", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Время",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_count{route="/a"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+    ]
+
+
+def test_counter_and_gauge():
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Запросы", ("status",)))
+    gauge = registry.register(Gauge("in_flight", "В обработке"))
+    counter.inc(200)
+    counter.inc(200, amount=2)
+    counter.inc(500)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert sample(text, 'requests_total{status="200"}') == 3
+    assert sample(text, 'requests_total{status="500"}') == 1
+    assert sample(text, "in_flight") == 1
+    assert "# TYPE requests_total counter" in text
+    assert text.endswith("\n")
+
+
+@pytest.mark.parametrize(
+    "value, rendered",
+    [("plain", '{a="plain"}'), ('say "hi"', '{a="say \\"hi\\""}'), ("a\\b", '{a="a\\\\b"}'), ("x\ny", '{a="x\\ny"}')],
+)
+def test_label_values_are_escaped(value, rendered):
+    assert format_labels(("a",), (value,)) == rendered
+
+
+def test_record_query_attributes_to_current_request():
+    stats = RequestStats()
+    before = db_queries.values.get(("SELECT",), 0)
+
+    record_query("SELECT", 0.5)
+    assert stats.queries == 0
+
+    token = current_request.set(stats)
+    try:
+        record_query("SELECT", 0.25)
+        record_query("SELECT", 0.25)
+    finally:
+        current_request.reset(token)
+
+    assert (stats.queries, stats.db_seconds) == (2, 0.5)
+    assert db_queries.values[("SELECT",)] - before == 3
+
+
+def test_middleware_records_route_template_status_and_queries(client, make_product):
+    make_product("A001")
+    series = 'http_requests_total{method="GET",route="/api/products/{article}",status="200"}'
+    queries = 'http_request_db_queries_count{method="GET",route="/api/products/{article}"}'
+    before = client.get("/metrics").text
+
+    assert client.get("/api/products/A001").status_code == 200
+    assert client.get("/api/products/A001").status_code == 200
+    assert client.get("/api/products/NOPE").status_code == 404
+    assert client.get("/no/such/path").status_code == 404
+
+    after = client.get("/metrics")
+    assert after.headers["content-type"].startswith("text/plain")
+    text = after.text
+    assert sample(text, series) - sample(before, series) == 2
+    assert sample(text, queries) - sample(before, queries) == 3
+    assert sample(text, series.replace("200", "404")) - sample(before, series.replace("200", "404")) == 1
+    assert sample(text, 'http_requests_total{method="GET",route="<unmatched>",status="404"}') >= 1
+    assert sample(text, 'http_requests_in_flight{method="GET",route="/api/products/{article}"}') == 0
+    assert sample(text, 'db_queries_total{operation="SELECT"}') > sample(before, 'db_queries_total{operation="SELECT"}')
@@ -0,0 +1,104 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from src.db.migrate import alembic_config
+from src.db.models.models import Base
+
+QUERY_INDEXES = {
+    "orders": {
+        "ix_orders_order_date": ["order_date"],
+        "ix_orders_status_order_date": ["status", "order_date"],
+        "ix_orders_pickup_point_id": ["pickup_point_id"],
+    },
+    "order_product": {"ix_order_product_product_id": ["product_id"]},
+    "tombstones": {"ix_tombstones_entity_version": ["entity", "version"]},
+    "products": {"ix_products_quantity_article": ["quantity", "article"]},
+}
+
+
+@pytest.fixture
+def migration_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'shop.db'}")
+    yield engine
+    engine.dispose()
+
+
+def migrate(engine, action, revision: str):
+    with engine.begin() as connection:
+        action(alembic_config(connection), revision)
+
+
+def index_columns(engine, table: str) -> dict[str, list[str]]:
+    return {index["name"]: index["column_names"] for index in inspect(engine).get_indexes(table)}
+
+
+def assert_query_indexes(engine):
+    for table, expected in QUERY_INDEXES.items():
+        indexes = index_columns(engine, table)
+        for name, columns in expected.items():
+            assert indexes.get(name) == columns, f"{table}.{name}"
+    key = inspect(engine).get_pk_constraint("order_product")
+    assert key["constrained_columns"] == ["order_id", "product_id"]
+
+
+def test_upgrade_creates_query_indexes(migration_engine):
+    migrate(migration_engine, command.upgrade, "head")
+
+    assert_query_indexes(migration_engine)
+    assert "ix_products_supplier_id_article" in index_columns(migration_engine, "products")
+
+
+def test_head_matches_models(migration_engine):
+    migrate(migration_engine, command.upgrade, "head")
+
+    with migration_engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
+
+
+def test_downgrade_round_trip(migration_engine):
+    migrate(migration_engine, command.upgrade, "head")
+    migrate(migration_engine, command.downgrade, "0002")
+
+    assert "ix_orders_order_date" not in index_columns(migration_engine, "orders")
+    assert inspect(migration_engine).get_pk_constraint("order_product")["constrained_columns"] == []
+
+    migrate(migration_engine, command.downgrade, "base")
+    assert set(inspect(migration_engine).get_table_names()) == {"alembic_version"}
+
+    migrate(migration_engine, command.upgrade, "head")
+    assert_query_indexes(migration_engine)
+
+
+def test_order_product_duplicates_merged(migration_engine):
+    migrate(migration_engine, command.upgrade, "0002")
+    with migration_engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO products (article, name, unit, price, supplier, manufacturer, category) "
+                "VALUES ('A001', 'Туфли', 'шт.', 1000, 'Kari', 'Kari', 'Женская обувь')"
+            )
+        )
+        connection.execute(text("INSERT INTO pickup_points (id, address) VALUES (1, 'Адрес')"))
+        connection.execute(
+            text(
+                "INSERT INTO orders (id, order_number, order_date, delivery_date, pickup_point_id, "
+                "client_full_name, code, status) "
+                "VALUES (1, '1', '2025-01-01', '2025-01-05', 1, 'Клиент', 101, 'Новый')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO order_product (order_id, product_id, quantity) "
+                "VALUES (1, 'A001', 1), (1, 'A001', 2), (NULL, 'A001', 5)"
+            )
+        )
+
+    migrate(migration_engine, command.upgrade, "0003")
+
+    with migration_engine.connect() as connection:
+        rows = connection.execute(text("SELECT order_id, product_id, quantity FROM order_product")).all()
+    assert rows == [(1, "A001", 3)]
@@ -0,0 +1,114 @@
+from decimal import Decimal
+
+import pytest
+from alembic import command
+from pydantic import ValidationError
+from sqlalchemy import create_engine, text
+
+from src.db.migrate import alembic_config
+from src.db.models.models import Product
+from src.schemas.product import ProductCreate, to_cents
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (Decimal("19.995"), Decimal("20.00")),
+        (Decimal("19.994"), Decimal("19.99")),
+        (Decimal("0.005"), Decimal("0.01")),
+        (Decimal("1000"), Decimal("1000.00")),
+    ],
+)
+def test_to_cents_rounds_half_up(value, expected):
+    assert to_cents(value) == expected
+    assert to_cents(value).as_tuple().exponent == -2
+
+
+def test_money_field_parses_floats_exactly():
+    product = ProductCreate(
+        article="A001",
+        name="Туфли",
+        unit="шт.",
+        price=0.1 + 0.2,
+        supplier="Kari",
+        manufacturer="Kari",
+        category="Женская обувь",
+    )
+    assert product.price == Decimal("0.30")
+    assert product.model_dump(mode="json")["price"] == 0.3
+
+    with pytest.raises(ValidationError):
+        ProductCreate(**product.model_dump() | {"price": 0})
+
+
+@pytest.mark.parametrize(
+    "price, discount, expected",
+    [
+        ("999.99", 15, Decimal("849.99")),
+        ("10.10", 3, Decimal("9.80")),
+        ("1000", 0, Decimal("1000.00")),
+        ("1000", None, Decimal("1000.00")),
+        ("1234.56", 100, Decimal("0.00")),
+    ],
+)
+def test_final_price_is_computed_by_database(db, make_product, price, discount, expected):
+    product = make_product("A001", price=Decimal(price), discount=discount)
+
+    assert product.price == Decimal(price)
+    assert product.final_price == expected
+
+
+def test_final_price_follows_price_updates(db, make_product):
+    product = make_product("A001", price=Decimal("2000"), discount=25)
+    product.discount = 10
+    product.price = Decimal("1999.99")
+    db.commit()
+
+    assert db.query(Product.final_price).filter(Product.article == "A001").scalar() == Decimal("1799.99")
+
+
+def test_api_returns_exact_money(client, auth_headers):
+    headers = auth_headers("admin")
+    response = client.post(
+        "/api/products",
+        json={
+            "article": "B001",
+            "name": "Ботинки",
+            "unit": "шт.",
+            "price": 0.1 + 0.2,
+            "discount": 3,
+            "supplier": "Kari",
+            "manufacturer": "Kari",
+            "category": "Мужская обувь",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    assert response.json()["price"] == 0.3
+
+    response = client.put("/api/products/B001", json={"price": "10.10"}, headers=headers)
+    assert response.status_code == 200
+    product = client.get("/api/products/B001", headers=headers).json()
+    assert (product["price"], product["final_price"]) == (10.1, 9.8)
+    assert '"final_price":9.8,' in client.get("/api/products/B001", headers=headers).text
+
+
+def test_migration_rounds_float_prices(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'shop.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0004")
+        for name, table in (("Kari", "suppliers"), ("Kari", "manufacturers"), ("Женская обувь", "categories")):
+            connection.execute(text(f"INSERT INTO {table} (id, name) VALUES (1, :name)"), {"name": name})
+        connection.execute(
+            text(
+                "INSERT INTO products (article, name, unit, price, discount, supplier_id, manufacturer_id, category_id) "
+                "VALUES ('A001', 'Туфли', 'шт.', 1999.999, 10, 1, 1, 1)"
+            )
+        )
+        command.upgrade(alembic_config(connection), "0005")
+
+    with engine.connect() as connection:
+        price, final_price = connection.execute(text("SELECT price, final_price FROM products")).one()
+    engine.dispose()
+    assert price == 2000
+    assert final_price == 1800
@@ -0,0 +1,93 @@
+import pytest
+
+PRODUCTS = [
+    ("A001", {"price": 1000, "discount": 0, "quantity": 0, "category": "Женская обувь", "manufacturer": "Kari"}),
+    ("A002", {"price": 2000, "discount": 10, "quantity": 5, "category": "Женская обувь", "manufacturer": "Ecco"}),
+    ("A003", {"price": 3000, "discount": 50, "quantity": 12, "category": "Мужская обувь", "manufacturer": "Kari"}),
+    ("A004", {"price": 4000, "discount": 20, "quantity": 3, "category": "Детская обувь", "manufacturer": "Rieker"}),
+    ("A005", {"price": 1500, "discount": 0, "quantity": 12, "category": "Мужская обувь", "manufacturer": "Ecco"}),
+]
+
+
+@pytest.fixture
+def catalogue(make_product, auth_headers):
+    for article, fields in PRODUCTS:
+        make_product(article, **fields)
+    return auth_headers("manager")
+
+
+def articles(client, headers, **params) -> list[str]:
+    response = client.get("/api/products", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    assert int(response.headers["X-Total-Count"]) == len(response.json())
+    return [product["article"] for product in response.json()]
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ({"min_price": 2000}, ["A002", "A003", "A004"]),
+        ({"max_price": 1500}, ["A001", "A005"]),
+        ({"min_price": 1500, "max_price": 3000}, ["A002", "A003", "A005"]),
+        ({"min_final_price": 1500, "max_final_price": 1800}, ["A002", "A003", "A005"]),
+        ({"max_final_price": 1499.99}, ["A001"]),
+        ({"min_discount": 20}, ["A003", "A004"]),
+        ({"max_discount": 0}, ["A001", "A005"]),
+        ({"min_quantity": 5, "max_quantity": 10}, ["A002"]),
+        ({"in_stock": "true"}, ["A002", "A003", "A004", "A005"]),
+        ({"category": "Мужская обувь"}, ["A003", "A005"]),
+        ({"category": ["Мужская обувь", "Детская обувь"]}, ["A003", "A004", "A005"]),
+        ({"manufacturer": "Kari"}, ["A001", "A003"]),
+        ({"manufacturer": ["Kari", "Rieker"], "in_stock": "true"}, ["A003", "A004"]),
+        ({"category": "Женская обувь", "manufacturer": "Ecco"}, ["A002"]),
+        ({"category": "Мужская обувь", "max_final_price": 1500}, ["A003", "A005"]),
+        ({"category": "Нет такой"}, []),
+        ({"min_price": 3000, "max_price": 1000}, []),
+    ],
+)
+def test_filters(client, catalogue, params, expected):
+    assert articles(client, catalogue, **params) == expected
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        ("price", ["A001", "A005", "A002", "A003", "A004"]),
+        ("-price", ["A004", "A003", "A002", "A005", "A001"]),
+        ("+quantity", ["A001", "A004", "A002", "A003", "A005"]),
+        ("-quantity,price", ["A005", "A003", "A002", "A004", "A001"]),
+        ("final_price,-article", ["A001", "A005", "A003", "A002", "A004"]),
+        (" -discount , quantity ", ["A003", "A004", "A002", "A001", "A005"]),
+    ],
+)
+def test_sort(client, catalogue, sort, expected):
+    assert articles(client, catalogue, sort=sort) == expected
+
+
+def test_sort_takes_precedence_over_legacy_quantity_sort(client, catalogue):
+    assert articles(client, catalogue, sort="-price", sort_by_quantity="asc")[0] == "A004"
+    assert articles(client, catalogue, sort_by_quantity="asc")[0] == "A001"
+
+
+@pytest.mark.parametrize("field", ["password", "supplier_id", "article; DROP TABLE products", "-"])
+def test_sort_rejects_fields_outside_whitelist(client, catalogue, field):
+    response = client.get("/api/products", params={"sort": field}, headers=catalogue)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Недопустимое поле сортировки")
+
+
+def test_sort_rejects_too_many_fields(client, catalogue):
+    response = client.get("/api/products", params={"sort": "price,quantity,discount,name"}, headers=catalogue)
+    assert response.status_code == 400
+    assert "не более 3" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("params", [{"min_price": -1}, {"max_discount": 101}, {"min_quantity": "много"}])
+def test_invalid_ranges_are_rejected(client, catalogue, params):
+    assert client.get("/api/products", params=params, headers=catalogue).status_code == 422
+
+
+def test_filters_are_ignored_for_guests(client, catalogue):
+    response = client.get("/api/products", params={"min_price": 3000, "sort": "password"})
+    assert response.status_code == 200
+    assert len(response.json()) == len(PRODUCTS)
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.utils.profiler import ProfileRequestMiddleware, SamplingProfiler, profile_lock, profile_store
+
+SECRET = "s3cret"
+
+
+def busy_handler():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return {"ok": True}
+
+
+@pytest.fixture
+def profiled_client():
+    app = FastAPI()
+    app.get("/busy")(busy_handler)
+    app.add_middleware(ProfileRequestMiddleware, secret=SECRET)
+    return TestClient(app)
+
+
+def test_profile_header_returns_collapsed_profile(profiled_client):
+    response = profiled_client.get("/busy", headers={"X-Profile": SECRET})
+    assert response.status_code == 200
+    assert response.headers["x-profile-scope"] == "process"
+
+    collapsed = profile_store.get(response.headers["x-profile-id"])
+    assert "busy_handler (test_profiler.py" in collapsed
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+    assert profile_lock.acquire(blocking=False)
+    profile_lock.release()
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Profile": "wrong"}, {"X-Profile": SECRET + "x"}])
+def test_profile_requires_matching_secret(profiled_client, headers):
+    response = profiled_client.get("/busy", headers=headers)
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_profile_is_skipped_while_another_runs(profiled_client):
+    assert profile_lock.acquire(blocking=False)
+    try:
+        response = profiled_client.get("/busy", headers={"X-Profile": SECRET})
+    finally:
+        profile_lock.release()
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_middleware_is_disabled_without_secret():
+    app = FastAPI()
+    app.get("/busy")(busy_handler)
+    app.add_middleware(ProfileRequestMiddleware, secret=None)
+
+    response = TestClient(app).get("/busy", headers={"X-Profile": ""})
+    assert "x-profile-id" not in response.headers
+
+
+def test_sampling_profiler_collapses_stacks():
+    profiler = SamplingProfiler(interval=0.001).start()
+    busy_handler()
+    collapsed = profiler.stop().collapsed()
+
+    assert profiler.samples > 0
+    assert "busy_handler" in collapsed
+    assert "shoe-shop-profiler" not in collapsed
@@ -0,0 +1,115 @@
+import pytest
+
+from query_engine import ProductIndex, haystack, ngrams
+
+PRODUCTS = [
+    {
+        "article": "A003",
+        "name": "Ботинки зимние",
+        "supplier": "Kari",
+        "manufacturer": "Rieker",
+        "category": "Мужская обувь",
+        "description": "Натуральная кожа",
+        "quantity": 4,
+    },
+    {
+        "article": "A001",
+        "name": "Туфли",
+        "supplier": "Обувь для вас",
+        "manufacturer": "Marco Tozzi",
+        "category": "Женская обувь",
+        "description": None,
+        "quantity": 12,
+    },
+    {
+        "article": "B002",
+        "name": "Кеды",
+        "supplier": "Kari",
+        "manufacturer": "Kari",
+        "category": "Детская обувь",
+        "description": "Текстиль",
+        "quantity": 0,
+    },
+    {
+        "article": "A002",
+        "name": "Сапоги",
+        "supplier": "Обувь для вас",
+        "manufacturer": "Rieker",
+        "category": "Женская обувь",
+        "description": "Кожа, мех",
+        "quantity": 4,
+    },
+]
+
+
+@pytest.fixture
+def index():
+    return ProductIndex(PRODUCTS)
+
+
+def articles(products: list[dict]) -> list[str]:
+    return [product["article"] for product in products]
+
+
+def test_ngrams():
+    assert ngrams("кожа") == {"кож", "ожа"}
+    assert ngrams("ко") == set()
+
+
+def test_haystack_is_lowercase_and_skips_missing_fields():
+    assert haystack(PRODUCTS[1]) == "a001\nтуфли\nобувь для вас\nmarco tozzi\nженская обувь\n"
+
+
+def test_query_without_filters_sorts_by_article(index):
+    assert articles(index.query()) == ["A001", "A002", "A003", "B002"]
+    assert len(index) == 4
+
+
+@pytest.mark.parametrize(
+    "search, expected",
+    [
+        ("кожа", ["A002", "A003"]),
+        ("КОЖА", ["A002", "A003"]),
+        ("rieker кожа", ["A002", "A003"]),
+        ("rieker мех", ["A002"]),
+        ("женская", ["A001", "A002"]),
+        ("b002", ["B002"]),
+        ("ке", ["B002"]),
+        ("к", ["A001", "A002", "A003", "B002"]),
+        ("кожаный", []),
+        ("   ", ["A001", "A002", "A003", "B002"]),
+    ],
+)
+def test_search_matches_substrings_in_every_term(index, search, expected):
+    assert articles(index.query(search)) == expected
+
+
+def test_search_does_not_match_across_fields(index):
+    assert articles(index.query("вас\nma")) == ["A001"]
+    assert index.query("туфлиобувь") == []
+
+
+def test_supplier_filter_combines_with_search(index):
+    assert articles(index.query(supplier="Kari")) == ["A003", "B002"]
+    assert articles(index.query("обувь", supplier="Kari")) == ["A003", "B002"]
+    assert articles(index.query("кожа", supplier="Обувь для вас")) == ["A002"]
+    assert index.query(supplier="Нет такого") == []
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        ("asc", ["B002", "A002", "A003", "A001"]),
+        ("desc", ["A001", "A002", "A003", "B002"]),
+        (None, ["A001", "A002", "A003", "B002"]),
+    ],
+)
+def test_sort_by_quantity_breaks_ties_by_article(index, sort, expected):
+    assert articles(index.query(sort=sort)) == expected
+
+
+def test_query_result_matches_brute_force(index):
+    for search in ("об", "обувь", "ка", "кар", "ri", "zz", "а", "мужская кожа"):
+        terms = search.lower().split()
+        expected = sorted(p["article"] for p in PRODUCTS if all(term in haystack(p) for term in terms))
+        assert articles(index.query(search)) == expected, search
@@ -0,0 +1,225 @@
+from datetime import date
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.db.database import get_db
+from src.db.instrumentation import instrument_engine
+from src.db.models.models import Order, PickupPoint
+from src.db.query_guard import QueryBudgetExceeded, QueryGuard, QueryGuardMiddleware, QueryGuardWarning
+from src.db.slow_queries import normalize_sql
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    instrument_engine(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.exec_driver_sql("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')")
+    yield engine
+    engine.dispose()
+
+
+def select_each(engine, count: int):
+    with engine.connect() as connection:
+        for item_id in range(count):
+            connection.execute(text(f"SELECT name FROM items WHERE id = {item_id}")).all()
+
+
+@pytest.mark.parametrize(
+    "statement, shape",
+    [
+        ("SELECT * FROM items WHERE id = 42", "SELECT * FROM items WHERE id = ?"),
+        ("SELECT * FROM items WHERE name = 'O''Brien'", "SELECT * FROM items WHERE name = ?"),
+        ("SELECT * FROM items WHERE price > -10.5", "SELECT * FROM items WHERE price > ?"),
+        ("SELECT * FROM items WHERE id IN (?, ?, ?)", "SELECT * FROM items WHERE id IN (...)"),
+        ("SELECT * FROM items WHERE id IN (%(id_1)s, %(id_2)s)", "SELECT * FROM items WHERE id IN (...)"),
+        ("SELECT *\n  FROM   items", "SELECT * FROM items"),
+        ("SELECT * FROM table_2", "SELECT * FROM table_2"),
+    ],
+)
+def test_normalize_sql_collapses_literals(statement, shape):
+    assert normalize_sql(statement) == shape
+
+
+def test_guard_allows_repeats_up_to_threshold(sqlite_engine):
+    with QueryGuard(max_queries=None, max_repeats=5) as guard:
+        select_each(sqlite_engine, 5)
+
+    assert guard.count == 5
+    assert guard.repeated() == []
+
+
+def test_guard_rejects_repeated_shape(sqlite_engine):
+    with pytest.raises(QueryBudgetExceeded, match="возможен N\\+1"):
+        with QueryGuard(max_queries=None, max_repeats=5):
+            select_each(sqlite_engine, 6)
+
+
+def test_guard_rejects_query_count_over_budget(sqlite_engine):
+    with pytest.raises(QueryBudgetExceeded, match="при лимите 3"):
+        with QueryGuard(max_queries=3, max_repeats=None):
+            with sqlite_engine.connect() as connection:
+                for table in ("items", "items AS i", "items AS j", "items AS k"):
+                    connection.execute(text(f"SELECT count(*) FROM {table}")).all()
+
+
+def test_guard_warn_mode(sqlite_engine):
+    with pytest.warns(QueryGuardWarning):
+        with QueryGuard(max_queries=None, max_repeats=1, mode="warn"):
+            select_each(sqlite_engine, 2)
+
+
+def test_guard_ignores_other_threads_by_default(sqlite_engine):
+    import threading
+
+    with QueryGuard(max_queries=None, max_repeats=1) as guard:
+        worker = threading.Thread(target=select_each, args=(sqlite_engine, 3))
+        worker.start()
+        worker.join()
+
+    assert guard.count == 0
+
+
+def guarded_app(engine, mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/repeated")
+    def repeated():
+        select_each(engine, 10)
+        return {"ok": True}
+
+    @app.get("/single")
+    def single():
+        select_each(engine, 1)
+        return {"ok": True}
+
+    app.add_middleware(QueryGuardMiddleware, mode=mode, max_queries=50, max_repeats=5)
+    return app
+
+
+def test_middleware_raise_mode_rejects_n_plus_one(sqlite_engine):
+    client = TestClient(guarded_app(sqlite_engine, "raise"))
+
+    response = client.get("/repeated")
+    assert response.status_code == 500
+    assert "возможен N+1" in response.json()["detail"]
+
+    response = client.get("/single")
+    assert response.status_code == 200
+    assert response.headers["x-query-count"] == "1"
+
+
+def test_middleware_warn_mode_reports_without_failing(sqlite_engine, capsys):
+    client = TestClient(guarded_app(sqlite_engine, "warn"))
+
+    response = client.get("/repeated")
+    assert response.status_code == 200
+    assert response.headers["x-query-count"] == "10"
+    assert "Предупреждение о запросах к БД" in capsys.readouterr().out
+
+
+def test_middleware_off_mode_passes_through(sqlite_engine):
+    response = TestClient(guarded_app(sqlite_engine, "off")).get("/repeated")
+    assert response.status_code == 200
+    assert "x-query-count" not in response.headers
+
+
+@pytest.fixture
+def orders(db, pickup_point, make_product, auth_headers):
+    headers = auth_headers("manager")
+    articles = [make_product(f"A{i:03d}").article for i in range(6)]
+    for i in range(12):
+        order = Order(
+            order_number=f"010124-{i + 1}",
+            order_date=date(2024, 1, 1),
+            delivery_date=date(2024, 1, 5),
+            pickup_point_id=pickup_point.id,
+            client_full_name="Иванов Иван Иванович",
+            code=100 + i,
+            status="Новый",
+        )
+        db.add(order)
+    db.commit()
+    return headers, articles
+
+
+def test_repeated_lookup_handler_fails_guard(orders, client):
+    from src.entrypoints.main import app
+
+    @app.get("/test/n-plus-one")
+    def n_plus_one(db: Session = Depends(get_db)):
+        return [
+            db.query(PickupPoint.address).filter(PickupPoint.id == order.pickup_point_id).scalar()
+            for order in db.query(Order).all()
+        ]
+
+    try:
+        with pytest.raises(QueryBudgetExceeded, match="возможен N\\+1"):
+            with QueryGuard(max_queries=None, max_repeats=5, all_threads=True):
+                assert client.get("/test/n-plus-one").status_code == 200
+    finally:
+        app.router.routes.remove(app.router.routes[-1])
+
+
+def test_order_handlers_stay_within_query_budget(orders, query_guard, client):
+    headers, articles = orders
+
+    response = client.get("/api/orders", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 12
+
+    response = client.get("/api/orders/changes", headers=headers)
+    assert response.status_code == 200
+
+    response = client.get(f"/api/orders/{response.json()['items'][0]['id']}", headers=headers)
+    assert response.status_code == 200
+
+    assert query_guard.repeated() == []
+
+
+@pytest.mark.query_budget(max_queries=12)
+def test_order_create_uses_batched_queries(orders, query_guard, client, auth_headers, pickup_point):
+    headers, articles = orders
+    payload = {
+        "order_date": "2024-02-01",
+        "delivery_date": "2024-02-05",
+        "pickup_point_id": pickup_point.id,
+        "client_full_name": "Петров Пётр Петрович",
+        "code": 555,
+        "status": "Новый",
+        "products": [{"product_id": article, "quantity": 1} for article in articles],
+    }
+    response = client.post("/api/orders", json=payload, headers=auth_headers("admin"))
+    assert response.status_code == 201
+
+
+def test_query_guard_fixture_fails_n_plus_one_test(pytester):
+    pytester.makepyfile("""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.pool import StaticPool
+
+        from src.db.instrumentation import instrument_engine
+
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        instrument_engine(engine)
+
+
+        def test_n_plus_one(query_guard):
+            with engine.connect() as connection:
+                for item_id in range(10):
+                    connection.execute(text(f"SELECT {item_id}")).all()
+
+
+        def test_single_query(query_guard):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1")).all()
+        """)
+    result = pytester.runpytest_inprocess("-p", "src.db.pytest_query_guard")
+    result.assert_outcomes(passed=2, errors=1)
+    result.stdout.fnmatch_lines(["*QueryBudgetExceeded*"])
@@ -0,0 +1,111 @@
+import pytest
+
+from app import ShoeShopApp
+from query_engine import ProductIndex
+
+
+def product(article: str, **fields) -> dict:
+    return {"article": article, "name": "Туфли", "supplier": "Kari", "quantity": 1, **fields}
+
+
+def test_upsert_reports_only_real_changes():
+    index = ProductIndex([product("A001")])
+
+    assert not index.upsert(product("A001"))
+    assert index.upsert(product("A001", quantity=2))
+    assert index.get("A001")["quantity"] == 2
+    assert index.upsert(product("A002"))
+    assert len(index) == 2
+
+
+def test_upsert_reindexes_changed_fields():
+    index = ProductIndex([product("A001", name="Туфли")])
+    index.upsert(product("A001", name="Сапоги", supplier="Обувь для вас"))
+
+    assert index.query("туфли") == []
+    assert [p["article"] for p in index.query("сапоги")] == ["A001"]
+    assert index.query(supplier="Kari") == []
+    assert [p["article"] for p in index.query(supplier="Обувь для вас")] == ["A001"]
+
+
+def test_remove_unindexes_and_allows_reinsert():
+    index = ProductIndex([product("A001"), product("A002", name="Кеды")])
+
+    assert index.remove("A001")
+    assert not index.remove("A001")
+    assert index.get("A001") is None
+    assert [p["article"] for p in index.query("туфли")] == []
+    assert [p["article"] for p in index.query()] == ["A002"]
+
+    index.upsert(product("A001"))
+    assert [p["article"] for p in index.query("туфли")] == ["A001"]
+
+
+class FakeList:
+    def __init__(self):
+        self.calls = []
+
+    def set_items(self, items, total=None, reset_view=True):
+        self.calls.append(("set_items", [item["id"] for item in items], total, reset_view))
+
+    def show_message(self, text, color=None):
+        self.calls.append(("show_message", text))
+
+
+class FakeApp:
+    upsert_order = ShoeShopApp.upsert_order
+    remove_order = ShoeShopApp.remove_order
+    orders_replica = ShoeShopApp.orders_replica
+    can_filter_products = ShoeShopApp.can_filter_products
+
+    def __init__(self, orders, total=None):
+        self.replica = None
+        self.current_user = {"login": "manager", "role": "Менеджер"}
+        self.orders_cache = list(orders)
+        self.orders_total = len(orders) if total is None else total
+        self.orders_list = FakeList()
+
+    def orders_visible(self):
+        return True
+
+
+@pytest.fixture
+def app():
+    return FakeApp([{"id": 1, "status": "Новый"}, {"id": 2, "status": "Новый"}])
+
+
+def test_unchanged_order_does_not_redraw(app):
+    app.upsert_order({"id": 1, "status": "Новый"})
+    assert app.orders_list.calls == []
+
+
+def test_changed_order_is_replaced_in_place(app):
+    app.upsert_order({"id": 2, "status": "Завершен"})
+
+    assert app.orders_cache[1] == {"id": 2, "status": "Завершен"}
+    assert app.orders_list.calls == [("set_items", [1, 2], 2, False)]
+
+
+def test_new_order_is_appended_when_list_is_complete(app):
+    app.upsert_order({"id": 3, "status": "Новый"})
+
+    assert app.orders_total == 3
+    assert app.orders_list.calls == [("set_items", [1, 2, 3], 3, False)]
+
+
+def test_new_order_only_bumps_total_when_pages_remain():
+    app = FakeApp([{"id": 1}], total=10)
+    app.upsert_order({"id": 11})
+
+    assert [order["id"] for order in app.orders_cache] == [1]
+    assert app.orders_total == 11
+
+
+def test_remove_order(app):
+    app.remove_order(7)
+    assert app.orders_list.calls == []
+
+    app.remove_order(1)
+    app.remove_order(2)
+    assert app.orders_total == 0
+    assert app.orders_list.calls == [("set_items", [2], 1, False), ("show_message", "Заказы не найдены")]
@@ -0,0 +1,75 @@
+from app import ShoeShopApp
+from replica import Replica, remove_replica, replica_path
+
+BASE_URL = "http://localhost:8000"
+
+
+def test_replica_path_is_keyed_by_login_and_role(tmp_path):
+    paths = {
+        replica_path(BASE_URL, "manager", "Менеджер", tmp_path),
+        replica_path(BASE_URL, "admin", "Администратор", tmp_path),
+        replica_path(BASE_URL, "guest", "Гость", tmp_path),
+        replica_path("http://other:8000", "manager", "Менеджер", tmp_path),
+    }
+    assert len(paths) == 4
+    assert replica_path(BASE_URL, "manager", "Менеджер", tmp_path) in paths
+
+
+def test_purge_removes_replica_files(tmp_path):
+    path = replica_path(BASE_URL, "manager", "Менеджер", tmp_path)
+    replica = Replica(path)
+    replica.put("order", {"id": 1, "version": 3, "code": 555, "client_full_name": "Иванов Иван Иванович"})
+    replica.enqueue("manager", "PUT", "/api/orders/1", {"status": "Завершен"}, "order", 1, 3)
+    assert path.exists()
+
+    replica.purge()
+    assert list(tmp_path.iterdir()) == []
+
+    replica = Replica(path)
+    assert replica.items("order") == []
+    assert replica.pending("manager") == []
+    replica.close()
+
+
+def test_remove_replica_ignores_missing_files(tmp_path):
+    remove_replica(tmp_path / "replica-missing.sqlite3")
+
+
+def test_outbox_is_scoped_by_login(tmp_path):
+    replica = Replica(replica_path(BASE_URL, "manager", "Менеджер", tmp_path))
+    replica.enqueue("manager", "DELETE", "/api/orders/1", None, "order", 1, 3)
+    replica.enqueue("other", "DELETE", "/api/orders/2", None, "order", 2, 4)
+
+    pending = replica.pending("manager")
+    assert [entry["path"] for entry in pending] == ["/api/orders/1"]
+    assert pending[0]["entity_id"] == "1"
+
+    replica.finish(pending[0]["id"])
+    assert replica.pending("manager") == []
+    replica.close()
+
+
+class FakeApp:
+    can_filter_products = ShoeShopApp.can_filter_products
+    orders_replica = ShoeShopApp.orders_replica
+    upsert_order = ShoeShopApp.upsert_order
+    remove_order = ShoeShopApp.remove_order
+
+    def __init__(self, replica, role):
+        self.replica = replica
+        self.current_user = {"login": "user", "role": role}
+
+    def orders_visible(self):
+        return False
+
+
+def test_orders_are_replicated_only_for_staff(tmp_path):
+    for role, expected in [("Гость", []), ("авторизованный клиент", []), ("Менеджер", [1])]:
+        replica = Replica(replica_path(BASE_URL, "user", role, tmp_path))
+        app = FakeApp(replica, role)
+        app.upsert_order({"id": 1, "version": 3, "code": 555})
+        app.upsert_order({"id": 2, "version": 4, "code": 556})
+        app.remove_order(2)
+
+        assert [order["id"] for order in replica.items("order")] == expected
+        replica.close()
@@ -0,0 +1,106 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.db.slow_queries import SlowQueryLog, is_explainable
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("SELECT * FROM products WHERE article = %(article)s", True),
+        ("  select count(*) from orders", True),
+        ("WITH recent AS (SELECT * FROM orders) SELECT * FROM recent", True),
+        ("SELECT * FROM products WHERE name = 'update me'", True),
+        ("SELECT updated_at FROM products", True),
+        ("SELECT pg_notify(%(channel)s, %(payload)s)", False),
+        ("SELECT nextval('orders_id_seq')", False),
+        ("SELECT 1", False),
+        ("SELECT pg_advisory_lock(1) FROM products", False),
+        ("SELECT * FROM products FOR UPDATE", False),
+        ("SELECT * FROM products FOR NO KEY UPDATE", False),
+        ("SELECT * FROM products FOR SHARE", False),
+        ("WITH gone AS (DELETE FROM orders RETURNING id) SELECT count(*) FROM gone", False),
+        ("UPDATE products SET quantity = 0", False),
+        ("INSERT INTO products (article) VALUES ('A')", False),
+        ("", False),
+        ("SELECT count(*) AS count_1 FROM (SELECT products.article FROM products) AS anon_1", True),
+        ("SELECT lower(name), coalesce(photo, ?) FROM products WHERE article IN (?, ?)", True),
+        ("SELECT * FROM orders WHERE EXISTS (SELECT 1 FROM order_product)", True),
+        ("SELECT audit_touch(article) FROM products", False),
+        ("SELECT random() FROM products", False),
+        ("SELECT public.refresh_stock(id) FROM orders", False),
+        ("SELECT * FROM products WHERE name = 'nextval(x)'", True),
+    ],
+)
+def test_is_explainable(statement, expected):
+    assert is_explainable(statement) is expected
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, statement, parameters):
+        self.connection.executed.append(statement)
+        self.connection.release.wait(5)
+
+    def fetchall(self):
+        return [("Seq Scan on products",)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.release = threading.Event()
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def postgres_conn(raw_connection):
+    engine = SimpleNamespace(raw_connection=lambda: raw_connection)
+    return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), engine=engine)
+
+
+def test_plan_is_sampled_off_the_request_path_on_separate_connection():
+    raw_connection = FakeConnection()
+    log = SlowQueryLog(threshold_ms=10, explain=True)
+
+    log.record(postgres_conn(raw_connection), "SELECT * FROM products WHERE id = 1", {}, False, 0.5)
+    assert log.snapshot()[0]["plan"] is None
+
+    raw_connection.release.set()
+    log.wait_for_plans()
+
+    assert raw_connection.executed == ["EXPLAIN SELECT * FROM products WHERE id = 1"]
+    assert raw_connection.closed
+    assert log.snapshot()[0]["plan"] == ["Seq Scan on products"]
+    assert log.snapshot()[0]["plan_type"] == "estimated"
+
+
+def test_plan_sampling_skips_side_effects_and_repeats():
+    raw_connection = FakeConnection()
+    raw_connection.release.set()
+    conn = postgres_conn(raw_connection)
+    log = SlowQueryLog(threshold_ms=10, explain=True)
+
+    log.record(conn, "SELECT pg_notify('events', 'x')", {}, False, 0.5)
+    log.record(conn, "SELECT * FROM products WHERE id = 1", {}, False, 0.5)
+    log.record(conn, "SELECT * FROM products WHERE id = 2", {}, False, 0.5)
+    log.record(conn, "SELECT * FROM orders", {}, False, 0.001)
+    log.wait_for_plans()
+
+    assert raw_connection.executed == ["EXPLAIN SELECT * FROM products WHERE id = 1"]
+    assert [entry["plan"] is not None for entry in log.snapshot()] == [False, True, False]
@@ -0,0 +1,216 @@
+import pytest
+from fastapi import HTTPException
+
+from src.api.utils import check_version
+from src.db.models.models import Product
+from src.db.sync import changes_since, current_version, next_version, record_deletion, touch
+
+
+def product_changes(db, since: int):
+    return changes_since(db, Product, Product.article, "product", since)
+
+
+def test_versions_increase_strictly(db):
+    versions = [next_version(db) for _ in range(5)]
+    db.commit()
+
+    assert versions == sorted(set(versions))
+    assert current_version(db) == versions[-1]
+
+
+def test_touch_stamps_every_entity_with_one_version(db, make_product):
+    first, second = make_product("A001"), make_product("A002")
+    assert second.version > first.version
+
+    version = touch(db, first, second)
+    db.commit()
+    assert first.version == second.version == version == current_version(db)
+
+
+def test_full_sync_returns_everything_without_tombstones(db, make_product):
+    make_product("A002")
+    make_product("A001")
+    record_deletion(db, "product", "GONE")
+    db.commit()
+
+    token, items, deleted, snapshot = product_changes(db, 0)
+    assert token == current_version(db)
+    assert [product.article for product in items] == ["A001", "A002"]
+    assert deleted == []
+    assert snapshot
+
+
+def test_since_is_exclusive(db, make_product):
+    make_product("A001")
+    make_product("A002")
+    token, _, _, _ = product_changes(db, 0)
+
+    assert product_changes(db, token) == (token, [], [], False)
+
+    make_product("A003")
+    new_token, items, deleted, snapshot = product_changes(db, token)
+    assert new_token == token + 1
+    assert [product.article for product in items] == ["A003"]
+    assert deleted == []
+    assert not snapshot
+
+
+def test_changes_are_ordered_by_version(db, make_product):
+    first = make_product("A001")
+    make_product("A002")
+    since = current_version(db)
+
+    touch(db, first)
+    db.commit()
+    make_product("A000")
+
+    _, items, _, _ = product_changes(db, since)
+    assert [product.article for product in items] == ["A001", "A000"]
+
+
+def test_deletion_returns_tombstone_after_since(db, make_product):
+    product = make_product("A001")
+    make_product("A002")
+    since = current_version(db)
+
+    db.delete(product)
+    version = record_deletion(db, "product", "A001")
+    db.commit()
+
+    token, items, deleted, _ = product_changes(db, since)
+    assert token == version
+    assert items == []
+    assert deleted == ["A001"]
+    assert product_changes(db, version) == (version, [], [], False)
+
+
+def test_recreated_entity_is_not_reported_deleted(db, make_product):
+    product = make_product("A001")
+    since = current_version(db)
+
+    db.delete(product)
+    record_deletion(db, "product", "A001")
+    db.commit()
+    make_product("A001")
+
+    _, items, deleted, _ = product_changes(db, since)
+    assert [item.article for item in items] == ["A001"]
+    assert deleted == []
+
+
+def test_token_from_the_future_returns_full_snapshot(db, make_product):
+    make_product("A002")
+    make_product("A001")
+    token = current_version(db)
+    record_deletion(db, "product", "GONE")
+    db.commit()
+
+    new_token, items, deleted, snapshot = product_changes(db, token + 100)
+    assert new_token == token + 1
+    assert [product.article for product in items] == ["A001", "A002"]
+    assert deleted == []
+    assert snapshot
+
+
+def test_changes_endpoint_resnapshots_unknown_token(client, make_product, auth_headers):
+    make_product("A001")
+    token = client.get("/api/products/changes").json()["token"]
+
+    response = client.get("/api/products/changes", params={"since": token + 1000}).json()
+    assert response["snapshot"] is True
+    assert response["token"] == token
+    assert [item["article"] for item in response["items"]] == ["A001"]
+
+    response = client.get("/api/orders/changes", params={"since": token + 1000}, headers=auth_headers("manager"))
+    assert response.json() == {"token": token, "items": [], "deleted": [], "snapshot": True}
+
+
+def test_tombstones_are_scoped_by_entity(db, make_product):
+    since = current_version(db)
+    record_deletion(db, "order", 7)
+    db.commit()
+
+    assert product_changes(db, since)[2] == []
+
+
+def test_changes_endpoint_contract(client, make_product, auth_headers):
+    make_product("A001")
+    make_product("A002")
+    headers = auth_headers("admin")
+
+    full = client.get("/api/products/changes").json()
+    assert [item["article"] for item in full["items"]] == ["A001", "A002"]
+
+    assert client.put("/api/products/A001", json={"quantity": 1}, headers=headers).status_code == 200
+    assert client.delete("/api/products/A002", headers=headers).status_code == 204
+
+    delta = client.get("/api/products/changes", params={"since": full["token"]}).json()
+    assert delta["token"] == full["token"] + 2
+    assert [item["article"] for item in delta["items"]] == ["A001"]
+    assert delta["items"][0]["version"] == full["token"] + 1
+    assert delta["deleted"] == ["A002"]
+
+    assert client.get("/api/products/changes", params={"since": delta["token"]}).json() == {
+        "token": delta["token"],
+        "items": [],
+        "deleted": [],
+        "snapshot": False,
+    }
+
+
+@pytest.mark.parametrize("if_match", [None, "*", "5", '"5"', 'W/"5"', ' "5" '])
+def test_check_version_accepts_matching_tags(if_match):
+    check_version(5, if_match)
+
+
+@pytest.mark.parametrize("if_match", ["4", '"6"', 'W/"50"', ""])
+def test_check_version_rejects_stale_tags(if_match):
+    with pytest.raises(HTTPException) as error:
+        check_version(5, if_match)
+    assert error.value.status_code == 409
+
+
+def test_stale_if_match_returns_409(client, make_product, auth_headers):
+    product = make_product("A001")
+    headers = auth_headers("admin")
+    stale = {**headers, "If-Match": f'"{product.version}"'}
+
+    assert client.put("/api/products/A001", json={"quantity": 2}, headers=stale).status_code == 200
+
+    response = client.put("/api/products/A001", json={"quantity": 3}, headers=stale)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Запись была изменена другим пользователем, обновите данные"
+
+    assert client.delete("/api/products/A001", headers=stale).status_code == 409
+    assert client.get("/api/products/A001").json()["quantity"] == 2
+
+
+@pytest.mark.parametrize("method", ["put", "delete"])
+def test_replayed_order_write_with_same_base_version_conflicts(
+    client, make_product, pickup_point, auth_headers, method
+):
+    headers = auth_headers("admin")
+    make_product("A001")
+    payload = {
+        "order_date": "2024-02-01",
+        "delivery_date": "2024-02-05",
+        "pickup_point_id": pickup_point.id,
+        "client_full_name": "Петров Пётр Петрович",
+        "code": 555,
+        "status": "Новый",
+        "products": [{"product_id": "A001", "quantity": 1}],
+    }
+    order = client.post("/api/orders", json=payload, headers=headers).json()
+    base = {**headers, "If-Match": f'"{order["version"]}"'}
+
+    first = client.put(f"/api/orders/{order['id']}", json={"status": "Завершен"}, headers=base)
+    assert first.status_code == 200
+
+    replay = client.request(
+        method.upper(),
+        f"/api/orders/{order['id']}",
+        json={"status": "Отменен"} if method == "put" else None,
+        headers=base,
+    )
+    assert replay.status_code == 409
+    assert client.get(f"/api/orders/{order['id']}", headers=headers).json()["status"] == "Завершен"
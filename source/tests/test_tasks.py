@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from tasks import TaskRunner
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+        self.thread = threading.get_ident()
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+
+
+@pytest.fixture
+def runner():
+    root = FakeRoot()
+    runner = TaskRunner(root, max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def drain(runner: TaskRunner, *futures):
+    for future in futures:
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+    runner.root.scheduled.pop()()
+
+
+def test_results_are_delivered_on_the_drain_thread(runner):
+    calls = []
+    future = runner.submit(
+        lambda: threading.get_ident(), on_success=lambda result: calls.append((result, threading.get_ident()))
+    )
+    future.result(timeout=5)
+    assert calls == []
+
+    drain(runner, future)
+    worker_thread, callback_thread = calls[0]
+    assert worker_thread != runner.root.thread
+    assert callback_thread == runner.root.thread
+    assert len(runner.root.scheduled) == 1
+
+
+def test_errors_go_to_on_error(runner):
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    future = runner.submit(fail, on_success=lambda result: errors.append("success"), on_error=errors.append)
+    drain(runner, future)
+    assert [str(error) for error in errors] == ["boom"]
+
+
+def test_newer_submit_with_same_key_drops_stale_result(runner):
+    release = threading.Event()
+    results = []
+
+    stale = runner.submit(lambda: release.wait(5) and "stale", on_success=results.append, key="search")
+    fresh = runner.submit(lambda: "fresh", on_success=results.append, key="search")
+    release.set()
+
+    drain(runner, stale, fresh)
+    assert results == ["fresh"]
+
+
+def test_cancel_drops_running_task_result(runner):
+    release = threading.Event()
+    results = []
+
+    future = runner.submit(lambda: release.wait(5) and "late", on_success=results.append, key="products")
+    runner.cancel("products")
+    release.set()
+
+    drain(runner, future)
+    assert results == []
+
+
+def test_keys_are_independent(runner):
+    results = []
+    first = runner.submit(lambda: "products", on_success=results.append, key="products")
+    second = runner.submit(lambda: "orders", on_success=results.append, key="orders")
+
+    drain(runner, first, second)
+    assert sorted(results) == ["orders", "products"]
+
+
+def test_call_soon_runs_callbacks_in_order_and_survives_errors(runner, capsys):
+    calls = []
+    runner.call_soon(calls.append, 1)
+    runner.call_soon(lambda: 1 / 0)
+    runner.call_soon(calls.append, 2)
+
+    drain(runner)
+    assert calls == [1, 2]
+    assert "Ошибка обработки события" in capsys.readouterr().out
+
+
+def test_shutdown_stops_polling(runner):
+    runner.shutdown()
+    runner.root.scheduled.pop()()
+    assert runner.root.scheduled == []
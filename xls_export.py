@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+source_dir = os.path.join(current_dir, 'source')
+if os.path.exists(source_dir):
+    sys.path.insert(0, source_dir)
+
+try:
+    from src.db.database import SessionLocal
+    from src.utils.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, export_stream
+except ImportError as e:
+    print("Ошибка импорта модулей!")
+    print(f"   Детали: {e}")
+    print(f"   Текущая директория: {os.getcwd()}")
+    print("\nРешение:")
+    print("   Убедитесь что скрипт запущен из корня проекта")
+    sys.exit(1)
+
+
+def export_to_file(entity: str, fmt: str, output_dir: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> str:
+    _, extension = EXPORT_FORMATS[fmt]
+    path = os.path.join(output_dir, f"{entity}.{extension}")
+    temp_path = f"{path}.temp"
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    written = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            for data in export_stream(db, entity, fmt, chunk_size):
+                f.write(data)
+                written += len(data)
+        os.replace(temp_path, path)
+    finally:
+        db.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    print(f"Выгружено {entity}: {path} ({written / 1024:.1f} КБ за {time.perf_counter() - started:.2f} с)")
+    return path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Выгрузка товаров и заказов в CSV/XLSX/Parquet")
+    parser.add_argument('entities', nargs='*', help=f"что выгружать: {', '.join(EXPORTS)} (по умолчанию — всё)")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv', help="формат файла")
+    parser.add_argument('--output', default='.', help="каталог для файлов")
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help="строк, читаемых из базы за раз")
+    args = parser.parse_args(argv)
+
+    for entity in args.entities:
+        if entity not in EXPORTS:
+            parser.error(f"неизвестный набор данных: {entity}")
+
+    os.makedirs(args.output, exist_ok=True)
+
+    try:
+        for entity in args.entities or list(EXPORTS):
+            export_to_file(entity, args.format, args.output, args.chunk_size)
+    except Exception as e:
+        print(f"Ошибка при выгрузке: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
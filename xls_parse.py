@@ -1,6 +1,16 @@
+import argparse
+import csv
+import hashlib
+import json
 import sys
 import os
-import pandas as pd
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Iterator
+
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,6 +21,8 @@ if os.path.exists(source_dir):
 try:
     from src.db.database import SessionLocal, engine
     from src.db.models.models import Base, User, PickupPoint, Order, Product, order_product
+    from src.db.sync import next_version
+    from src.utils.events import publish_external_change
     from src.utils.security import get_password_hash
 except ImportError as e:
     print("Ошибка импорта модулей!")
@@ -21,45 +33,428 @@ except ImportError as e:
     sys.exit(1)
 
 
-def import_users_from_excel(db: Session, filepath: str):
-    print(f"\nИмпорт пользователей из файла: {filepath}")
+CHUNK_SIZE = 1000
+PARALLEL_HASH_THRESHOLD = 32
+
+DEFAULT_XLS_DIR = os.path.join(current_dir, 'static', 'xls')
+DEFAULT_USERS_FILE = os.path.join(DEFAULT_XLS_DIR, 'user_import.xlsx')
+DEFAULT_PICKUP_POINTS_FILE = os.path.join(DEFAULT_XLS_DIR, 'Пункты выдачи_import.xlsx')
+DEFAULT_ORDERS_FILE = os.path.join(DEFAULT_XLS_DIR, 'Заказ_import.xlsx')
+DEFAULT_CHECKPOINT = '.xls_import_checkpoint.json'
+
+# Поле модели -> заголовок колонки в файле (или номер колонки, если у файла нет заголовка)
+USER_COLUMNS = {
+    'role': 'Роль сотрудника',
+    'full_name': 'ФИО',
+    'login': 'Логин',
+    'password': 'Пароль',
+}
+
+PICKUP_POINT_COLUMNS = {
+    'address': 0,
+}
+
+ORDER_COLUMNS = {
+    'number': 'Номер заказа',
+    'products': 'Артикул заказа',
+    'order_date': 'Дата заказа',
+    'delivery_date': 'Дата доставки',
+    'pickup_address': 'Адрес пункта выдачи',
+    'client_full_name': 'ФИО авторизированного клиента',
+    'code': 'Код для получения',
+    'status': 'Статус заказа',
+}
+
+DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%d.%m.%y', '%Y-%m-%d %H:%M:%S']
+
+# Поля, по которым считается хеш строки источника. Пароль не участвует: хранить его быстрый хеш нельзя
+USER_HASH_FIELDS = ['role', 'full_name', 'login']
+ORDER_HASH_FIELDS = [
+    'order_number', 'order_date', 'delivery_date', 'pickup_address', 'client_full_name', 'code', 'status', 'products'
+]
+
+
+def load_column_mapping(filepath: str) -> dict[str, dict]:
+    with open(filepath, encoding='utf-8') as f:
+        overrides = json.load(f)
+
+    mapping = {
+        'users': dict(USER_COLUMNS),
+        'pickup_points': dict(PICKUP_POINT_COLUMNS),
+        'orders': dict(ORDER_COLUMNS),
+    }
+    for section, columns in overrides.items():
+        if section not in mapping:
+            raise ValueError(f"Неизвестный раздел маппинга колонок: {section}")
+        mapping[section].update(columns)
+
+    return mapping
+
+
+def row_hash(row: dict, fields: list[str]) -> str:
+    payload = json.dumps([row[field] for field in fields], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def iter_source_rows(filepath: str) -> Iterator[tuple]:
+    if filepath.lower().endswith('.csv'):
+        with open(filepath, newline='', encoding='utf-8-sig') as f:
+            for row in csv.reader(f):
+                yield tuple(row)
+        return
 
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
     try:
-        df = pd.read_excel(filepath)
+        for row in workbook.active.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+
+def text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def required_text(row: dict, field: str) -> str:
+    value = text(row.get(field))
+    if not value:
+        raise ValueError(f"пустое поле '{field}'")
+    return value
+
+
+def parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    value = text(value)
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"неверный формат даты '{value}'")
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    @staticmethod
+    def _signature(filepath: str) -> dict:
+        stat = os.stat(filepath)
+        return {'file': os.path.abspath(filepath), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def _entry(self, stage: str, filepath: str) -> dict | None:
+        entry = self.state.get(stage)
+        if entry and entry.get('source') == self._signature(filepath):
+            return entry
+        return None
+
+    def position(self, stage: str, filepath: str) -> int | None:
+        entry = self._entry(stage, filepath)
+        if entry is None:
+            return 0
+        if entry.get('complete'):
+            return None
+        return entry['rows']
+
+    def save(self, stage: str, filepath: str, rows: int, complete: bool = False):
+        self.state[stage] = {'source': self._signature(filepath), 'rows': rows, 'complete': complete}
+
+        temp_path = f"{self.path}.temp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        self.state = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ImportStats:
+    def __init__(self):
+        self.stages: dict[str, list] = {}
+
+    def _add(self, stage: str, rows: int, seconds: float):
+        totals = self.stages.setdefault(stage, [0, 0.0])
+        totals[0] += rows
+        totals[1] += seconds
+
+    @contextmanager
+    def measure(self, stage: str, rows: int):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(stage, rows, time.perf_counter() - started)
+
+    def iterate(self, stage: str, chunks: Iterator[list[dict]]) -> Iterator[list[dict]]:
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            self._add(stage, len(chunk), time.perf_counter() - started)
+            yield chunk
+
+    def report(self):
+        if not self.stages:
+            return
+
+        print(f"{'Этап':<32}{'Строк':>10}{'Секунд':>10}{'Строк/с':>12}")
+        for stage, (rows, seconds) in self.stages.items():
+            rate = rows / seconds if seconds > 0 else 0
+            print(f"{stage:<32}{rows:>10}{seconds:>10.2f}{rate:>12.1f}")
+
+
+class ImportOptions:
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        workers: int | None = None,
+        dry_run: bool = False,
+        incremental: bool = False,
+        verbose: bool = False,
+        checkpoint: Checkpoint | None = None,
+    ):
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.dry_run = dry_run
+        self.incremental = incremental
+        self.verbose = verbose
+        self.checkpoint = checkpoint
+        self.stats = ImportStats()
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def start_position(self, stage: str, filepath: str) -> int | None:
+        if self.checkpoint is None or self.dry_run:
+            return 0
+        return self.checkpoint.position(stage, filepath)
+
+    def commit_chunk(self, db: Session, stage: str, reader: 'RowReader', complete: bool = False):
+        if self.dry_run:
+            db.flush()
+            return
+
+        db.commit()
+        if self.checkpoint is not None:
+            self.checkpoint.save(stage, reader.filepath, reader.rows_read, complete)
+
+
+class RowReader:
+    def __init__(
+        self,
+        filepath: str,
+        columns: dict[str, str | int],
+        validate: Callable[[dict], dict],
+        chunk_size: int = CHUNK_SIZE,
+        skip_rows: int = 0,
+    ):
+        self.filepath = filepath
+        self.columns = columns
+        self.validate = validate
+        self.chunk_size = chunk_size
+        self.skip_rows = skip_rows
+        self.rows_read = 0
+        self.errors = 0
+
+    def _column_indexes(self, rows: Iterator[tuple]) -> dict[str, int]:
+        if all(isinstance(column, int) for column in self.columns.values()):
+            return dict(self.columns)
+
+        header = next(rows, None) or ()
+        positions = {text(name): idx for idx, name in enumerate(header) if text(name)}
+
+        indexes = {}
+        for field, column in self.columns.items():
+            if isinstance(column, int):
+                indexes[field] = column
+            elif column in positions:
+                indexes[field] = positions[column]
+            else:
+                raise ValueError(f"Отсутствует колонка: {column}")
+        return indexes
+
+    def chunks(self) -> Iterator[list[dict]]:
+        rows = iter_source_rows(self.filepath)
+        indexes = self._column_indexes(rows)
+
+        chunk = []
+        for row in rows:
+            if all(text(cell) == '' for cell in row):
+                continue
+
+            self.rows_read += 1
+            if self.rows_read <= self.skip_rows:
+                continue
 
-        required_columns = ['Роль сотрудника', 'ФИО', 'Логин', 'Пароль']
-        for col in required_columns:
-            if col not in df.columns:
-                raise ValueError(f"Отсутствует колонка: {col}")
+            raw = {field: row[idx] if idx < len(row) else None for field, idx in indexes.items()}
+            try:
+                chunk.append(self.validate(raw))
+            except ValueError as e:
+                print(f"Строка {self.rows_read}: {e}, пропускаем...")
+                self.errors += 1
 
-        imported_count = 0
-        skipped_count = 0
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
 
-        for _, row in df.iterrows():
-            login = str(row['Логин']).strip()
+        if chunk:
+            yield chunk
 
-            existing_user = db.query(User).filter(User.login == login).first()
 
-            if existing_user:
-                print(f"Пользователь с логином '{login}' уже существует, пропускаем...")
-                skipped_count += 1
-                continue
+def validate_user(row: dict) -> dict:
+    user = {
+        'role': required_text(row, 'role'),
+        'full_name': required_text(row, 'full_name'),
+        'login': required_text(row, 'login'),
+        'password': required_text(row, 'password'),
+    }
+    user['source_hash'] = row_hash(user, USER_HASH_FIELDS)
+    return user
 
-            user = User(
-                role=str(row['Роль сотрудника']).strip(),
-                full_name=str(row['ФИО']).strip(),
-                login=login,
-                password=get_password_hash(str(row['Пароль']).strip())
-            )
 
-            db.add(user)
-            imported_count += 1
-            print(f"Добавлен: {user.full_name} ({user.login}) - {user.role}")
+def validate_pickup_point(row: dict) -> dict:
+    return {'address': required_text(row, 'address')}
 
-        db.commit()
+
+def validate_order(row: dict) -> dict:
+    order_date = parse_date(row.get('order_date'))
+    number = required_text(row, 'number')
+
+    products = parse_order_products(required_text(row, 'products'))
+    if not products:
+        raise ValueError(f"не удалось распарсить товары для заказа {number}")
+
+    try:
+        code = int(text(row.get('code')))
+    except ValueError:
+        raise ValueError(f"неверный код получения '{text(row.get('code'))}'")
+
+    order = {
+        'order_number': f"{order_date.strftime('%d%m%y')}-{number}",
+        'order_date': order_date,
+        'delivery_date': parse_date(row.get('delivery_date')),
+        'pickup_address': required_text(row, 'pickup_address'),
+        'client_full_name': required_text(row, 'client_full_name'),
+        'code': code,
+        'status': required_text(row, 'status'),
+        'products': products,
+    }
+    order['source_hash'] = row_hash(order, ORDER_HASH_FIELDS)
+    return order
+
+
+def hash_passwords(passwords: list[str], executor: Executor | None = None, chunksize: int = 16) -> list[str]:
+    if not passwords:
+        return []
+
+    total = len(passwords)
+    report_every = max(total // 10, 1)
+    if executor and total >= PARALLEL_HASH_THRESHOLD:
+        results = executor.map(get_password_hash, passwords, chunksize=chunksize)
+    else:
+        results = map(get_password_hash, passwords)
+
+    hashes = []
+    for done, hashed in enumerate(results, start=1):
+        hashes.append(hashed)
+        if done % report_every == 0 or done == total:
+            print(f"Хеширование паролей: {done}/{total}")
+
+    return hashes
+
+
+def import_users_from_excel(
+    db: Session,
+    filepath: str,
+    columns: dict[str, str | int] = USER_COLUMNS,
+    options: ImportOptions | None = None,
+):
+    print(f"\nИмпорт пользователей из файла: {filepath}")
+
+    options = options or ImportOptions()
+    start = options.start_position('users', filepath)
+    if start is None:
+        print("Файл уже импортирован по контрольной точке, пропускаем...")
+        return 0
+
+    reader = RowReader(filepath, columns, validate_user, options.chunk_size, skip_rows=start)
+    executor = None
+
+    imported_count = 0
+    updated_count = 0
+    skipped_count = 0
+
+    try:
+        for chunk in options.stats.iterate('users: чтение', reader.chunks()):
+            rows = {}
+            for user in chunk:
+                if user['login'] in rows:
+                    options.log(f"Логин '{user['login']}' повторяется в файле, пропускаем...")
+                    skipped_count += 1
+                    continue
+                rows[user['login']] = user
+
+            existing = db.query(User.id, User.login, User.source_hash).filter(User.login.in_(list(rows))).all()
+            changed_users = []
+            for user_id, login, source_hash in existing:
+                user = rows.pop(login)
+                if options.incremental and source_hash != user['source_hash']:
+                    options.log(f"Пользователь '{login}' изменился, обновляем...")
+                    changed_users.append(
+                        {
+                            'id': user_id,
+                            'role': user['role'],
+                            'full_name': user['full_name'],
+                            'source_hash': user['source_hash'],
+                        }
+                    )
+                    continue
+                options.log(f"Пользователь с логином '{login}' уже существует, пропускаем...")
+                skipped_count += 1
+
+            new_users = list(rows.values())
+            if not options.dry_run:
+                if executor is None and options.workers > 1 and len(new_users) >= PARALLEL_HASH_THRESHOLD:
+                    executor = ProcessPoolExecutor(max_workers=options.workers)
+                with options.stats.measure('users: хеширование', len(new_users)):
+                    hashes = hash_passwords([user['password'] for user in new_users], executor)
+                for user, hashed in zip(new_users, hashes):
+                    user['password'] = hashed
+
+            with options.stats.measure('users: запись', len(new_users) + len(changed_users)):
+                if new_users:
+                    db.execute(insert(User), new_users)
+                if changed_users:
+                    db.execute(update(User), changed_users)
+                options.commit_chunk(db, 'users', reader)
+            imported_count += len(new_users)
+            updated_count += len(changed_users)
+
+        options.commit_chunk(db, 'users', reader, complete=True)
 
         print(f"\nИтого импортировано пользователей: {imported_count}")
+        if options.incremental:
+            print(f"Обновлено (изменились в источнике): {updated_count}")
         print(f"Пропущено (уже существуют): {skipped_count}")
+        print(f"Ошибок: {reader.errors}")
 
         return imported_count
 
@@ -67,43 +462,50 @@ def import_users_from_excel(db: Session, filepath: str):
         print(f"Ошибка при импорте пользователей: {e}")
         db.rollback()
         raise
+    finally:
+        if executor:
+            executor.shutdown()
 
 
-def import_pickup_points_from_excel(db: Session, filepath: str):
+def import_pickup_points_from_excel(
+    db: Session,
+    filepath: str,
+    columns: dict[str, str | int] = PICKUP_POINT_COLUMNS,
+    options: ImportOptions | None = None,
+):
     print(f"\nИмпорт пунктов выдачи из файла: {filepath}")
 
-    try:
-        df = pd.read_excel(filepath)
-
-        addresses = []
-
-        if len(df.columns) > 0:
-            addresses.append(str(df.columns[0]).strip())
+    options = options or ImportOptions()
+    start = options.start_position('pickup_points', filepath)
+    if start is None:
+        print("Файл уже импортирован по контрольной точке, пропускаем...")
+        return 0
 
-        for _, row in df.iterrows():
-            address = str(row.iloc[0]).strip()
-            if address and address != 'nan':
-                addresses.append(address)
+    reader = RowReader(filepath, columns, validate_pickup_point, options.chunk_size, skip_rows=start)
 
-        imported_count = 0
-        skipped_count = 0
+    imported_count = 0
+    skipped_count = 0
 
-        for address in addresses:
-            existing_point = db.query(PickupPoint).filter(
-                PickupPoint.address == address
-            ).first()
-
-            if existing_point:
-                print(f"Пункт выдачи '{address}' уже существует, пропускаем...")
-                skipped_count += 1
-                continue
-
-            point = PickupPoint(address=address)
-            db.add(point)
-            imported_count += 1
-            print(f"Добавлен: {address}")
-
-        db.commit()
+    try:
+        for chunk in options.stats.iterate('pickup_points: чтение', reader.chunks()):
+            addresses = list(dict.fromkeys(point['address'] for point in chunk))
+            skipped_count += len(chunk) - len(addresses)
+
+            existing = {
+                address for (address,) in db.query(PickupPoint.address).filter(PickupPoint.address.in_(addresses))
+            }
+            for address in existing:
+                options.log(f"Пункт выдачи '{address}' уже существует, пропускаем...")
+            skipped_count += len(existing)
+
+            new_points = [{'address': address} for address in addresses if address not in existing]
+            with options.stats.measure('pickup_points: запись', len(new_points)):
+                if new_points:
+                    db.execute(insert(PickupPoint), new_points)
+                options.commit_chunk(db, 'pickup_points', reader)
+            imported_count += len(new_points)
+
+        options.commit_chunk(db, 'pickup_points', reader, complete=True)
 
         print(f"\nИтого импортировано пунктов выдачи: {imported_count}")
         print(f"Пропущено (уже существуют): {skipped_count}")
@@ -117,138 +519,151 @@ def import_pickup_points_from_excel(db: Session, filepath: str):
 
 
 def parse_order_products(products_str: str):
-    products = []
+    quantities = {}
     parts = [p.strip() for p in products_str.split(',')]
 
     for i in range(0, len(parts), 2):
         if i + 1 < len(parts):
             article = parts[i].strip()
             try:
-                quantity = int(parts[i + 1].strip())
-                products.append({
-                    'product_id': article,
-                    'quantity': quantity
-                })
+                quantities[article] = quantities.get(article, 0) + int(parts[i + 1].strip())
             except ValueError:
                 print(f"Не удалось распарсить количество для артикула {article}")
 
-    return products
+    return [{'product_id': article, 'quantity': quantity} for article, quantity in quantities.items()]
+
+
+def order_columns(order: dict) -> dict:
+    return {
+        'order_number': order['order_number'],
+        'order_date': order['order_date'],
+        'delivery_date': order['delivery_date'],
+        'pickup_point_id': order['pickup_point_id'],
+        'client_full_name': order['client_full_name'],
+        'code': order['code'],
+        'status': order['status'],
+        'source_hash': order['source_hash'],
+    }
 
 
-def import_orders_from_excel(db: Session, filepath: str):
+def import_orders_from_excel(
+    db: Session,
+    filepath: str,
+    columns: dict[str, str | int] = ORDER_COLUMNS,
+    options: ImportOptions | None = None,
+):
     print(f"\nИмпорт заказов из файла: {filepath}")
 
+    options = options or ImportOptions()
+    start = options.start_position('orders', filepath)
+    if start is None:
+        print("Файл уже импортирован по контрольной точке, пропускаем...")
+        return 0
+
+    reader = RowReader(filepath, columns, validate_order, options.chunk_size, skip_rows=start)
+
+    imported_count = 0
+    updated_count = 0
+    skipped_count = 0
+    errors_count = 0
+
     try:
-        df = pd.read_excel(filepath)
-
-        required_columns = [
-            'Номер заказа',
-            'Артикул заказа',
-            'Дата заказа',
-            'Дата доставки',
-            'Адрес пункта выдачи',
-            'ФИО авторизированного клиента',
-            'Код для получения',
-            'Статус заказа'
-        ]
-
-        for col in required_columns:
-            if col not in df.columns:
-                raise ValueError(f"Отсутствует колонка: {col}")
-
-        imported_count = 0
-        skipped_count = 0
-        errors_count = 0
-
-        for idx, row in df.iterrows():
-            try:
-                order_number = str(row['Номер заказа']).strip()
+        pickup_points = dict(db.query(PickupPoint.address, PickupPoint.id).all())
 
-                order_date = pd.to_datetime(row['Дата заказа'])
-                delivery_date = pd.to_datetime(row['Дата доставки'])
+        for chunk in options.stats.iterate('orders: чтение', reader.chunks()):
+            numbers = [order['order_number'] for order in chunk]
+            existing_rows = db.query(Order.id, Order.order_number, Order.source_hash).filter(
+                Order.order_number.in_(numbers)
+            )
+            existing = {number: (order_id, source_hash) for order_id, number, source_hash in existing_rows}
 
-                order_num = f"{order_date.strftime('%d%m%y')}-{order_number}"
+            articles = {item['product_id'] for order in chunk for item in order['products']}
+            known_products = {
+                article for (article,) in db.query(Product.article).filter(Product.article.in_(articles))
+            }
 
-                existing_order = db.query(Order).filter(
-                    Order.order_number == order_num
-                ).first()
+            new_orders = {}
+            changed_orders = {}
+            for order in chunk:
+                order_num = order['order_number']
+                existing_order = existing.get(order_num)
 
-                if existing_order:
-                    print(f"Заказ '{order_num}' уже существует, пропускаем...")
+                if order_num in new_orders or order_num in changed_orders:
+                    options.log(f"Заказ '{order_num}' повторяется в файле, пропускаем...")
                     skipped_count += 1
                     continue
 
-                address = str(row['Адрес пункта выдачи']).strip()
-                pickup_point = db.query(PickupPoint).filter(
-                    PickupPoint.address == address
-                ).first()
-
-                if not pickup_point:
-                    print(f"Пункт выдачи '{address}' не найден для заказа {order_num}")
-                    errors_count += 1
+                if existing_order and not (options.incremental and existing_order[1] != order['source_hash']):
+                    options.log(f"Заказ '{order_num}' уже существует, пропускаем...")
+                    skipped_count += 1
                     continue
 
-                products_str = str(row['Артикул заказа']).strip()
-                products = parse_order_products(products_str)
-
-                if not products:
-                    print(f"Не удалось распарсить товары для заказа {order_num}")
+                pickup_point_id = pickup_points.get(order['pickup_address'])
+                if not pickup_point_id:
+                    print(f"Пункт выдачи '{order['pickup_address']}' не найден для заказа {order_num}")
                     errors_count += 1
                     continue
 
-                order = Order(
-                    order_number=order_num,
-                    order_date=order_date.date(),
-                    delivery_date=delivery_date.date(),
-                    pickup_point_id=pickup_point.id,
-                    client_full_name=str(row['ФИО авторизированного клиента']).strip(),
-                    code=int(row['Код для получения']),
-                    status=str(row['Статус заказа']).strip()
-                )
-
-                db.add(order)
-                db.flush()
-
-                products_added = 0
-                for product_info in products:
-                    product_id = product_info['product_id']
-                    quantity = product_info['quantity']
-
-                    product = db.query(Product).filter(
-                        Product.article == product_id
-                    ).first()
-
-                    if not product:
-                        print(f"Товар с артикулом '{product_id}' не найден, пропускаем...")
+                products = []
+                for product_info in order['products']:
+                    if product_info['product_id'] not in known_products:
+                        options.log(f"Товар с артикулом '{product_info['product_id']}' не найден, пропускаем...")
                         continue
+                    products.append(product_info)
 
-                    stmt = order_product.insert().values(
-                        order_id=order.id,
-                        product_id=product_id,
-                        quantity=quantity
-                    )
-                    db.execute(stmt)
-                    products_added += 1
-
-                if products_added == 0:
+                if not products:
                     print(f" В заказ {order_num} не добавлено ни одного товара (товары не найдены)")
-                    db.rollback()
                     errors_count += 1
                     continue
 
-                imported_count += 1
-                print(f"Добавлен заказ: {order_num} ({products_added} товаров)")
-
-            except Exception as e:
-                print(f"Ошибка при обработке заказа {idx + 1}: {e}")
-                errors_count += 1
-                continue
+                order = {**order, 'pickup_point_id': pickup_point_id, 'products': products}
+                if existing_order:
+                    options.log(f"Заказ '{order_num}' изменился, обновляем...")
+                    changed_orders[order_num] = {**order, 'id': existing_order[0]}
+                else:
+                    new_orders[order_num] = order
+
+            with options.stats.measure('orders: запись', len(new_orders) + len(changed_orders)):
+                written = []
+                version = next_version(db) if new_orders or changed_orders else None
+                if new_orders:
+                    order_rows = [{**order_columns(order), 'version': version} for order in new_orders.values()]
+                    written += db.execute(insert(Order).returning(Order.id, Order.order_number), order_rows).all()
+
+                if changed_orders:
+                    order_rows = [
+                        {'id': order['id'], **order_columns(order), 'version': version}
+                        for order in changed_orders.values()
+                    ]
+                    db.execute(update(Order), order_rows)
+
+                    changed_ids = [order['id'] for order in changed_orders.values()]
+                    db.execute(order_product.delete().where(order_product.c.order_id.in_(changed_ids)))
+                    written += [(order['id'], order_num) for order_num, order in changed_orders.items()]
+
+                if written:
+                    written_orders = {**new_orders, **changed_orders}
+                    line_rows = [
+                        {'order_id': order_id, 'product_id': item['product_id'], 'quantity': item['quantity']}
+                        for order_id, order_num in written
+                        for item in written_orders[order_num]['products']
+                    ]
+                    db.execute(order_product.insert(), line_rows)
+                options.commit_chunk(db, 'orders', reader)
+
+            imported_count += len(new_orders)
+            updated_count += len(changed_orders)
+            print(
+                f"Обработано строк: {reader.rows_read}, добавлено заказов: {imported_count}, обновлено: {updated_count}"
+            )
 
-        db.commit()
+        options.commit_chunk(db, 'orders', reader, complete=True)
 
         print(f" Итого импортировано заказов: {imported_count}")
+        if options.incremental:
+            print(f"Обновлено (изменились в источнике): {updated_count}")
         print(f"Пропущено (уже существуют): {skipped_count}")
-        print(f"Ошибок: {errors_count}")
+        print(f"Ошибок: {errors_count + reader.errors}")
 
         return imported_count
 
@@ -258,58 +673,104 @@ def import_orders_from_excel(db: Session, filepath: str):
         raise
 
 
-def main():
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Импорт пользователей, пунктов выдачи и заказов из Excel/CSV")
+    parser.add_argument('--users', help="файл с пользователями")
+    parser.add_argument('--pickup-points', help="файл с пунктами выдачи")
+    parser.add_argument('--orders', help="файл с заказами")
+    parser.add_argument('--columns', help="JSON с соответствием полей и заголовков колонок")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="строк в одной транзакции")
+    parser.add_argument('--workers', type=int, help="процессов для хеширования паролей (по умолчанию — число ядер)")
+    parser.add_argument('--dry-run', action='store_true', help="показать, что изменится, без записи в базу")
+    parser.add_argument(
+        '--incremental', action='store_true', help="обновлять записи, строки которых изменились с прошлого импорта"
+    )
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="файл контрольной точки")
+    parser.add_argument('--restart', action='store_true', help="игнорировать контрольную точку и начать заново")
+    parser.add_argument('-v', '--verbose', action='store_true', help="выводить сообщения по каждой строке")
+
+    args = parser.parse_args(argv)
+    if not (args.users or args.pickup_points or args.orders):
+        args.users = DEFAULT_USERS_FILE
+        args.pickup_points = DEFAULT_PICKUP_POINTS_FILE
+        args.orders = DEFAULT_ORDERS_FILE
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
     print("=" * 70)
-    print("ИМПОРТ ДАННЫХ ИЗ EXCEL ФАЙЛОВ")
+    print("ИМПОРТ ДАННЫХ ИЗ EXCEL ФАЙЛОВ" + (" (ПРОБНЫЙ ЗАПУСК)" if args.dry_run else ""))
     print("=" * 70)
     print(f"Текущая директория: {os.getcwd()}\n")
 
-    users_file = "/Users/egor/PycharmProjects/shoe_storerererere/static/xls/user_import.xlsx"
-    pickup_points_file = "/Users/egor/PycharmProjects/shoe_storerererere/static/xls/Пункты выдачи_import.xlsx"  # ВАЖНО: пробел, не подчеркивание!
-    orders_file = "/Users/egor/PycharmProjects/shoe_storerererere/static/xls/Заказ_import.xlsx"
+    for path in (args.users, args.pickup_points, args.orders):
+        if path and not os.path.exists(path):
+            print(f"Файл {path} не найден!")
+            return 1
 
-    if not os.path.exists(users_file):
-        print(f"Файл {users_file} не найден!")
-        print(f"   Поместите файл в: {os.getcwd()}/static/xls/")
-        return
+    columns = {'users': USER_COLUMNS, 'pickup_points': PICKUP_POINT_COLUMNS, 'orders': ORDER_COLUMNS}
+    if args.columns:
+        columns = load_column_mapping(args.columns)
 
-    if not os.path.exists(pickup_points_file):
-        print(f"Файл {pickup_points_file} не найден!")
-        print(f"   Поместите файл в: {os.getcwd()}/static/xls/")
-        return
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.restart:
+        checkpoint.clear()
 
-    if not os.path.exists(orders_file):
-        print(f"Файл {orders_file} не найден!")
-        print(f"   Пропускаем импорт заказов...")
-        orders_file = None
+    options = ImportOptions(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        incremental=args.incremental,
+        verbose=args.verbose,
+        checkpoint=checkpoint,
+    )
 
     db = SessionLocal()
+    started = time.perf_counter()
 
     try:
-        points_imported = import_pickup_points_from_excel(db, pickup_points_file)
-        users_imported = import_users_from_excel(db, users_file)
-
-        orders_imported = 0
-        if orders_file:
-            orders_imported = import_orders_from_excel(db, orders_file)
+        results = {}
+        if args.pickup_points:
+            results['Пунктов выдачи'] = import_pickup_points_from_excel(
+                db, args.pickup_points, columns['pickup_points'], options
+            )
+        if args.users:
+            results['Пользователей'] = import_users_from_excel(db, args.users, columns['users'], options)
+        if args.orders:
+            results['Заказов'] = import_orders_from_excel(db, args.orders, columns['orders'], options)
+
+        if args.dry_run:
+            db.rollback()
+        else:
+            checkpoint.clear()
+            if results.get('Заказов'):
+                if not publish_external_change('order', 'import', None):
+                    print("Уведомление терминалов доступно только для PostgreSQL: они получат заказы при следующей синхронизации")
 
         print("\n" + "=" * 70)
-        print(" ИМПОРТ ЗАВЕРШЕН УСПЕШНО!")
+        print(" ПРОБНЫЙ ЗАПУСК ЗАВЕРШЕН, БАЗА НЕ ИЗМЕНЕНА" if args.dry_run else " ИМПОРТ ЗАВЕРШЕН УСПЕШНО!")
         print("=" * 70)
-        print(f"Всего импортировано:")
-        print(f"  Пользователей: {users_imported}")
-        print(f"   Пунктов выдачи: {points_imported}")
-        if orders_file:
-            print(f"   Заказов: {orders_imported}")
+        print("Будет импортировано:" if args.dry_run else "Всего импортировано:")
+        for title, count in results.items():
+            print(f"   {title}: {count}")
+        print(f"Время: {time.perf_counter() - started:.2f} с")
+        options.stats.report()
         print("=" * 70)
+        return 0
 
     except Exception as e:
+        db.rollback()
         print(f"\n Критическая ошибка: {e}")
+        if not args.dry_run:
+            print(f"Повторный запуск продолжит импорт с контрольной точки: {args.checkpoint}")
         import traceback
         traceback.print_exc()
+        return 1
     finally:
         db.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())